@@ -0,0 +1,240 @@
+"""
+Caching Utilities
+In-process LRU cache with an optional shared tier on the Django cache backend
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with size and TTL eviction and hit/miss counters
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: int = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None on a miss"""
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: int = None) -> None:
+        """Store a value, evicting the least recently used entries when full"""
+
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class TieredCache:
+    """
+    Two-tier cache: a per-process LRU in front of a Django cache backend
+    (Redis in our settings) shared by every worker.
+
+    Errors from the shared tier are logged and treated as misses so a
+    Redis outage never breaks the caller.
+    """
+
+    def __init__(self, prefix: str, max_entries: int = 512, ttl: int = 3600,
+                 cache_alias: str = 'default', use_shared: bool = True):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+        self.use_shared = use_shared
+        self.local = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.shared_hits = 0
+        self.shared_errors = 0
+
+    def _shared(self):
+        from django.core.cache import caches
+        return caches[self.cache_alias]
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str) -> Any:
+        """Look up the local tier, then the shared tier (promoting hits)"""
+
+        value = self.local.get(key)
+        if value is not None or not self.use_shared:
+            return value
+
+        try:
+            value = self._shared().get(self._key(key))
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache read failed for {self.prefix}: {str(e)}")
+            return None
+
+        if value is not None:
+            self.shared_hits += 1
+            self.local.set(key, value)
+
+        return value
+
+    def set(self, key: str, value: Any, ttl: int = None) -> None:
+        """Store a value in both tiers"""
+
+        ttl = ttl if ttl is not None else self.ttl
+        self.local.set(key, value, ttl)
+
+        if not self.use_shared:
+            return
+
+        try:
+            self._shared().set(self._key(key), value, timeout=ttl)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache write failed for {self.prefix}: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        """Remove a value from both tiers"""
+
+        self.local.delete(key)
+
+        if not self.use_shared:
+            return
+
+        try:
+            self._shared().delete(self._key(key))
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache delete failed for {self.prefix}: {str(e)}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics for both tiers"""
+
+        stats = self.local.get_statistics()
+        stats.update({
+            'local_hits': stats['hits'],
+            'shared_hits': self.shared_hits,
+            'shared_errors': self.shared_errors,
+            'misses': stats['misses'] - self.shared_hits,
+        })
+        lookups = stats['local_hits'] + stats['misses'] + self.shared_hits
+        stats['hits'] = stats['local_hits'] + self.shared_hits
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+class VersionCounter:
+    """
+    Monotonic version number shared by every worker through the Django cache
+
+    Readers reuse the last value for `check_interval` seconds, so a bump in
+    another process is seen within that window; bumps in this process are
+    seen immediately. If the shared cache is unavailable the counter falls
+    back to a process-local value, which never matches a shared one.
+    """
+
+    def __init__(self, key: str, cache_alias: str = 'default', check_interval: float = 1.0,
+                 use_shared: bool = True):
+        self.key = key
+        self.cache_alias = cache_alias
+        self.check_interval = check_interval
+        self.use_shared = use_shared
+        self._local = 0
+        self._value = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _shared(self):
+        from django.core.cache import caches
+        return caches[self.cache_alias]
+
+    def get(self) -> str:
+        """Current version"""
+
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < self.check_interval:
+            return self._value
+
+        value = f"local:{self._local}"
+        if self.use_shared:
+            try:
+                shared = self._shared().get(self.key)
+                value = str(shared or 0)
+            except Exception as e:
+                logger.warning(f"Shared version read failed for {self.key}: {str(e)}")
+
+        with self._lock:
+            self._value, self._checked_at = value, now
+        return value
+
+    def bump(self) -> str:
+        """Advance the version, invalidating everything stamped with the old one"""
+
+        with self._lock:
+            self._local += 1
+            value = f"local:{self._local}"
+
+        if self.use_shared:
+            try:
+                cache = self._shared()
+                cache.add(self.key, 0, timeout=None)
+                value = str(cache.incr(self.key))
+            except Exception as e:
+                logger.warning(f"Shared version bump failed for {self.key}: {str(e)}")
+
+        with self._lock:
+            self._value, self._checked_at = value, time.monotonic()
+        return value
@@ -3,15 +3,12 @@ AI-Powered Code Debugger
 Analyzes existing code, detects bugs, and suggests fixes
 """
 
-import google.generativeai as genai
-from django.conf import settings
-from github import Github
 from typing import Dict, List, Any
+from .registry import registry
+from .llm_cache import generate_content
 import json
 import re
 
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
 
 class CodeDebugger:
     """
@@ -19,7 +16,7 @@ class CodeDebugger:
     """
     
     def __init__(self):
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model = registry.get_model('gemini-2.0-flash-exp')
     
     def analyze_repository(self, repo_url: str, github_token: str) -> Dict[str, Any]:
         """
@@ -33,6 +30,7 @@ class CodeDebugger:
             Analysis results with detected issues
         """
         
+        from github import Github
         g = Github(github_token)
         
         # Extract owner and repo name from URL
@@ -117,24 +115,17 @@ Return ONLY a JSON array of issues:
 If no issues found, return empty array: []"""
 
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.1,
                     'max_output_tokens': 4096,
-                }
+                },
+                validate=lambda text: isinstance(self._parse_issues(text), list)
             )
             
-            issues_text = response.text.strip()
-            
-            # Clean markdown formatting
-            if issues_text.startswith('```json'):
-                issues_text = issues_text[7:]
-            if issues_text.endswith('```'):
-                issues_text = issues_text[:-3]
-            issues_text = issues_text.strip()
-            
-            issues = json.loads(issues_text)
+            issues = self._parse_issues(response.text)
             
             # Add file path to each issue
             for issue in issues:
@@ -149,6 +140,19 @@ If no issues found, return empty array: []"""
             print(f"Error analyzing {file_path}: {str(e)}")
             return []
     
+    def _parse_issues(self, response_text: str) -> List[Dict[str, Any]]:
+        """Parse the JSON issue list out of a model response"""
+        
+        issues_text = response_text.strip()
+        
+        # Clean markdown formatting
+        if issues_text.startswith('```json'):
+            issues_text = issues_text[7:]
+        if issues_text.endswith('```'):
+            issues_text = issues_text[:-3]
+        
+        return json.loads(issues_text.strip())
+    
     def generate_fixes(self, issues: List[Dict[str, Any]], 
                       repo_files: Dict[str, str]) -> Dict[str, str]:
         """
@@ -207,7 +211,8 @@ Generate the COMPLETE fixed version of the file with all issues resolved.
 Return ONLY the fixed code, no explanations or markdown formatting."""
 
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.2,
@@ -248,6 +253,7 @@ Return ONLY the fixed code, no explanations or markdown formatting."""
             Pull request URL
         """
         
+        from github import Github
         g = Github(github_token)
         
         # Extract owner and repo name
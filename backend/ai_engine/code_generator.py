@@ -1,72 +1,405 @@
-import google.generativeai as genai
 from django.conf import settings
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
 import json
-from .pattern_retriever import PatternRetriever
-
-genai.configure(api_key=settings.GEMINI_API_KEY)
+import time
+from .file_scheduler import FileScheduler, extract_signatures
+from .spec_slicer import SpecSlicer
+from .template_renderer import TemplateRenderer
+from .file_batcher import FileBatcher, FILE_START, FILE_END
+from .registry import registry
+from .llm_cache import generate_content, stream_content
+from .request_policy import RequestPolicy
 
 class CodeGenerator:
     """
     Generates complete code files from specifications and patterns
     """
     
-    def __init__(self):
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        self.pattern_retriever = PatternRetriever()
+    def __init__(self, max_workers: int = None):
+        self.model = registry.get_model('gemini-2.0-flash-exp')
+        self.pattern_retriever = registry.get_pattern_retriever()
+        self.max_workers = max_workers or getattr(settings, 'GENERATION_MAX_WORKERS', 8)
+        self.spec_slicer = SpecSlicer()
+        self.template_renderer = TemplateRenderer(
+            templatable_types=getattr(settings, 'TEMPLATE_FAST_PATH_TYPES', None),
+            max_distance=getattr(settings, 'TEMPLATE_FAST_PATH_MAX_DISTANCE', 0.35)
+        )
+        self.batching_enabled = getattr(settings, 'GENERATION_BATCHING', True)
+        self.batch_max_output_tokens = getattr(settings, 'GENERATION_BATCH_MAX_OUTPUT_TOKENS', 8192)
+        self.file_batcher = FileBatcher(
+            type_estimates=getattr(settings, 'GENERATION_BATCH_TYPES', None),
+            max_files=getattr(settings, 'GENERATION_BATCH_MAX_FILES', 6),
+            max_output_tokens=self.batch_max_output_tokens
+        )
+        self.generation_stats = {}
+        self.file_sources = {}
+        self.prefetched_patterns = {}
+        self.request_policy = None
+        self.on_file_chunk = None
+        self.on_file_complete = None
     
-    def generate_project_files(self, specs: Dict[str, Any]) -> Dict[str, str]:
+    def generate_project_files(self, specs: Dict[str, Any],
+                               on_file_chunk: Callable[[str, str], None] = None,
+                               on_file_complete: Callable[[str, str, bool], None] = None,
+                               existing_files: Dict[str, str] = None) -> Dict[str, str]:
         """
         Generate all project files from specifications
         
+        Files are scheduled in dependency waves: every file in a wave is
+        generated concurrently (up to `max_workers`), and dependents see the
+        exported signatures of the files they import. The returned
+        dictionary keeps the order of `specs['file_structure']`.
+        
+        Args:
+            specs: Project specifications
+            on_file_chunk: Enables streaming mode; called with (path, text)
+                for every chunk the model streams back
+            on_file_complete: Called with (path, content, success) once a
+                file is finalized
+            existing_files: Already-generated files (e.g. checkpoints from
+                an interrupted run); these are reused instead of regenerated
+        
         Returns:
             Dictionary mapping file paths to file contents
         """
         
         files = {}
+        self.on_file_chunk = on_file_chunk
+        self.on_file_complete = on_file_complete
+        self.file_sources = {}
+        self.request_policy = RequestPolicy.from_settings(
+            budget_seconds=getattr(settings, 'GENERATION_TIME_BUDGET', None)
+        )
         
         frontend_framework = specs['architecture']['frontend']['framework']
         backend_framework = specs['architecture']['backend']['framework']
         
-        for file_spec in specs['file_structure']:
-            try:
-                content = self._generate_file(file_spec, specs, frontend_framework, backend_framework)
-                files[file_spec['path']] = content
-            except Exception as e:
-                print(f"Error generating {file_spec['path']}: {str(e)}")
-                files[file_spec['path']] = f"// Error generating file: {str(e)}"
+        file_specs = specs['file_structure']
+        self.spec_slicer.reset()
+        scheduler = FileScheduler(file_specs)
+        self.generation_stats['schedule'] = scheduler.get_statistics()
+        
+        specs_by_path = {file_spec['path']: file_spec for file_spec in file_specs}
+        generated = {
+            path: content for path, content in (existing_files or {}).items()
+            if path in specs_by_path and not content.startswith('// Error generating file')
+        }
+        for path in generated:
+            self.file_sources[path] = {'source': 'checkpoint', 'seconds': 0.0}
+        
+        pending_specs = [file_spec for file_spec in file_specs if file_spec['path'] not in generated]
+        self.prefetched_patterns = self._prefetch_patterns(pending_specs, frontend_framework, backend_framework)
+        workers = max(1, min(self.max_workers, len(file_specs)))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for wave in scheduler.waves:
+                wave = [path for path in wave if path not in generated]
+                if not wave:
+                    continue
+                
+                interfaces = {
+                    path: self._dependency_interfaces(scheduler.dependencies[path], generated)
+                    for path in wave
+                }
+                wave_specs = [specs_by_path[path] for path in wave]
+                
+                if self.batching_enabled:
+                    batches, singles = self.file_batcher.plan(
+                        wave_specs,
+                        group_key=lambda fs: self._framework_for(fs, frontend_framework, backend_framework)
+                    )
+                else:
+                    batches, singles = [], wave_specs
+                
+                batch_futures = [
+                    executor.submit(
+                        self._generate_batch_safe, batch, specs,
+                        frontend_framework, backend_framework, interfaces
+                    )
+                    for batch in batches
+                ]
+                single_futures = {
+                    file_spec['path']: executor.submit(
+                        self._generate_file_safe, file_spec, specs,
+                        frontend_framework, backend_framework,
+                        interfaces[file_spec['path']]
+                    )
+                    for file_spec in singles
+                }
+                
+                for future in batch_futures:
+                    generated.update(future.result())
+                for path, future in single_futures.items():
+                    generated[path] = future.result()
+        
+        for file_spec in file_specs:
+            files[file_spec['path']] = generated[file_spec['path']]
+        
+        self.generation_stats['spec_slicing'] = self.spec_slicer.get_statistics()
+        self.generation_stats['fast_path'] = self._fast_path_statistics()
+        self.generation_stats['batching'] = self._batching_statistics()
+        self.generation_stats['request_policy'] = self.request_policy.get_statistics()
         
         files.update(self._generate_config_files(specs, frontend_framework, backend_framework))
         files.update(self._generate_documentation(specs))
         
         return files
     
-    def _generate_file(self, file_spec: Dict[str, Any], specs: Dict[str, Any],
-                      frontend_framework: str, backend_framework: str) -> str:
-        """Generate content for a single file"""
+    def _fast_path_statistics(self) -> Dict[str, Any]:
+        """Summarize how many files skipped the LLM and the time that saved"""
+        
+        template = [r['seconds'] for r in self.file_sources.values() if r['source'] == 'template']
+        llm = [r['seconds'] for r in self.file_sources.values() if r['source'] == 'llm']
+        total = len(template) + len(llm)
+        avg_llm = sum(llm) / len(llm) if llm else 0.0
+        avg_template = sum(template) / len(template) if template else 0.0
+        
+        return {
+            'template_files': len(template),
+            'llm_files': len(llm),
+            'hit_rate': len(template) / total if total else 0.0,
+            'avg_llm_seconds': round(avg_llm, 3),
+            'estimated_seconds_saved': round(len(template) * max(avg_llm - avg_template, 0.0), 3)
+        }
+    
+    def _batching_statistics(self) -> Dict[str, Any]:
+        """Summarize how many files were generated through shared prompts"""
+        
+        batched = [r for r in self.file_sources.values() if r['source'] == 'batch']
+        
+        return {
+            'batches': len({r['batch'] for r in batched}),
+            'batched_files': len(batched),
+            'fallback_files': len([r for r in self.file_sources.values() if r.get('batch_fallback')])
+        }
+    
+    def _prefetch_patterns(self, file_specs: List[Dict[str, Any]],
+                           frontend_framework: str, backend_framework: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve reference patterns for every planned file in one bulk search
+        
+        Specs missing a path, purpose or type are left out here; their error
+        surfaces when that file is generated, without failing the others.
+        """
+        
+        searchable = [
+            file_spec for file_spec in file_specs
+            if isinstance(file_spec, dict)
+            and all(file_spec.get(key) for key in ('path', 'purpose', 'type'))
+        ]
+        
+        queries = [
+            {
+                'query': f"{file_spec['purpose']} {file_spec['type']}",
+                'framework': self._framework_for(file_spec, frontend_framework, backend_framework),
+                'pattern_type': file_spec['type'],
+                'top_k': 3
+            }
+            for file_spec in searchable
+        ]
+        
+        try:
+            results = self.pattern_retriever.search_patterns_bulk(queries)
+        except Exception as e:
+            print(f"Pattern prefetch failed, falling back to per-file search: {str(e)}")
+            return {}
+        
+        return {file_spec['path']: patterns for file_spec, patterns in zip(searchable, results)}
+    
+    def _find_patterns(self, file_spec: Dict[str, Any], framework: str,
+                       top_k: int = 3) -> List[Dict[str, Any]]:
+        """Return prefetched patterns for a file, searching only on a prefetch miss"""
         
-        file_type = file_spec['type']
-        framework = frontend_framework if 'frontend' in file_spec['path'] else backend_framework
+        if file_spec['path'] in self.prefetched_patterns:
+            return self.prefetched_patterns[file_spec['path']][:top_k]
         
-        relevant_patterns = self.pattern_retriever.search_patterns(
-            query=f"{file_spec['purpose']} {file_type}",
+        return self.pattern_retriever.search_patterns(
+            query=f"{file_spec['purpose']} {file_spec['type']}",
             framework=framework,
-            pattern_type=file_type,
-            top_k=3
+            pattern_type=file_spec['type'],
+            top_k=top_k
         )
+    
+    def _framework_for(self, file_spec: Dict[str, Any],
+                       frontend_framework: str, backend_framework: str) -> str:
+        return frontend_framework if 'frontend' in file_spec['path'] else backend_framework
+    
+    def _notify_file_complete(self, path: str, content: str, success: bool) -> None:
+        if self.on_file_complete:
+            try:
+                self.on_file_complete(path, content, success)
+            except Exception as e:
+                print(f"File completion callback failed for {path}: {str(e)}")
+    
+    def _dependency_interfaces(self, dependencies: List[str],
+                               generated: Dict[str, str]) -> Dict[str, str]:
+        """Collect exported signatures of already-generated dependencies"""
+        
+        interfaces = {}
+        for dep_path in dependencies:
+            content = generated.get(dep_path)
+            if not content or content.startswith('// Error generating file'):
+                continue
+            signatures = extract_signatures(dep_path, content)
+            if signatures:
+                interfaces[dep_path] = signatures
+        
+        return interfaces
+    
+    def _generate_file_safe(self, file_spec: Dict[str, Any], specs: Dict[str, Any],
+                           frontend_framework: str, backend_framework: str,
+                           dependency_interfaces: Dict[str, str] = None) -> str:
+        """Generate a single file, turning failures into a placeholder"""
+        
+        try:
+            content = self._generate_file(file_spec, specs, frontend_framework, backend_framework,
+                                          dependency_interfaces)
+            success = True
+        except Exception as e:
+            print(f"Error generating {file_spec['path']}: {str(e)}")
+            content = f"// Error generating file: {str(e)}"
+            success = False
+        
+        self._notify_file_complete(file_spec['path'], content, success)
         
-        prompt = self._build_file_generation_prompt(file_spec, specs, relevant_patterns, framework)
+        return content
+    
+    def _generate_batch_safe(self, batch: List[Dict[str, Any]], specs: Dict[str, Any],
+                            frontend_framework: str, backend_framework: str,
+                            interfaces: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        """Generate a batch of files, falling back to single calls for any file that fails"""
         
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    'temperature': 0.4,
-                    'max_output_tokens': 4096,
+            results = self._generate_batch(batch, specs, frontend_framework, backend_framework, interfaces)
+        except Exception as e:
+            print(f"Batch generation failed for {len(batch)} files: {str(e)}")
+            results = {}
+        
+        for file_spec in batch:
+            path = file_spec['path']
+            if path in results:
+                self._notify_file_complete(path, results[path], True)
+            else:
+                results[path] = self._generate_file_safe(
+                    file_spec, specs, frontend_framework, backend_framework, interfaces.get(path)
+                )
+                if path in self.file_sources:
+                    self.file_sources[path]['batch_fallback'] = True
+        
+        return results
+    
+    def _generate_batch(self, batch: List[Dict[str, Any]], specs: Dict[str, Any],
+                       frontend_framework: str, backend_framework: str,
+                       interfaces: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        """
+        Generate several small files with one prompt
+        
+        Returns only the files that were produced; files missing from the
+        response are left for the caller to generate individually.
+        """
+        
+        framework = self._framework_for(batch[0], frontend_framework, backend_framework)
+        started = time.monotonic()
+        results = {}
+        pending = []
+        
+        for file_spec in batch:
+            patterns = self._find_patterns(file_spec, framework, top_k=1)
+            template = self.template_renderer.select_pattern(file_spec, patterns)
+            content = self.template_renderer.render(template, file_spec, specs) if template else None
+            if content is not None:
+                results[file_spec['path']] = content
+                self.file_sources[file_spec['path']] = {
+                    'source': 'template',
+                    'distance': template.get('distance'),
+                    'seconds': time.monotonic() - started
                 }
-            )
+            else:
+                pending.append((file_spec, patterns))
+        
+        if len(pending) < 2:
+            return results
+        
+        prompt = self._build_batch_generation_prompt(pending, specs, framework, interfaces)
+        paths = [file_spec['path'] for file_spec, _ in pending]
+        
+        response = generate_content(
+            self.model,
+            prompt,
+            generation_config={
+                'temperature': 0.4,
+                'max_output_tokens': self.batch_max_output_tokens,
+            },
+            policy=self.request_policy,
+            validate=lambda text: len(self.file_batcher.split_response(text, paths)) == len(paths)
+        )
+        
+        contents = self.file_batcher.split_response(response.text, paths)
+        elapsed = time.monotonic() - started
+        
+        for path, content in contents.items():
+            results[path] = self._extract_code(content)
+            self.file_sources[path] = {
+                'source': 'batch',
+                'batch': paths[0],
+                'seconds': elapsed / len(pending)
+            }
+        
+        return results
+    
+    def _generate_file(self, file_spec: Dict[str, Any], specs: Dict[str, Any],
+                      frontend_framework: str, backend_framework: str,
+                      dependency_interfaces: Dict[str, str] = None) -> str:
+        """Generate content for a single file"""
+        
+        framework = self._framework_for(file_spec, frontend_framework, backend_framework)
+        
+        relevant_patterns = self._find_patterns(file_spec, framework, top_k=3)
+        
+        started = time.monotonic()
+        
+        template = self.template_renderer.select_pattern(file_spec, relevant_patterns)
+        content = self.template_renderer.render(template, file_spec, specs) if template else None
+        if content is not None:
+            self.file_sources[file_spec['path']] = {
+                'source': 'template',
+                'distance': template.get('distance'),
+                'seconds': time.monotonic() - started
+            }
+            return content
+        
+        prompt = self._build_file_generation_prompt(file_spec, specs, relevant_patterns, framework,
+                                                    dependency_interfaces)
+        
+        generation_config = {
+            'temperature': 0.4,
+            'max_output_tokens': 4096,
+        }
+        
+        try:
+            if self.on_file_chunk:
+                on_file_chunk = self.on_file_chunk
+                text = stream_content(
+                    self.model,
+                    prompt,
+                    generation_config=generation_config,
+                    on_chunk=lambda chunk: on_file_chunk(file_spec['path'], chunk),
+                    policy=self.request_policy
+                )
+            else:
+                text = generate_content(
+                    self.model,
+                    prompt,
+                    generation_config=generation_config,
+                    policy=self.request_policy
+                ).text
             
-            content = self._extract_code(response.text)
+            content = self._extract_code(text)
+            self.file_sources[file_spec['path']] = {
+                'source': 'llm',
+                'seconds': time.monotonic() - started
+            }
             return content
             
         except Exception as e:
@@ -75,7 +408,8 @@ class CodeGenerator:
     def _build_file_generation_prompt(self, file_spec: Dict[str, Any], 
                                      specs: Dict[str, Any],
                                      patterns: List[Dict[str, Any]],
-                                     framework: str) -> str:
+                                     framework: str,
+                                     dependency_interfaces: Dict[str, str] = None) -> str:
         """Build prompt for file generation"""
         
         patterns_text = "\n\n".join([
@@ -83,6 +417,11 @@ class CodeGenerator:
             for i, p in enumerate(patterns)
         ]) if patterns else "No examples available"
         
+        interfaces_text = "\n\n".join([
+            f"{path}:\n{signatures}"
+            for path, signatures in dependency_interfaces.items()
+        ]) if dependency_interfaces else "None generated yet"
+        
         return f"""Generate production-ready code for the following file:
 
 FILE PATH: {file_spec['path']}
@@ -91,8 +430,11 @@ PURPOSE: {file_spec['purpose']}
 FRAMEWORK: {framework}
 DEPENDENCIES: {', '.join(file_spec.get('dependencies', []))}
 
-PROJECT SPECIFICATIONS:
-{json.dumps(specs, indent=2)}
+PROJECT SPECIFICATIONS (relevant to this file):
+{self.spec_slicer.build_context(file_spec, specs)}
+
+DEPENDENCY INTERFACES (already generated, import exactly these names):
+{interfaces_text}
 
 REFERENCE PATTERNS:
 {patterns_text}
@@ -107,6 +449,44 @@ Generate complete, production-ready code following best practices:
 
 Return ONLY the code, no markdown formatting or explanations."""
 
+    def _build_batch_generation_prompt(self, pending: List[tuple],
+                                       specs: Dict[str, Any],
+                                       framework: str,
+                                       interfaces: Dict[str, Dict[str, str]]) -> str:
+        """Build one prompt for several small files using the FILE delimiter protocol"""
+        
+        sections = []
+        for i, (file_spec, patterns) in enumerate(pending):
+            dependency_interfaces = interfaces.get(file_spec['path']) or {}
+            interfaces_text = "\n".join([
+                f"{path}:\n{signatures}" for path, signatures in dependency_interfaces.items()
+            ]) or "None"
+            example = patterns[0]['code'] if patterns else "No example available"
+            
+            sections.append(f"""FILE {i+1}
+PATH: {file_spec['path']}
+TYPE: {file_spec['type']}
+PURPOSE: {file_spec['purpose']}
+DEPENDENCIES: {', '.join(file_spec.get('dependencies', []))}
+SPECIFICATIONS: {self.spec_slicer.build_context(file_spec, specs)}
+DEPENDENCY INTERFACES:
+{interfaces_text}
+REFERENCE PATTERN:
+{example}""")
+        
+        files_text = "\n\n".join(sections)
+        
+        return f"""Generate production-ready {framework} code for each of the following {len(pending)} files.
+
+{files_text}
+
+Follow framework conventions, include all necessary imports, and add error handling where needed.
+
+Output every file in exactly this format, with nothing before, between or after the blocks:
+{FILE_START.format(path='<exact file path>')}
+<complete file content, no markdown fences>
+{FILE_END}"""
+
     def _extract_code(self, response_text: str) -> str:
         """Extract code from Gemini response"""
         
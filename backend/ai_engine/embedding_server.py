@@ -0,0 +1,283 @@
+"""
+Embedding Server
+One shared encoder per host that merges concurrent encode requests from all
+Celery workers into micro-batches
+
+Run (from backend/):
+    python -m ai_engine.embedding_server
+    python -m ai_engine.embedding_server --address 127.0.0.1:7701
+
+Workers use it by setting EMBEDDING_SERVER_ADDRESS to the same address
+(a unix socket path, or host:port).
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Any, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('!I')
+
+
+def parse_address(address: str):
+    """'host:port' -> (host, port); anything else is a unix socket path"""
+
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit() and '/' not in address:
+        return host, int(port)
+    return address
+
+
+def _send(sock: socket.socket, header: Dict[str, Any], payload: bytes = b'') -> None:
+    body = json.dumps(header).encode('utf-8')
+    sock.sendall(HEADER.pack(len(body)) + body + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError('Embedding server connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv(sock: socket.socket) -> Dict[str, Any]:
+    size, = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return json.loads(_recv_exact(sock, size))
+
+
+class MicroBatcher:
+    """
+    Collects encode requests and runs them through the model together
+
+    A batch is flushed when it reaches `max_batch_size` texts or when the
+    oldest request has waited `max_wait` seconds, whichever comes first.
+    """
+
+    def __init__(self, encoder, max_batch_size: int = 64, max_wait: float = 0.005):
+        self.encoder = encoder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self.stats = {'requests': 0, 'texts': 0, 'batches': 0, 'encode_seconds': 0.0}
+        self._thread = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            self._encode(pending)
+
+    def _encode(self, pending: List[Tuple[List[str], Future]]) -> None:
+        texts = [text for request_texts, _ in pending for text in request_texts]
+        started = time.monotonic()
+        try:
+            embeddings = np.asarray(self.encoder.encode(texts, batch_size=self.max_batch_size), dtype=np.float32)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        self.stats['requests'] += len(pending)
+        self.stats['texts'] += len(texts)
+        self.stats['batches'] += 1
+        self.stats['encode_seconds'] += time.monotonic() - started
+
+        offset = 0
+        for request_texts, future in pending:
+            future.set_result(embeddings[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+
+class EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    """One persistent client connection; requests are answered in order"""
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request = _recv(self.request)
+            except (ConnectionError, OSError):
+                return
+
+            try:
+                if request.get('op') == 'info':
+                    _send(self.request, self.server.info())
+                    continue
+
+                embeddings = self.server.batcher.submit(request['texts']).result()
+                _send(self.request, {'shape': list(embeddings.shape)}, embeddings.tobytes())
+            except Exception as e:
+                _send(self.request, {'error': str(e)})
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+def create_server(address: str, encoder, model_name: str, max_batch_size: int = 64,
+                  max_wait: float = 0.005):
+    """Bind an embedding server on `address` (unix socket path or host:port)"""
+
+    target = parse_address(address)
+    if isinstance(target, str):
+        if os.path.exists(target):
+            os.unlink(target)
+        server = ThreadingUnixServer(target, EmbeddingRequestHandler)
+    else:
+        server = ThreadingTCPServer(target, EmbeddingRequestHandler)
+
+    server.batcher = MicroBatcher(encoder, max_batch_size=max_batch_size, max_wait=max_wait)
+    server.info = lambda: {
+        'model': model_name,
+        'dimension': encoder.get_sentence_embedding_dimension(),
+        'max_batch_size': max_batch_size,
+        'max_wait': max_wait,
+        'stats': dict(server.batcher.stats),
+    }
+    return server
+
+
+class EmbeddingClient:
+    """
+    Drop-in replacement for the SentenceTransformer `encode` call that sends
+    texts to the shared embedding server
+
+    Each thread keeps its own persistent connection; a broken connection is
+    re-opened once before the error is raised.
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Embeddings as a float32 (n, dimension) array"""
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        header, sock = self._request({'texts': texts})
+        try:
+            shape = tuple(header['shape'])
+            embeddings = np.frombuffer(_recv_exact(sock, int(np.prod(shape)) * 4), dtype=np.float32).reshape(shape)
+        except Exception:
+            # A partly read payload leaves the stream out of sync
+            self._close()
+            raise
+        return embeddings[0] if single else embeddings
+
+    def info(self) -> Dict[str, Any]:
+        return self._request({'op': 'info'})[0]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.info()['dimension']
+
+    def _request(self, request: Dict[str, Any]):
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                _send(sock, request)
+                header = _recv(sock)
+                break
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt:
+                    raise
+
+        if 'error' in header:
+            raise RuntimeError(f"Embedding server error: {header['error']}")
+        return header, sock
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            target = parse_address(self.address)
+            family = socket.AF_UNIX if isinstance(target, str) else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+            self._local.sock = sock
+        return sock
+
+    def _close(self) -> None:
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+            self._local.sock = None
+
+
+def main() -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webforge.settings.development')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from .registry import registry, DEFAULT_ENCODER_MODEL
+
+    parser = argparse.ArgumentParser(description='Shared micro-batching embedding server')
+    parser.add_argument('--address', default=getattr(settings, 'EMBEDDING_SERVER_ADDRESS', '') or '/tmp/webforge-embeddings.sock')
+    parser.add_argument('--model', default=DEFAULT_ENCODER_MODEL)
+    parser.add_argument('--max-batch-size', type=int, default=getattr(settings, 'EMBEDDING_SERVER_MAX_BATCH_SIZE', 64))
+    parser.add_argument('--max-wait-ms', type=float, default=getattr(settings, 'EMBEDDING_SERVER_MAX_WAIT_MS', 5.0))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    encoder = registry.get_encoder(args.model, use_server=False)
+    server = create_server(args.address, encoder, args.model,
+                           max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000)
+
+    logger.info(f"Embedding server for {args.model} listening on {args.address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
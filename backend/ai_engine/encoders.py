@@ -0,0 +1,240 @@
+"""
+Encoder Backends
+Full-precision PyTorch, dynamically quantized PyTorch, and ONNX Runtime
+versions of the pattern encoder behind one `encode()` interface
+
+Export an ONNX encoder ahead of deployment (from backend/); the onnx
+backends load an existing export and never export inside a worker:
+    python -m ai_engine.encoders --model all-MiniLM-L6-v2 --output ./onnx_models --quantize
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Any
+import numpy as np
+
+ENCODER_BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+
+# Minimum cosine similarity between a backend's embeddings and the torch ones
+DEFAULT_TOLERANCE = 0.99
+
+ONNX_FILE = 'model.onnx'
+ONNX_INT8_FILE = 'model.int8.onnx'
+CONFIG_FILE = 'encoder.json'
+
+VERIFICATION_TEXTS = [
+    'Login component with form validation',
+    'CRUD API endpoint',
+    'from django.db import models\nclass Item(models.Model):\n    title = models.CharField(max_length=200)',
+    "import React, { useState, useEffect } from 'react';",
+    'Pinia store with defineStore',
+]
+
+
+def load_encoder(model_name: str, backend: str = 'torch', onnx_directory: str = './onnx_models',
+                 threads: int = None):
+    """Build an encoder for `model_name` using `backend`, optionally capping CPU threads"""
+
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend}")
+
+    if backend.startswith('onnx'):
+        model_directory = onnx_model_directory(onnx_directory, model_name)
+        quantized = backend == 'onnx-int8'
+        model_file = ONNX_INT8_FILE if quantized else ONNX_FILE
+        if not os.path.exists(os.path.join(model_directory, model_file)):
+            raise FileNotFoundError(
+                f"No {backend} export of {model_name} in {model_directory}; run "
+                f"`python -m ai_engine.encoders --model {model_name} --output {onnx_directory}"
+                f"{' --quantize' if quantized else ''}` before starting workers"
+            )
+        return OnnxEncoder(model_directory, quantized=quantized, threads=threads)
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if threads:
+        torch.set_num_threads(threads)
+
+    if backend == 'torch':
+        return SentenceTransformer(model_name)
+
+    # Dynamic quantization only runs on CPU
+    model = SentenceTransformer(model_name, device='cpu')
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def onnx_model_directory(onnx_directory: str, model_name: str) -> str:
+    """Where the ONNX export of `model_name` lives under `onnx_directory`"""
+
+    return os.path.join(onnx_directory, model_name.replace('/', '__'))
+
+
+def embedding_agreement(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Lowest cosine similarity between matching rows"""
+
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    return float(np.min(np.sum(reference * candidate, axis=1)))
+
+
+class OnnxEncoder:
+    """
+    SentenceTransformer-compatible `encode()` running an exported transformer
+    graph on ONNX Runtime (CPU), followed by the same pooling and
+    normalization the sentence-transformers pipeline applies
+    """
+
+    def __init__(self, model_directory: str, quantized: bool = False, threads: int = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_directory, CONFIG_FILE)) as f:
+            self.config = json.load(f)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_directory)
+        self.max_seq_length = self.config['max_seq_length']
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(model_directory, ONNX_INT8_FILE if quantized else ONNX_FILE),
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        # Sort by length so each batch pads as little as possible
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = np.zeros((len(texts), self.config['dimension']), dtype=np.float32)
+
+        for start in range(0, len(texts), batch_size):
+            rows = order[start:start + batch_size]
+            tokens = self.tokenizer(
+                [texts[i] for i in rows],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            feed = {name: value.astype(np.int64) for name, value in tokens.items() if name in self._input_names}
+            hidden = self.session.run(None, feed)[0]
+            embeddings[rows] = self._pool(hidden, tokens['attention_mask'])
+
+        return embeddings[0] if single else embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config['dimension']
+
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        if self.config['pooling'] == 'cls':
+            pooled = hidden[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.config['normalize']:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+
+def export_onnx(model_name: str, output_directory: str, quantize: bool = True,
+                tolerance: float = DEFAULT_TOLERANCE, overwrite: bool = False) -> Dict[str, Any]:
+    """
+    Export the transformer of a sentence-transformers model to ONNX, and
+    optionally a dynamically quantized int8 copy
+
+    An existing float export is reused unless `overwrite` is set, so adding
+    the int8 copy later only runs the quantization. Each graph is checked
+    against the PyTorch embeddings on VERIFICATION_TEXTS; an export below
+    `tolerance` cosine similarity raises instead of being used.
+    """
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_directory, exist_ok=True)
+    model = SentenceTransformer(model_name, device='cpu')
+    transformer = model[0].auto_model
+    transformer.config.return_dict = False
+    transformer.eval()
+
+    pooling = next((module for module in model if type(module).__name__ == 'Pooling'), None)
+    config = {
+        'model': model_name,
+        'dimension': model.get_sentence_embedding_dimension(),
+        'max_seq_length': model.max_seq_length,
+        'pooling': 'cls' if pooling is not None and pooling.pooling_mode_cls_token else 'mean',
+        'normalize': any(type(module).__name__ == 'Normalize' for module in model),
+    }
+
+    sample = model.tokenizer(['export sample'], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    onnx_path = os.path.join(output_directory, ONNX_FILE)
+    exported = os.path.exists(onnx_path) and os.path.exists(os.path.join(output_directory, CONFIG_FILE))
+    if overwrite or not exported:
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                tuple(sample[name] for name in input_names),
+                onnx_path,
+                input_names=input_names,
+                output_names=['last_hidden_state'],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+
+        model.tokenizer.save_pretrained(output_directory)
+        with open(os.path.join(output_directory, CONFIG_FILE), 'w') as f:
+            json.dump(config, f, indent=2)
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(onnx_path, os.path.join(output_directory, ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+
+    reference = np.asarray(model.encode(VERIFICATION_TEXTS), dtype=np.float32)
+    report = {'output_directory': output_directory, 'agreement': {}}
+    for quantized in ([False, True] if quantize else [False]):
+        agreement = embedding_agreement(reference, OnnxEncoder(output_directory, quantized=quantized).encode(VERIFICATION_TEXTS))
+        report['agreement']['onnx-int8' if quantized else 'onnx'] = agreement
+        if agreement < tolerance:
+            raise ValueError(
+                f"{'Quantized ' if quantized else ''}ONNX export of {model_name} disagrees with "
+                f"PyTorch (cosine {agreement:.4f} < {tolerance})"
+            )
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Export a sentence-transformers model to ONNX')
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--output', default='./onnx_models')
+    parser.add_argument('--quantize', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--overwrite', action='store_true', help='Re-export an existing float graph')
+    args = parser.parse_args()
+
+    report = export_onnx(
+        args.model,
+        onnx_model_directory(args.output, args.model),
+        quantize=args.quantize,
+        tolerance=args.tolerance,
+        overwrite=args.overwrite
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+File Batcher
+Packs small planned files into shared generation prompts
+"""
+
+import os
+import re
+from typing import Dict, List, Any, Tuple
+
+
+FILE_START = '<<<FILE: {path}>>>'
+FILE_END = '<<<END FILE>>>'
+
+FILE_BLOCK = re.compile(r'<<<FILE:\s*(.+?)\s*>>>\s*\n(.*?)\n?<<<END FILE>>>', re.DOTALL)
+
+SMALL_FILE_NAMES = {'index', 'main', 'urls', 'apps', 'admin', '__init__', 'constants', 'routes'}
+
+
+class FileBatcher:
+    """
+    Estimates the output size of each file spec and groups small files of
+    batchable types into batches that fit one response
+    """
+
+    def __init__(self, type_estimates: Dict[str, int] = None, max_files: int = 6,
+                 max_output_tokens: int = 8192, fill_ratio: float = 0.75):
+        # Estimated output tokens per batchable file type; other types are
+        # always generated on their own
+        self.type_estimates = type_estimates if type_estimates is not None else {
+            'component': 700,
+            'config': 300,
+        }
+        self.max_files = max_files
+        self.token_budget = int(max_output_tokens * fill_ratio)
+
+    def estimate_output_tokens(self, file_spec: Dict[str, Any]) -> int:
+        """Estimate how many output tokens a file will need"""
+
+        estimate = self.type_estimates.get(file_spec.get('type'), self.token_budget)
+        stem = os.path.splitext(os.path.basename(file_spec['path']))[0].lower()
+
+        if stem in SMALL_FILE_NAMES:
+            estimate = min(estimate, 200)
+        if len(file_spec.get('dependencies', []) or []) > 4:
+            estimate = int(estimate * 1.5)
+
+        return estimate
+
+    def plan(self, file_specs: List[Dict[str, Any]],
+             group_key=None) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Split file specs into batches and files to generate individually
+
+        Args:
+            file_specs: File specs to plan (e.g. one dependency wave)
+            group_key: Optional callable; only files with the same key are
+                batched together (e.g. their framework)
+
+        Returns:
+            (batches, singles) - batches always hold at least two files
+        """
+
+        groups = {}
+        singles = []
+
+        for file_spec in file_specs:
+            estimate = self.estimate_output_tokens(file_spec)
+            if file_spec.get('type') not in self.type_estimates or estimate > self.token_budget // 2:
+                singles.append(file_spec)
+                continue
+            key = group_key(file_spec) if group_key else None
+            groups.setdefault(key, []).append((file_spec, estimate))
+
+        batches = []
+        for members in groups.values():
+            current, used = [], 0
+            for file_spec, estimate in members:
+                if current and (used + estimate > self.token_budget or len(current) >= self.max_files):
+                    batches.append(current)
+                    current, used = [], 0
+                current.append(file_spec)
+                used += estimate
+            if current:
+                batches.append(current)
+
+        # A batch of one gains nothing over a normal call
+        singles.extend(batch[0] for batch in batches if len(batch) == 1)
+        batches = [batch for batch in batches if len(batch) > 1]
+
+        return batches, singles
+
+    def split_response(self, response_text: str, paths: List[str]) -> Dict[str, str]:
+        """
+        Split a combined response back into per-file contents
+
+        Only blocks whose path was requested are returned; missing or empty
+        blocks are left out so the caller can fall back for them.
+        """
+
+        wanted = set(paths)
+        contents = {}
+
+        for match in FILE_BLOCK.finditer(response_text):
+            path = match.group(1).strip()
+            content = match.group(2).strip()
+            if path in wanted and content and path not in contents:
+                contents[path] = content
+
+        return contents
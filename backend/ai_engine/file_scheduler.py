@@ -0,0 +1,186 @@
+"""
+Dependency-aware File Scheduler
+Orders planned files into waves that can be generated in parallel
+"""
+
+import os
+import re
+from typing import Dict, List, Any
+
+
+class FileScheduler:
+    """
+    Builds a DAG from the `dependencies` of each `file_structure` entry
+    and groups files into topological levels (waves)
+    """
+
+    def __init__(self, file_specs: List[Dict[str, Any]]):
+        self.file_specs = file_specs
+        self.paths = []
+        for file_spec in file_specs:
+            if file_spec['path'] not in self.paths:
+                self.paths.append(file_spec['path'])
+
+        self.unknown_dependencies = []
+        self.broken_cycles = []
+        self.dependencies = self._resolve_dependencies()
+        self.waves = self._build_waves()
+
+    @property
+    def critical_path_length(self) -> int:
+        """Number of sequential waves, i.e. the best achievable latency in file round trips"""
+        return len(self.waves)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get scheduling statistics"""
+
+        return {
+            'total_files': len(self.paths),
+            'waves': [len(wave) for wave in self.waves],
+            'critical_path_length': self.critical_path_length,
+            'max_parallelism': max([len(wave) for wave in self.waves], default=0),
+            'unknown_dependencies': len(self.unknown_dependencies),
+            'broken_cycles': len(self.broken_cycles)
+        }
+
+    def _resolve_dependencies(self) -> Dict[str, List[str]]:
+        """Map every file to the planned files it depends on"""
+
+        by_stem = {}
+        for path in self.paths:
+            stem = os.path.splitext(os.path.basename(path))[0].lower()
+            by_stem.setdefault(stem, []).append(path)
+
+        resolved = {path: [] for path in self.paths}
+
+        for file_spec in self.file_specs:
+            path = file_spec['path']
+            for dep in file_spec.get('dependencies', []) or []:
+                target = self._match_dependency(str(dep), by_stem)
+                if target is None:
+                    self.unknown_dependencies.append((path, dep))
+                elif target != path and target not in resolved[path]:
+                    resolved[path].append(target)
+
+        return resolved
+
+    def _match_dependency(self, dep: str, by_stem: Dict[str, List[str]]) -> str:
+        """Match a dependency name or path against the planned file paths"""
+
+        if dep in self.paths:
+            return dep
+
+        normalized = dep.strip().lstrip('./').lower()
+        for path in self.paths:
+            if normalized and (path.lower() == normalized or path.lower().endswith('/' + normalized)):
+                return path
+
+        stem = os.path.splitext(os.path.basename(normalized))[0]
+        candidates = by_stem.get(stem, [])
+        if len(candidates) == 1:
+            return candidates[0]
+
+        return None
+
+    def _build_waves(self) -> List[List[str]]:
+        """
+        Group files into topological levels
+
+        Files in a dependency cycle are released together, in the earliest
+        wave their dependencies outside the cycle allow; the edges inside
+        the cycle are dropped and recorded in `broken_cycles`.
+        """
+
+        components = self._strongly_connected_components()
+        component_of = {path: index for index, members in enumerate(components) for path in members}
+
+        # Components come out of Tarjan's algorithm dependencies first
+        levels = []
+        for index, members in enumerate(components):
+            outside = {component_of[dep] for path in members for dep in self.dependencies[path]} - {index}
+            levels.append(1 + max((levels[dep] for dep in outside), default=-1))
+
+            if len(members) > 1:
+                cycle = set(members)
+                for path in sorted(members, key=self.paths.index):
+                    self.broken_cycles.append((path, sorted(set(self.dependencies[path]) & cycle)))
+
+        waves = [[] for _ in range(max(levels, default=-1) + 1)]
+        for path in self.paths:
+            waves[levels[component_of[path]]].append(path)
+        return waves
+
+    def _strongly_connected_components(self) -> List[List[str]]:
+        """Tarjan's algorithm, iterative; every component follows those it depends on"""
+
+        index_of, lowlink = {}, {}
+        stack, on_stack = [], set()
+        components = []
+
+        for root in self.paths:
+            if root in index_of:
+                continue
+            work = [(root, iter(self.dependencies[root]))]
+            index_of[root] = lowlink[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                path, deps = work[-1]
+                for dep in deps:
+                    if dep not in index_of:
+                        index_of[dep] = lowlink[dep] = len(index_of)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.dependencies[dep])))
+                        break
+                    if dep in on_stack:
+                        lowlink[path] = min(lowlink[path], index_of[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[path])
+                    if lowlink[path] == index_of[path]:
+                        members = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            members.append(member)
+                            if member == path:
+                                break
+                        components.append(members)
+
+        return components
+
+
+SIGNATURE_PATTERNS = {
+    'python': re.compile(r'^(?:async\s+)?(?:def|class)\s+\w+'),
+    'javascript': re.compile(
+        r'^(?:export\s|module\.exports|exports\.\w+\s*=)'
+        r'|^\s*(?:const|let)\s+\w+\s*=\s*define(?:Props|Emits|Store)\b'
+    ),
+}
+
+
+def extract_signatures(path: str, content: str, max_lines: int = 40) -> str:
+    """
+    Extract the exported interface of a generated file
+
+    Keeps only top-level definitions and export statements so the
+    context added to dependent prompts stays small.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    pattern = SIGNATURE_PATTERNS['python'] if extension == '.py' else SIGNATURE_PATTERNS['javascript']
+
+    signatures = []
+    for line in content.split('\n'):
+        if extension == '.py' and line[:1].isspace():
+            continue
+        if pattern.match(line):
+            signatures.append(line.rstrip().rstrip('{').rstrip())
+            if len(signatures) >= max_lines:
+                break
+
+    return '\n'.join(signatures)
@@ -1,9 +1,7 @@
 import json
-import google.generativeai as genai
-from django.conf import settings
 from typing import Dict, List, Any
-
-genai.configure(api_key=settings.GEMINI_API_KEY)
+from .registry import registry
+from .llm_cache import generate_content
 
 class GeminiPlanner:
     """
@@ -12,7 +10,7 @@ class GeminiPlanner:
     """
     
     def __init__(self):
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model = registry.get_model('gemini-2.0-flash-exp')
         
     def analyze_requirements(self, description: str, features: List[str], 
                            tech_stack: Dict[str, str], 
@@ -24,14 +22,16 @@ class GeminiPlanner:
         prompt = self._build_analysis_prompt(description, features, tech_stack, style_preferences)
         
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.3,
                     'top_p': 0.95,
                     'top_k': 40,
                     'max_output_tokens': 8192,
-                }
+                },
+                validate=self._parse_specifications
             )
             
             specs = self._parse_specifications(response.text)
@@ -190,7 +190,7 @@ Provide implementation details including:
 Return as JSON with 'implementation_details' key."""
 
         try:
-            response = self.model.generate_content(prompt)
+            response = generate_content(self.model, prompt, validate=json.loads)
             return json.loads(response.text)
         except Exception as e:
             return {"error": str(e)}
@@ -0,0 +1,129 @@
+"""
+Lexical Index
+Incremental BM25 inverted index over pattern code and descriptions
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Tuple
+
+IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+CAMEL_PARTS = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Identifier-aware tokens: every identifier lowercased as a whole
+    (`useEffect` -> `useeffect`) plus its camelCase/snake_case parts
+    (`use`, `effect`), so exact API names and plain words both match.
+    """
+
+    tokens = []
+    for identifier in IDENTIFIER.findall(text):
+        whole = identifier.lower()
+        tokens.append(whole)
+        parts = [part.lower() for chunk in identifier.split('_') for part in CAMEL_PARTS.findall(chunk)]
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if len(part) > 1)
+    return tokens
+
+
+class LexicalIndex:
+    """
+    BM25 over an inverted index that is updated in place
+
+    Postings map term -> {pattern id: term frequency}. Pattern ids are also
+    grouped by framework and (framework, type) so searches only score
+    patterns that pass the same filter as the vector search.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._lengths = {}
+        self._filters = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, pattern_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        """Index one pattern, replacing an earlier version with the same id"""
+
+        with self._lock:
+            if pattern_id in self._lengths:
+                self.remove(pattern_id)
+
+            counts = Counter(tokenize(text))
+            for term, frequency in counts.items():
+                self._postings.setdefault(term, {})[pattern_id] = frequency
+
+            length = sum(counts.values())
+            self._lengths[pattern_id] = (length, metadata.get('framework'), metadata.get('type'), tuple(counts))
+            self._total_length += length
+            for key in self._filter_keys(metadata.get('framework'), metadata.get('type')):
+                self._filters.setdefault(key, set()).add(pattern_id)
+
+    def remove(self, pattern_id: str) -> None:
+        with self._lock:
+            entry = self._lengths.pop(pattern_id, None)
+            if entry is None:
+                return
+
+            length, framework, pattern_type, terms = entry
+            self._total_length -= length
+            for key in self._filter_keys(framework, pattern_type):
+                self._filters.get(key, set()).discard(pattern_id)
+            for term in terms:
+                postings = self._postings[term]
+                postings.pop(pattern_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, query: str, framework: str, pattern_type: str = None,
+               top_k: int = 20) -> List[Tuple[str, float]]:
+        """Top-k (pattern id, BM25 score) among patterns matching the filter"""
+
+        with self._lock:
+            allowed = self._filters.get(self._filter_keys(framework, pattern_type)[-1])
+            if not allowed:
+                return []
+
+            total = len(self._lengths)
+            average_length = self._total_length / total if total else 0.0
+            scores = {}
+
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for pattern_id, frequency in postings.items():
+                    if pattern_id not in allowed:
+                        continue
+                    length = self._lengths[pattern_id][0]
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length) if average_length else self.k1
+                    scores[pattern_id] = scores.get(pattern_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    @staticmethod
+    def _filter_keys(framework: str, pattern_type: str = None) -> List[Tuple[str, str]]:
+        keys = [(framework, None)]
+        if pattern_type:
+            keys.append((framework, pattern_type))
+        return keys
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[str]:
+    """Merge ranked id lists; ids ranked high in any list come first"""
+
+    scores = {}
+    for ranking in rankings:
+        for rank, pattern_id in enumerate(ranking):
+            scores[pattern_id] = scores.get(pattern_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda pattern_id: scores[pattern_id], reverse=True)
@@ -0,0 +1,254 @@
+"""
+LLM Response Cache
+Content-addressed cache for Gemini `generate_content` calls; cache misses
+go through a RequestPolicy (retries, hedging, deadlines)
+
+Only complete responses are cached: blocked, empty or truncated replies,
+and replies the caller's `validate` rejects, are returned but not stored,
+so a retry with the same input asks the model again.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Any, Callable
+from django.conf import settings
+from .caching import TieredCache
+from .request_policy import RequestPolicy, get_default_policy, is_retryable, first_chunk_tracker
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class StreamSuperseded(Exception):
+    """Raised inside a stream that lost the race to another attempt"""
+
+
+class CachedResponse:
+    """Minimal stand-in for a Gemini response served from the cache"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+def get_response_cache() -> TieredCache:
+    """Return the process-wide response cache"""
+
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TieredCache(
+                    prefix='llm_response',
+                    max_entries=getattr(settings, 'LLM_CACHE_MAX_ENTRIES', 512),
+                    ttl=getattr(settings, 'LLM_CACHE_TTL', 86400),
+                    cache_alias=getattr(settings, 'LLM_CACHE_ALIAS', 'default')
+                )
+    return _cache
+
+
+def response_cache_key(model_name: str, prompt: str,
+                       generation_config: Dict[str, Any] = None) -> str:
+    """Hash of model name, prompt and generation config"""
+
+    payload = json.dumps({
+        'model': model_name,
+        'prompt': prompt,
+        'config': generation_config or {}
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def generate_content(model, prompt: str, generation_config: Dict[str, Any] = None,
+                     use_cache: bool = True, policy: RequestPolicy = None,
+                     validate: Callable[[str], Any] = None):
+    """
+    Call `model.generate_content`, reusing an earlier identical response
+
+    Args:
+        model: genai.GenerativeModel instance
+        prompt: Prompt text
+        generation_config: Generation config passed through to the model
+        use_cache: Set to False for calls whose output should vary
+            between runs (e.g. high-temperature suggestions)
+        policy: Request policy for cache misses; defaults to the
+            process-wide policy
+        validate: Called with the response text; the response is not
+            cached (and a cached one is dropped) if it raises or returns
+            False, e.g. when the text does not parse as the JSON the
+            caller expects
+
+    Returns:
+        Object with a `.text` attribute
+    """
+
+    if not use_cache or not getattr(settings, 'LLM_CACHE_ENABLED', True):
+        return _call_model(model, prompt, generation_config, policy)
+
+    cache = get_response_cache()
+    key = response_cache_key(getattr(model, 'model_name', repr(model)), prompt, generation_config)
+
+    text = cache.get(key)
+    if text is not None:
+        if _is_valid(text, validate):
+            return CachedResponse(text)
+        cache.delete(key)
+
+    response = _call_model(model, prompt, generation_config, policy)
+    text = _complete_text(response)
+    if text is not None and _is_valid(text, validate):
+        cache.set(key, text)
+
+    return response
+
+
+def stream_content(model, prompt: str, generation_config: Dict[str, Any] = None,
+                   on_chunk: Callable[[str], None] = None, use_cache: bool = True,
+                   policy: RequestPolicy = None, validate: Callable[[str], Any] = None) -> str:
+    """
+    Stream a response, calling `on_chunk` with each piece of text as it arrives
+
+    The full text is only cached once the stream has completed with a
+    normal finish reason (and passes `validate`). A cache hit is delivered
+    to `on_chunk` as a single chunk.
+
+    A stream that is slow to start is hedged on its time to first chunk:
+    whichever request produces text first owns the stream and is the only
+    one forwarded, the other stops at its next chunk (or its timeout). No hedge is sent once a chunk has
+    been forwarded, and streams are only retried if nothing reached
+    `on_chunk` yet.
+
+    Returns:
+        The complete response text
+    """
+
+    use_cache = use_cache and getattr(settings, 'LLM_CACHE_ENABLED', True)
+
+    if use_cache:
+        cache = get_response_cache()
+        key = response_cache_key(getattr(model, 'model_name', repr(model)), prompt, generation_config)
+        text = cache.get(key)
+        if text is not None and _is_valid(text, validate):
+            if on_chunk:
+                on_chunk(text)
+            return text
+        if text is not None:
+            cache.delete(key)
+
+    # Bumped whenever the policy gives up on an attempt; streams from an
+    # older generation stop. Within a generation the first stream to
+    # produce text becomes the owner and the other (hedged) one stops.
+    generation = [0]
+    owner = [None]
+    lock = threading.Lock()
+    emitted = []
+    finished = []
+
+    def run_stream(timeout: float):
+        token = object()
+        current = generation[0]
+        started = time.monotonic()
+        parts = []
+        last = None
+        chunks = model.generate_content(
+            prompt, generation_config=generation_config, stream=True,
+            request_options={'timeout': timeout}
+        )
+        for chunk in chunks:
+            if generation[0] != current or owner[0] not in (None, token):
+                raise StreamSuperseded()
+            last = chunk
+            text = chunk.text
+            if not text:
+                continue
+            with lock:
+                if owner[0] is None and generation[0] == current:
+                    owner[0] = token
+                    first_chunk_tracker.record(time.monotonic() - started)
+                if owner[0] is not token:
+                    raise StreamSuperseded()
+            parts.append(text)
+            if on_chunk:
+                emitted.append(True)
+                on_chunk(text)
+        finished.append(last is None or _finished_normally(last))
+        return ''.join(parts)
+
+    def retryable(error: Exception) -> bool:
+        if emitted or not is_retryable(error):
+            return False
+        with lock:
+            generation[0] += 1
+            owner[0] = None
+        return True
+
+    policy = policy or get_default_policy()
+    try:
+        text = policy.execute(
+            run_stream,
+            retryable=retryable,
+            hedge_tracker=first_chunk_tracker,
+            hedge_while=lambda: owner[0] is None
+        )
+    except Exception:
+        generation[0] += 1
+        raise
+
+    if use_cache and text.strip() and finished and finished[-1] and _is_valid(text, validate):
+        cache.set(key, text)
+
+    return text
+
+
+def _finished_normally(response) -> bool:
+    """False when any candidate stopped for a reason other than STOP (length, safety, ...)"""
+
+    for candidate in getattr(response, 'candidates', None) or []:
+        reason = getattr(candidate, 'finish_reason', None)
+        name = getattr(reason, 'name', reason)
+        if name not in (None, 0, 1, 'FINISH_REASON_UNSPECIFIED', 'STOP'):
+            return False
+    return True
+
+
+def _complete_text(response):
+    """Response text worth caching, or None for blocked, empty or truncated replies"""
+
+    try:
+        text = response.text
+    except Exception:
+        # Blocked prompts and candidates without parts raise on .text
+        return None
+
+    if not text or not text.strip() or not _finished_normally(response):
+        return None
+    return text
+
+
+def _is_valid(text: str, validate: Callable[[str], Any] = None) -> bool:
+    if validate is None:
+        return True
+    try:
+        return validate(text) is not False
+    except Exception:
+        return False
+
+
+def _call_model(model, prompt: str, generation_config: Dict[str, Any] = None,
+                policy: RequestPolicy = None):
+    policy = policy or get_default_policy()
+
+    # The deadline goes to the client, since a running call cannot be cancelled
+    if generation_config is None:
+        return policy.execute(lambda timeout: model.generate_content(
+            prompt, request_options={'timeout': timeout}
+        ))
+    return policy.execute(lambda timeout: model.generate_content(
+        prompt, generation_config=generation_config, request_options={'timeout': timeout}
+    ))
+
+
+def get_cache_statistics() -> Dict[str, Any]:
+    """Get hit/miss counters for the response cache"""
+    return get_response_cache().get_statistics()
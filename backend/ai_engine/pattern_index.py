@@ -0,0 +1,271 @@
+"""
+Pattern Index
+Versioned on-disk snapshot of the pattern store with memory-mapped embeddings
+"""
+
+import os
+import json
+import time
+from typing import Dict, List, Any, Iterable, Tuple
+import numpy as np
+from .retrieval_backends import partition_key
+
+# Bump when the on-disk layout changes; older snapshots are reported stale
+INDEX_FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+EMBEDDINGS_FILE = 'embeddings.npy'
+DOCUMENTS_FILE = 'documents.bin'
+OFFSETS_FILE = 'offsets.npy'
+RECORDS_FILE = 'records.json'
+
+# Rows copied per step when reordering spooled embeddings
+WRITE_PAGE_SIZE = 4096
+
+
+class PatternIndexError(Exception):
+    """Raised when a snapshot is missing, incomplete or incompatible"""
+
+
+class PatternIndex:
+    """
+    Read-only view of a pattern snapshot directory:
+
+      manifest.json    format version, encoder, dimension, count and the
+                       pattern store revision it was taken at (written last)
+      embeddings.npy   float32 (count, dimension) matrix, opened with mmap
+      documents.bin    UTF-8 pattern code, concatenated
+      offsets.npy      int64 (count + 1) byte offsets into documents.bin
+      records.json     pattern ids and metadata
+
+    Opening a snapshot maps the embedding matrix instead of reading it, so
+    every worker process on a host shares the same page-cache pages.
+    Documents are decoded lazily, one hit at a time.
+    """
+
+    def __init__(self, path: str, manifest: Dict[str, Any], embeddings: np.ndarray,
+                 offsets: np.ndarray, ids: List[str], metadatas: List[Dict[str, Any]]):
+        self.path = path
+        self.manifest = manifest
+        self.embeddings = embeddings
+        self.offsets = offsets
+        self.ids = ids
+        self.metadatas = metadatas
+        self._documents = np.memmap(os.path.join(path, DOCUMENTS_FILE), dtype=np.uint8, mode='r') \
+            if offsets[-1] > 0 else np.zeros(0, dtype=np.uint8)
+
+    @classmethod
+    def open(cls, path: str) -> 'PatternIndex':
+        """Attach to the snapshot at `path`"""
+
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise PatternIndexError(f"No pattern index at {path}")
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        if manifest.get('format_version') != INDEX_FORMAT_VERSION:
+            raise PatternIndexError(
+                f"Pattern index format {manifest.get('format_version')} is not "
+                f"supported (expected {INDEX_FORMAT_VERSION})"
+            )
+
+        embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode='r')
+        offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode='r')
+        with open(os.path.join(path, RECORDS_FILE)) as f:
+            records = json.load(f)
+
+        count = manifest['count']
+        if embeddings.shape[0] != count or len(offsets) != count + 1 or len(records['ids']) != count:
+            raise PatternIndexError(f"Pattern index at {path} is incomplete")
+
+        return cls(path, manifest, embeddings, offsets, records['ids'], records['metadatas'])
+
+    @staticmethod
+    def write(path: str, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]],
+              embeddings, encoder_name: str, version: str = None) -> Dict[str, Any]:
+        """Write a snapshot of in-memory patterns to `path` (see `write_pages`)"""
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(ids), -1) if len(ids) else np.zeros((0, 0), dtype=np.float32)
+
+        return PatternIndex.write_pages(
+            path, [(ids, documents, metadatas, matrix)], len(ids), encoder_name, version=version
+        )
+
+    @staticmethod
+    def write_pages(path: str, pages: Iterable[Tuple[List[str], List[str], List[Dict[str, Any]], Any]],
+                    count: int, encoder_name: str, version: str = None) -> Dict[str, Any]:
+        """
+        Write a snapshot to `path` from (ids, documents, metadatas, embeddings)
+        pages totalling `count` rows
+
+        Embeddings and documents are spooled to disk page by page and then
+        reordered on disk, so memory use is bounded by the page size plus
+        the ids and metadata (which records.json needs anyway).
+
+        Rows are written grouped by (framework, type), the layout the NumPy
+        search backend partitions on, so it can attach without reordering.
+        Each file is written under a temporary name and renamed into place,
+        with the manifest last, so readers never see a half-written index.
+        Processes that already mapped the old files keep reading them.
+        """
+
+        os.makedirs(path, exist_ok=True)
+        suffix = f'.{os.getpid()}.tmp'
+
+        def tmp(name):
+            return os.path.join(path, f'.{name}{suffix}')
+
+        spool_embeddings = spool_documents = None
+        ids, metadatas = [], []
+        spans = np.zeros((count, 2), dtype=np.int64)
+        dimension = 0
+
+        try:
+            with open(tmp('spool.bin'), 'wb') as documents_file:
+                position = 0
+                for page_ids, page_documents, page_metadatas, page_embeddings in pages:
+                    page_embeddings = np.asarray(page_embeddings, dtype=np.float32)
+                    row = len(ids)
+                    if row + len(page_ids) > count:
+                        raise PatternIndexError('Pattern store changed while the snapshot was written')
+
+                    if spool_embeddings is None and len(page_ids):
+                        dimension = int(page_embeddings.shape[1])
+                        spool_embeddings = np.lib.format.open_memmap(
+                            tmp('spool.npy'), mode='w+', dtype=np.float32, shape=(count, dimension)
+                        )
+                    if len(page_ids):
+                        spool_embeddings[row:row + len(page_ids)] = page_embeddings
+
+                    for i, doc in enumerate(page_documents):
+                        encoded = doc.encode('utf-8')
+                        documents_file.write(encoded)
+                        spans[row + i] = (position, position + len(encoded))
+                        position += len(encoded)
+
+                    ids.extend(page_ids)
+                    metadatas.extend(page_metadatas)
+
+            if len(ids) != count:
+                raise PatternIndexError('Pattern store changed while the snapshot was written')
+
+            order = np.asarray(
+                sorted(range(count), key=lambda row: partition_key(metadatas[row])), dtype=np.int64
+            )
+            ids = [ids[row] for row in order]
+            metadatas = [metadatas[row] for row in order]
+
+            lengths = spans[order, 1] - spans[order, 0]
+            offsets = np.zeros(count + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+
+            if count:
+                matrix = np.lib.format.open_memmap(
+                    tmp(EMBEDDINGS_FILE), mode='w+', dtype=np.float32, shape=(count, dimension)
+                )
+                for start in range(0, count, WRITE_PAGE_SIZE):
+                    matrix[start:start + WRITE_PAGE_SIZE] = spool_embeddings[order[start:start + WRITE_PAGE_SIZE]]
+                matrix.flush()
+                del matrix
+            else:
+                with open(tmp(EMBEDDINGS_FILE), 'wb') as f:
+                    np.save(f, np.zeros((0, 0), dtype=np.float32))
+
+            spool = np.memmap(tmp('spool.bin'), dtype=np.uint8, mode='r') if offsets[-1] else None
+            with open(tmp(DOCUMENTS_FILE), 'wb') as f:
+                for row in order if spool is not None else ():
+                    start, end = spans[row]
+                    f.write(spool[start:end].tobytes())
+            del spool
+
+            manifest = {
+                'format_version': INDEX_FORMAT_VERSION,
+                'encoder': encoder_name,
+                'dimension': dimension,
+                'count': count,
+                'version': version,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            }
+
+            def replace(name, writer=None):
+                if writer is not None:
+                    with open(tmp(name), 'wb') as f:
+                        writer(f)
+                os.replace(tmp(name), os.path.join(path, name))
+
+            replace(EMBEDDINGS_FILE)
+            replace(OFFSETS_FILE, lambda f: np.save(f, offsets))
+            replace(DOCUMENTS_FILE)
+            replace(RECORDS_FILE, lambda f: f.write(
+                json.dumps({'ids': ids, 'metadatas': metadatas}).encode('utf-8')
+            ))
+            replace(MANIFEST_FILE, lambda f: f.write(json.dumps(manifest, indent=2).encode('utf-8')))
+        finally:
+            del spool_embeddings
+            for name in ('spool.npy', 'spool.bin', EMBEDDINGS_FILE, DOCUMENTS_FILE):
+                if os.path.exists(tmp(name)):
+                    os.unlink(tmp(name))
+
+        return manifest
+
+    @staticmethod
+    def inspect(path: str, encoder_name: str = None, expected_count: int = None,
+                expected_version: str = None) -> Dict[str, Any]:
+        """
+        Check a snapshot without keeping it open
+
+        Returns a status dict whose `state` is 'fresh', 'missing' or 'stale',
+        with a human-readable `reason` for anything but 'fresh'.
+        """
+
+        try:
+            index = PatternIndex.open(path)
+        except PatternIndexError as e:
+            state = 'missing' if not os.path.exists(os.path.join(path, MANIFEST_FILE)) else 'stale'
+            return {'state': state, 'reason': str(e), 'path': path}
+        except (OSError, ValueError, KeyError) as e:
+            return {'state': 'stale', 'reason': f"Unreadable pattern index: {str(e)}", 'path': path}
+
+        return index.status(encoder_name, expected_count, expected_version)
+
+    def status(self, encoder_name: str = None, expected_count: int = None,
+               expected_version: str = None) -> Dict[str, Any]:
+        """
+        Compare this snapshot against the live encoder and store
+
+        A store with the same number of patterns but a different revision
+        (patterns replaced or edited since the snapshot) is stale too.
+        """
+
+        reason = None
+        if encoder_name and self.manifest.get('encoder') != encoder_name:
+            reason = f"built with encoder {self.manifest.get('encoder')}, expected {encoder_name}"
+        elif expected_count is not None and self.manifest['count'] != expected_count:
+            reason = f"has {self.manifest['count']} patterns, store has {expected_count}"
+        elif expected_version is not None and self.manifest.get('version') != expected_version:
+            reason = f"taken at store revision {self.manifest.get('version')}, store is at {expected_version}"
+
+        return {
+            'state': 'stale' if reason else 'fresh',
+            'reason': reason,
+            'path': self.path,
+            'count': self.manifest['count'],
+            'version': self.manifest.get('version'),
+            'created_at': self.manifest.get('created_at'),
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def document(self, row: int) -> str:
+        """Decode the code of one pattern"""
+
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return bytes(self._documents[start:end]).decode('utf-8')
+
+    def documents(self) -> List[str]:
+        return [self.document(row) for row in range(len(self))]
@@ -1,8 +1,65 @@
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Callable
+from itertools import islice
+import hashlib
 import json
+import os
+import re
+import threading
+import time
+import uuid
+import numpy as np
+from django.conf import settings
+from .registry import registry, DEFAULT_ENCODER_MODEL
+from .pattern_index import PatternIndex, PatternIndexError
+from .caching import TieredCache, VersionCounter
+from .retrieval_backends import ChromaBackend, NumpyBackend
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
+
+# Rows per collection.get/add call when exporting or restoring a snapshot
+INDEX_PAGE_SIZE = 1000
+
+# Collection metadata key holding the store revision, a token replaced on
+# every write so snapshots can tell whether they match the store
+REVISION_KEY = 'revision'
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> TieredCache:
+    """Return the process-wide query embedding cache"""
+    
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = TieredCache(
+                    prefix='query_embedding',
+                    max_entries=getattr(settings, 'QUERY_EMBEDDING_CACHE_MAX_ENTRIES', 4096),
+                    ttl=getattr(settings, 'QUERY_EMBEDDING_CACHE_TTL', 604800),
+                    use_shared=getattr(settings, 'QUERY_EMBEDDING_CACHE_SHARED', False)
+                )
+    return _query_cache
+
+
+def pattern_id(code: str, metadata: Dict[str, Any]) -> str:
+    """Content-derived id: the same framework, type and code always map to the same id"""
+    
+    framework = metadata.get('framework', 'unknown')
+    pattern_type = metadata.get('type', 'unknown')
+    digest = hashlib.sha1(f"{framework}\0{pattern_type}\0{code}".encode('utf-8')).hexdigest()
+    return f"{framework}_{pattern_type}_{digest}"
+
+
+def normalize_query(query: str) -> str:
+    """
+    Lowercase and collapse whitespace
+    
+    The MiniLM tokenizer is uncased and ignores runs of whitespace, so
+    normalized queries encode to the same embedding as the originals.
+    """
+    
+    return re.sub(r'\s+', ' ', query).strip().lower()
 
 class PatternRetriever:
     """
@@ -10,12 +67,25 @@ class PatternRetriever:
     """
     
     def __init__(self, persist_directory: str = "./chroma_db"):
-        self.client = chromadb.Client(Settings(
-            persist_directory=persist_directory,
-            anonymized_telemetry=False
-        ))
+        # Clients and encoders are shared per process through the registry;
+        # use registry.get_pattern_retriever() to share the retriever itself
+        self.client = registry.get_chroma_client(persist_directory)
         
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+        self.encoder_name = DEFAULT_ENCODER_MODEL
+        self.encoder = registry.get_encoder(self.encoder_name)
+        self.query_cache = get_query_embedding_cache()
+        self.result_cache = TieredCache(
+            prefix='pattern_search',
+            max_entries=getattr(settings, 'PATTERN_RESULT_CACHE_MAX_ENTRIES', 1024),
+            ttl=getattr(settings, 'PATTERN_RESULT_CACHE_TTL', 3600),
+            use_shared=getattr(settings, 'PATTERN_RESULT_CACHE_SHARED', True)
+        )
+        self.store_version = VersionCounter(
+            f'pattern_store_version:{os.path.abspath(persist_directory)}',
+            check_interval=getattr(settings, 'PATTERN_VERSION_CHECK_INTERVAL', 1.0),
+            use_shared=getattr(settings, 'PATTERN_RESULT_CACHE_SHARED', True)
+        )
+        self.last_ingest_stats = {}
         
         try:
             self.collection = self.client.get_collection("code_patterns")
@@ -24,6 +94,169 @@ class PatternRetriever:
                 name="code_patterns",
                 metadata={"description": "Web development code patterns"}
             )
+        
+        self.index_directory = os.path.join(persist_directory, 'pattern_index')
+        self.index_status = self._check_index()
+        self.backend = self._create_backend(getattr(settings, 'RETRIEVAL_BACKEND', 'chroma'))
+        
+        self.hybrid = getattr(settings, 'RETRIEVAL_HYBRID', True)
+        self.hybrid_candidates = getattr(settings, 'RETRIEVAL_HYBRID_CANDIDATES', 4)
+        self._lexical_index = None
+        self._lexical_lock = threading.Lock()
+    
+    def _create_backend(self, name: str):
+        """
+        Build the search backend
+        
+        The collection stays the store of record either way. The numpy
+        backend attaches to a fresh snapshot (memory-mapped, no copy) and
+        otherwise loads the embeddings from the collection.
+        
+        Quantized storage only saves memory while the float32 rows stay
+        memory-mapped, so with a stale or missing snapshot it is rewritten
+        first; if that fails the backend is not built at all.
+        """
+        
+        if name == 'chroma':
+            return ChromaBackend(self.collection)
+        
+        if name == 'numpy':
+            options = {
+                'storage': getattr(settings, 'PATTERN_INDEX_STORAGE', 'float32'),
+                'rerank': getattr(settings, 'PATTERN_INDEX_RERANK', 4),
+            }
+            if options['storage'] != 'float32' and self.index_status['state'] != 'fresh' and self.collection.count():
+                print(f"Pattern index {self.index_status['state']}; rewriting it for {options['storage']} storage")
+                try:
+                    self.save_index()
+                except (OSError, PatternIndexError) as e:
+                    raise PatternIndexError(f"Could not write the pattern index for {options['storage']} storage: {str(e)}")
+                if self.index_status['state'] != 'fresh':
+                    raise PatternIndexError(
+                        f"Pattern index is {self.index_status['state']} ({self.index_status['reason']}); "
+                        f"{options['storage']} storage needs a fresh snapshot, run save_index()"
+                    )
+            if self.index_status['state'] == 'fresh':
+                return NumpyBackend.from_index(PatternIndex.open(self.index_directory), **options)
+            ids, documents, metadatas, embeddings = self._export_collection()
+            return NumpyBackend(ids, embeddings, metadatas, documents=documents, **options)
+        
+        raise ValueError(f"Unknown retrieval backend: {name}")
+    
+    def _check_index(self) -> Dict[str, Any]:
+        """
+        Compare the on-disk snapshot with the collection at startup
+        
+        An empty collection with a fresh snapshot is restored from the
+        snapshot's stored embeddings instead of re-embedding every pattern.
+        A missing or stale snapshot is reported rather than silently
+        serving no patterns.
+        """
+        
+        count = self.collection.count()
+        status = PatternIndex.inspect(
+            self.index_directory,
+            encoder_name=self.encoder_name,
+            expected_count=count or None,
+            expected_version=self.store_revision() if count else None
+        )
+        
+        if count == 0 and status['state'] == 'fresh' and status['count']:
+            self._restore_from_index()
+            self._set_revision(status['version'])
+            status['restored'] = True
+        elif count == 0:
+            status = dict(status, state='missing', reason='pattern store is empty; run PatternPipeline.initialize_database()')
+        
+        if status['state'] != 'fresh':
+            print(f"Pattern index {status['state']}: {status['reason']}")
+        
+        return status
+    
+    def _restore_from_index(self) -> None:
+        """Load the collection from the snapshot without re-encoding"""
+        
+        index = PatternIndex.open(self.index_directory)
+        
+        for start in range(0, len(index), INDEX_PAGE_SIZE):
+            end = min(start + INDEX_PAGE_SIZE, len(index))
+            self.collection.add(
+                embeddings=index.embeddings[start:end].tolist(),
+                documents=[index.document(row) for row in range(start, end)],
+                metadatas=index.metadatas[start:end],
+                ids=index.ids[start:end]
+            )
+    
+    def save_index(self) -> Dict[str, Any]:
+        """
+        Write the collection to the on-disk snapshot
+        
+        Call after (re)building the pattern store so other processes and
+        future deployments can attach to it without re-embedding.
+        """
+        
+        count = self.collection.count()
+        revision = self.store_revision() or self._set_revision()
+        
+        PatternIndex.write_pages(
+            self.index_directory,
+            self._collection_pages(count),
+            count,
+            encoder_name=self.encoder_name,
+            version=revision
+        )
+        
+        # A write during the export leaves the snapshot reported stale
+        self.index_status = PatternIndex.inspect(
+            self.index_directory,
+            encoder_name=self.encoder_name,
+            expected_count=self.collection.count(),
+            expected_version=self.store_revision()
+        )
+        return self.index_status
+    
+    def store_revision(self) -> str:
+        """Revision of the pattern store, as persisted with the collection"""
+        
+        metadata = self.client.get_collection(self.collection.name).metadata or {}
+        return metadata.get(REVISION_KEY)
+    
+    def _set_revision(self, revision: str = None) -> str:
+        """Stamp the collection with `revision` (a new one by default)"""
+        
+        revision = revision or uuid.uuid4().hex
+        metadata = {
+            key: value for key, value in (self.collection.metadata or {}).items()
+            if not key.startswith('hnsw:')
+        }
+        metadata[REVISION_KEY] = revision
+        self.collection.modify(metadata=metadata)
+        return revision
+    
+    def _collection_pages(self, total: int):
+        """Yield (ids, documents, metadatas, float32 embeddings) pages of the collection"""
+        
+        for offset in range(0, total, INDEX_PAGE_SIZE):
+            page = self.collection.get(
+                include=['embeddings', 'documents', 'metadatas'],
+                limit=INDEX_PAGE_SIZE,
+                offset=offset
+            )
+            yield page['ids'], page['documents'], page['metadatas'], np.asarray(page['embeddings'], dtype=np.float32)
+    
+    def _export_collection(self):
+        """Read every pattern with its stored embedding, page by page"""
+        
+        ids, documents, metadatas, embeddings = [], [], [], []
+        
+        for page_ids, page_documents, page_metadatas, page_embeddings in self._collection_pages(self.collection.count()):
+            ids.extend(page_ids)
+            documents.extend(page_documents)
+            metadatas.extend(page_metadatas)
+            embeddings.append(page_embeddings)
+        
+        matrix = np.concatenate(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+        return ids, documents, metadatas, matrix
     
     def search_patterns(self, query: str, framework: str, 
                        pattern_type: str = None, top_k: int = 5) -> List[Dict[str, Any]]:
@@ -37,29 +270,159 @@ class PatternRetriever:
             top_k: Number of results to return
         """
         
-        query_embedding = self.encoder.encode([query]).tolist()[0]
-        
-        where_filter = {"framework": framework}
-        if pattern_type:
-            where_filter["type"] = pattern_type
+        key = self._result_cache_key(query, framework, pattern_type, top_k)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return [dict(pattern) for pattern in cached]
         
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            where=where_filter,
-            n_results=top_k
-        )
+        query_embedding = self.encode_queries([query])[0]
         
-        patterns = []
-        if results['documents']:
-            for i, doc in enumerate(results['documents'][0]):
-                patterns.append({
-                    'code': doc,
-                    'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
-                    'distance': results['distances'][0][i] if results['distances'] else 0
-                })
+        if not self.hybrid:
+            patterns = self.backend.query([query_embedding], framework, pattern_type, top_k)[0]
+        else:
+            vector_patterns = self.backend.query(
+                [query_embedding], framework, pattern_type, top_k * self.hybrid_candidates
+            )[0]
+            patterns = self._fuse(query, query_embedding, vector_patterns, framework, pattern_type, top_k)
         
+        self.result_cache.set(key, patterns)
         return patterns
     
+    def search_patterns_bulk(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Search patterns for many queries at once
+        
+        All query texts are encoded in a single batched forward pass, and
+        queries sharing a framework/type filter are sent to the backend
+        in one call with multiple query embeddings.
+        
+        Args:
+            queries: Dicts with the `search_patterns` arguments
+                (query, framework, pattern_type, top_k)
+        
+        Returns:
+            One pattern list per query, in input order
+        """
+        
+        if not queries:
+            return []
+        
+        keys = [
+            self._result_cache_key(q['query'], q['framework'], q.get('pattern_type'), q.get('top_k', 5))
+            for q in queries
+        ]
+        all_patterns = [[] for _ in queries]
+        
+        groups = {}
+        for i, q in enumerate(queries):
+            cached = self.result_cache.get(keys[i])
+            if cached is not None:
+                all_patterns[i] = [dict(pattern) for pattern in cached]
+                continue
+            groups.setdefault((q['framework'], q.get('pattern_type')), []).append(i)
+        
+        missing = [i for indices in groups.values() for i in indices]
+        embeddings = dict(zip(missing, self.encode_queries([queries[i]['query'] for i in missing])))
+        
+        for (framework, pattern_type), indices in groups.items():
+            top_k = max(queries[i].get('top_k', 5) for i in indices)
+            
+            results = self.backend.query(
+                [embeddings[i] for i in indices],
+                framework,
+                pattern_type,
+                top_k * self.hybrid_candidates if self.hybrid else top_k
+            )
+            
+            for patterns, i in zip(results, indices):
+                query_top_k = queries[i].get('top_k', 5)
+                if self.hybrid:
+                    patterns = self._fuse(queries[i]['query'], embeddings[i], patterns,
+                                          framework, pattern_type, query_top_k)
+                all_patterns[i] = patterns[:query_top_k]
+                self.result_cache.set(keys[i], all_patterns[i])
+        
+        return all_patterns
+    
+    def _result_cache_key(self, query: str, framework: str, pattern_type: str, top_k: int) -> str:
+        """Search arguments stamped with the current store version"""
+        
+        payload = json.dumps([
+            self.store_version.get(), self.backend.name, self.hybrid,
+            normalize_query(query), framework, pattern_type, top_k
+        ])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @property
+    def lexical_index(self) -> LexicalIndex:
+        """BM25 index over pattern code and descriptions, built on first use"""
+        
+        if self._lexical_index is None:
+            with self._lexical_lock:
+                if self._lexical_index is None:
+                    index = LexicalIndex()
+                    for pattern_id, code, metadata in self.backend.documents():
+                        index.add(pattern_id, self._lexical_text(code, metadata), metadata)
+                    self._lexical_index = index
+        return self._lexical_index
+    
+    def _lexical_text(self, code: str, metadata: Dict[str, Any]) -> str:
+        return f"{metadata.get('name', '')} {metadata.get('description', '')}\n{code}"
+    
+    def _fuse(self, query: str, embedding: List[float], vector_patterns: List[Dict[str, Any]],
+              framework: str, pattern_type: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Reciprocal-rank fusion of vector hits with BM25 hits
+        
+        Exact identifiers in the query (useEffect, APIView, defineStore)
+        pull matching patterns up even when their embeddings are not the
+        nearest. Lexical-only hits are fetched with their real distance.
+        """
+        
+        lexical = self.lexical_index.search(query, framework, pattern_type, top_k * self.hybrid_candidates)
+        if not lexical:
+            return vector_patterns[:top_k]
+        
+        ranked = reciprocal_rank_fusion([
+            [pattern['id'] for pattern in vector_patterns],
+            [pattern_id for pattern_id, _ in lexical],
+        ])[:top_k]
+        
+        by_id = {pattern['id']: pattern for pattern in vector_patterns}
+        missing = [pattern_id for pattern_id in ranked if pattern_id not in by_id]
+        by_id.update((pattern['id'], pattern) for pattern in self.backend.fetch(missing, embedding))
+        
+        return [by_id[pattern_id] for pattern_id in ranked if pattern_id in by_id]
+    
+    def encode_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Encode query texts, serving repeated queries from the embedding cache
+        
+        Cache misses are de-duplicated and encoded in one batch. Entries are
+        stored as float32 arrays keyed by encoder and normalized text.
+        """
+        
+        texts = [normalize_query(query) for query in queries]
+        keys = [self._query_cache_key(text) for text in texts]
+        vectors = [self.query_cache.get(key) for key in keys]
+        
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], texts[i])
+        
+        if missing:
+            encoded = np.asarray(self.encoder.encode(list(missing.values())), dtype=np.float32)
+            fresh = dict(zip(missing.keys(), encoded))
+            for key, vector in fresh.items():
+                self.query_cache.set(key, vector)
+            vectors = [fresh.get(key) if vector is None else vector for key, vector in zip(keys, vectors)]
+        
+        return [vector.tolist() for vector in vectors]
+    
+    def _query_cache_key(self, text: str) -> str:
+        return f"{self.encoder_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    
     def search_component_patterns(self, component_name: str, framework: str, 
                                  features: List[str] = None) -> List[Dict[str, Any]]:
         """Search for specific component patterns"""
@@ -106,72 +469,150 @@ class PatternRetriever:
         Args:
             code: The code content
             metadata: Pattern metadata (framework, type, name, etc)
-        """
         
-        embedding = self.encoder.encode([code]).tolist()[0]
+        Returns:
+            The pattern's id; adding a pattern that is already stored is a no-op
+        """
         
-        pattern_id = f"{metadata.get('framework', 'unknown')}_{metadata.get('type', 'unknown')}_{metadata.get('name', 'pattern')}"
+        new_id = pattern_id(code, metadata)
+        if self._stored_ids([new_id]):
+            return new_id
         
-        self.collection.add(
-            embeddings=[embedding],
-            documents=[code],
-            metadatas=[metadata],
-            ids=[pattern_id]
-        )
+        embeddings = self.encode_documents([code])
+        self._store([new_id], embeddings, [code], [metadata])
         
-        return pattern_id
+        return new_id
     
-    def batch_add_patterns(self, patterns: List[Dict[str, Any]]) -> List[str]:
-        """Add multiple patterns at once"""
+    def batch_add_patterns(self, patterns: Iterable[Dict[str, Any]], batch_size: int = None,
+                           processes: int = None, chunk_size: int = None,
+                           progress: Callable[[Dict[str, Any]], None] = None) -> List[str]:
+        """
+        Add multiple patterns at once
+        
+        Patterns are consumed in chunks of `chunk_size`: each chunk is
+        encoded in batches of `batch_size` and inserted before the next one
+        is read, so memory stays flat and `patterns` may be a generator.
+        With `processes` > 1 encoding runs in a sentence-transformers
+        multi-process pool (for CPU-only hosts, in-process encoder only).
+        
+        Ids are derived from the content (see `pattern_id`), so patterns
+        already in the store, from this call or an earlier one, are skipped
+        without being encoded and counted in `skipped` rather than `patterns`.
+        
+        Throughput is reported per chunk, to `progress` when given (with
+        the running stats) or printed otherwise, and kept in
+        `last_ingest_stats`.
+        
+        Returns:
+            Ids of the patterns actually stored
+        """
+        
+        batch_size = batch_size or getattr(settings, 'PATTERN_ENCODE_BATCH_SIZE', 64)
+        processes = processes if processes is not None else getattr(settings, 'PATTERN_ENCODE_PROCESSES', 0)
+        chunk_size = chunk_size or getattr(settings, 'PATTERN_INSERT_CHUNK_SIZE', 1000)
+        
+        # The embedding server client batches on the server side instead
+        use_pool = processes > 1 and hasattr(self.encoder, 'start_multi_process_pool')
+        pool = self.encoder.start_multi_process_pool(['cpu'] * processes) if use_pool else None
         
         ids = []
-        embeddings = []
-        documents = []
-        metadatas = []
+        stats = {'patterns': 0, 'skipped': 0, 'encode_seconds': 0.0, 'insert_seconds': 0.0}
+        started = time.monotonic()
+        patterns = iter(patterns)
         
-        for pattern in patterns:
-            code = pattern['code']
-            metadata = pattern['metadata']
-            
-            embedding = self.encoder.encode([code]).tolist()[0]
-            pattern_id = f"{metadata.get('framework', 'unknown')}_{metadata.get('type', 'unknown')}_{metadata.get('name', 'pattern')}_{len(ids)}"
-            
-            embeddings.append(embedding)
-            documents.append(code)
-            metadatas.append(metadata)
-            ids.append(pattern_id)
+        try:
+            while True:
+                chunk = list(islice(patterns, chunk_size))
+                if not chunk:
+                    break
+                
+                chunk_ids = [pattern_id(pattern['code'], pattern['metadata']) for pattern in chunk]
+                existing = self._stored_ids(chunk_ids)
+                new_rows = {}
+                for i, new_id in enumerate(chunk_ids):
+                    if new_id not in existing and new_id not in new_rows:
+                        new_rows[new_id] = i
+                stats['skipped'] += len(chunk) - len(new_rows)
+                
+                if new_rows:
+                    chunk_ids = list(new_rows)
+                    documents = [chunk[i]['code'] for i in new_rows.values()]
+                    metadatas = [chunk[i]['metadata'] for i in new_rows.values()]
+                    
+                    encode_started = time.monotonic()
+                    embeddings = self.encode_documents(documents, batch_size=batch_size, pool=pool)
+                    insert_started = time.monotonic()
+                    stats['encode_seconds'] += insert_started - encode_started
+                    
+                    self._store(chunk_ids, embeddings, documents, metadatas)
+                    stats['insert_seconds'] += time.monotonic() - insert_started
+                    
+                    ids.extend(chunk_ids)
+                stats['patterns'] = len(ids)
+                elapsed = time.monotonic() - started
+                if progress is not None:
+                    progress(dict(stats, seconds=elapsed))
+                else:
+                    print(f"Indexed {len(ids)} patterns ({len(ids) / elapsed:.1f} patterns/sec)")
+        finally:
+            if pool is not None:
+                self.encoder.stop_multi_process_pool(pool)
+        
+        stats['seconds'] = time.monotonic() - started
+        stats['patterns_per_second'] = stats['patterns'] / stats['seconds'] if stats['seconds'] else 0.0
+        stats.update({'batch_size': batch_size, 'processes': max(processes, 1), 'chunk_size': chunk_size})
+        self.last_ingest_stats = stats
+        
+        return ids
+    
+    def _stored_ids(self, ids: List[str]) -> set:
+        """Which of `ids` the collection already holds"""
+        
+        return set(self.collection.get(ids=list(set(ids)), include=[])['ids'])
+    
+    def encode_documents(self, documents: List[str], batch_size: int = 64, pool=None) -> np.ndarray:
+        """Encode pattern code in batches, through `pool` when one is given"""
+        
+        if pool is not None:
+            embeddings = self.encoder.encode_multi_process(documents, pool, batch_size=batch_size)
+        else:
+            embeddings = self.encoder.encode(documents, batch_size=batch_size)
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def _store(self, ids: List[str], embeddings: np.ndarray, documents: List[str],
+               metadatas: List[Dict[str, Any]]) -> None:
+        """Write to the collection, then mirror into the search backend"""
         
         self.collection.add(
-            embeddings=embeddings,
+            embeddings=embeddings.tolist(),
             documents=documents,
             metadatas=metadatas,
             ids=ids
         )
+        self.backend.add(ids, embeddings, documents, metadatas)
+        self._set_revision()
+        self.store_version.bump()
         
-        return ids
+        with self._lexical_lock:
+            if self._lexical_index is not None:
+                for pattern_id, code, metadata in zip(ids, documents, metadatas):
+                    self._lexical_index.add(pattern_id, self._lexical_text(code, metadata), metadata)
     
     def get_framework_patterns(self, framework: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all patterns for a specific framework"""
         
-        results = self.collection.get(
-            where={"framework": framework},
-            limit=limit
-        )
-        
-        patterns = []
-        if results['documents']:
-            for i, doc in enumerate(results['documents']):
-                patterns.append({
-                    'code': doc,
-                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
-                    'id': results['ids'][i] if results['ids'] else None
-                })
-        
-        return patterns
+        return self.backend.get(framework, limit)
     
     def delete_pattern(self, pattern_id: str) -> None:
         """Delete a pattern by ID"""
         self.collection.delete(ids=[pattern_id])
+        self.backend.delete([pattern_id])
+        self._set_revision()
+        self.store_version.bump()
+        
+        with self._lexical_lock:
+            if self._lexical_index is not None:
+                self._lexical_index.remove(pattern_id)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
@@ -180,5 +621,9 @@ class PatternRetriever:
         
         return {
             'total_patterns': count,
-            'collection_name': self.collection.name
+            'collection_name': self.collection.name,
+            'backend': self.backend.name,
+            'index': self.index_status,
+            'query_cache': self.query_cache.get_statistics(),
+            'result_cache': dict(self.result_cache.get_statistics(), store_version=self.store_version.get())
         }
@@ -3,13 +3,11 @@ Project Refinement Engine
 Handles iterative improvements to generated projects
 """
 
-import google.generativeai as genai
-from django.conf import settings
 from typing import Dict, List, Any
+from .registry import registry
+from .llm_cache import generate_content
 import json
 
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
 
 class ProjectRefiner:
     """
@@ -17,7 +15,7 @@ class ProjectRefiner:
     """
     
     def __init__(self):
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model = registry.get_model('gemini-2.0-flash-exp')
     
     def refine_project(self, 
                       current_files: Dict[str, str],
@@ -104,23 +102,17 @@ Return ONLY JSON:
 }}"""
 
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.3,
                     'max_output_tokens': 2048,
-                }
+                },
+                validate=self._parse_json
             )
             
-            analysis_text = response.text.strip()
-            
-            # Clean JSON
-            if analysis_text.startswith('```json'):
-                analysis_text = analysis_text[7:]
-            if analysis_text.endswith('```'):
-                analysis_text = analysis_text[:-3]
-            
-            return json.loads(analysis_text.strip())
+            return self._parse_json(response.text)
             
         except Exception as e:
             print(f"Analysis failed: {str(e)}")
@@ -132,6 +124,19 @@ Return ONLY JSON:
                 'estimated_changes': 'Unable to analyze'
             }
     
+    def _parse_json(self, response_text: str) -> Any:
+        """Parse a JSON response, dropping markdown fences"""
+        
+        text = response_text.strip()
+        
+        # Clean JSON
+        if text.startswith('```json'):
+            text = text[7:]
+        if text.endswith('```'):
+            text = text[:-3]
+        
+        return json.loads(text.strip())
+    
     def _generate_updated_files(self,
                                 current_files: Dict[str, str],
                                 analysis: Dict[str, Any],
@@ -202,7 +207,8 @@ Requirements:
 Return ONLY the complete updated file code, no explanations."""
 
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.4,
@@ -254,7 +260,8 @@ Include:
 Return ONLY the file code, no explanations."""
 
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.4,
@@ -354,12 +361,14 @@ Return ONLY JSON array:
 ]"""
 
         try:
-            response = self.model.generate_content(
+            response = generate_content(
+                self.model,
                 prompt,
                 generation_config={
                     'temperature': 0.7,
                     'max_output_tokens': 2048,
-                }
+                },
+                use_cache=False
             )
             
             suggestions_text = response.text.strip()
@@ -0,0 +1,188 @@
+"""
+Model Registry
+Per-process shared model clients, encoders and vector-store handles
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Any
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEMINI_MODEL = 'gemini-2.0-flash-exp'
+DEFAULT_ENCODER_MODEL = 'all-MiniLM-L6-v2'
+DEFAULT_PERSIST_DIRECTORY = './chroma_db'
+
+
+class ModelRegistry:
+    """
+    Lazily builds and caches expensive resources once per process.
+
+    Every getter is thread-safe and returns the same instance on each call,
+    so concurrent generation threads share one encoder and one vector store
+    client. `warm_up` preloads everything (called from the Celery
+    `worker_process_init` hook) and `readiness` reports what is loaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._configured = False
+        self._models = {}
+        self._encoders = {}
+        self._chroma_clients = {}
+        self._pattern_retrievers = {}
+        self._load_seconds = {}
+        self._errors = {}
+        self._warmed_up = False
+
+    def get_model(self, model_name: str = DEFAULT_GEMINI_MODEL):
+        """Shared `genai.GenerativeModel` for `model_name`"""
+
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if model_name not in self._models:
+                import google.generativeai as genai
+
+                if not self._configured:
+                    genai.configure(api_key=settings.GEMINI_API_KEY)
+                    self._configured = True
+
+                self._models[model_name] = self._timed(
+                    f'model:{model_name}', lambda: genai.GenerativeModel(model_name)
+                )
+            return self._models[model_name]
+
+    def get_encoder(self, model_name: str = DEFAULT_ENCODER_MODEL, use_server: bool = True):
+        """
+        Shared encoder for `model_name`
+
+        When EMBEDDING_SERVER_ADDRESS is set this is a client for the
+        host-wide embedding server instead of an in-process model.
+        Otherwise ENCODER_BACKEND picks the in-process runtime (see
+        ai_engine.encoders).
+        """
+
+        address = getattr(settings, 'EMBEDDING_SERVER_ADDRESS', '') if use_server else ''
+        backend = getattr(settings, 'ENCODER_BACKEND', 'torch')
+        key = (model_name, address, backend)
+
+        encoder = self._encoders.get(key)
+        if encoder is not None:
+            return encoder
+
+        with self._lock:
+            if key not in self._encoders:
+                if address:
+                    from .embedding_server import EmbeddingClient
+
+                    self._encoders[key] = EmbeddingClient(
+                        address, timeout=getattr(settings, 'EMBEDDING_SERVER_TIMEOUT', 30.0)
+                    )
+                else:
+                    from .encoders import load_encoder
+
+                    self._encoders[key] = self._timed(
+                        f'encoder:{model_name}:{backend}',
+                        lambda: load_encoder(
+                            model_name, backend,
+                            onnx_directory=getattr(settings, 'ENCODER_ONNX_DIRECTORY', './onnx_models')
+                        )
+                    )
+            return self._encoders[key]
+
+    def get_chroma_client(self, persist_directory: str = DEFAULT_PERSIST_DIRECTORY):
+        """Shared chromadb client for a persist directory"""
+
+        client = self._chroma_clients.get(persist_directory)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if persist_directory not in self._chroma_clients:
+                import chromadb
+                from chromadb.config import Settings
+
+                # PersistentClient keeps the collection on disk; the plain
+                # Client ignores persist_directory and starts empty
+                self._chroma_clients[persist_directory] = self._timed(
+                    f'chroma:{persist_directory}',
+                    lambda: chromadb.PersistentClient(
+                        path=persist_directory,
+                        settings=Settings(anonymized_telemetry=False)
+                    )
+                )
+            return self._chroma_clients[persist_directory]
+
+    def get_pattern_retriever(self, persist_directory: str = DEFAULT_PERSIST_DIRECTORY):
+        """Shared PatternRetriever (encoder + collection handle)"""
+
+        retriever = self._pattern_retrievers.get(persist_directory)
+        if retriever is not None:
+            return retriever
+
+        with self._lock:
+            if persist_directory not in self._pattern_retrievers:
+                from .pattern_retriever import PatternRetriever
+
+                self._pattern_retrievers[persist_directory] = self._timed(
+                    'pattern_retriever', lambda: PatternRetriever(persist_directory)
+                )
+            return self._pattern_retrievers[persist_directory]
+
+    def warm_up(self) -> Dict[str, Any]:
+        """Preload the Gemini client, encoder and pattern store"""
+
+        started = time.monotonic()
+
+        for name, loader in [
+            ('model', self.get_model),
+            ('pattern_retriever', self.get_pattern_retriever),
+        ]:
+            try:
+                loader()
+            except Exception as e:
+                self._errors[name] = str(e)
+                logger.error(f"Warm-up failed for {name}: {str(e)}")
+
+        for retriever in self._pattern_retrievers.values():
+            index_status = retriever.index_status
+            if index_status['state'] != 'fresh':
+                self._errors['pattern_index'] = f"Pattern index {index_status['state']}: {index_status['reason']}"
+                logger.error(self._errors['pattern_index'])
+
+        self._warmed_up = True
+        logger.info(f"AI engine warm-up finished in {time.monotonic() - started:.2f}s")
+
+        return self.readiness()
+
+    def readiness(self) -> Dict[str, Any]:
+        """Report which shared resources are loaded"""
+
+        components = {
+            'model': bool(self._models),
+            'encoder': bool(self._encoders),
+            'vector_store': bool(self._chroma_clients),
+            'pattern_retriever': bool(self._pattern_retrievers),
+        }
+
+        return {
+            'ready': self._warmed_up and all(components.values()) and not self._errors,
+            'warmed_up': self._warmed_up,
+            'components': components,
+            'load_seconds': dict(self._load_seconds),
+            'errors': dict(self._errors)
+        }
+
+    def _timed(self, name: str, loader):
+        started = time.monotonic()
+        resource = loader()
+        self._load_seconds[name] = round(time.monotonic() - started, 3)
+        return resource
+
+
+registry = ModelRegistry()
@@ -0,0 +1,343 @@
+"""
+Request Policy
+Retries, hedging and deadlines around Gemini calls
+"""
+
+import random
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Callable
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# google.api_core exception names and HTTP codes worth retrying
+RETRYABLE_ERRORS = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+    'DeadlineExceeded', 'GatewayTimeout', 'Aborted', 'ConnectionError', 'TimeoutError',
+}
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Requests submitted to the pool and not yet finished, including ones their
+# caller already gave up on: a running thread cannot be cancelled, so a hedge
+# loser or timed-out call keeps its pool thread until the client returns
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call cannot finish within its deadline or the project budget"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error from the model client is transient"""
+
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    code = getattr(error, 'code', None)
+    return isinstance(code, int) and code in RETRYABLE_CODES
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_pool_size(),
+                    thread_name_prefix='llm-request'
+                )
+    return _executor
+
+
+def _pool_size() -> int:
+    return getattr(settings, 'LLM_REQUEST_POOL_SIZE', 32)
+
+
+def in_flight_requests() -> int:
+    """Model requests currently queued or running in the shared pool"""
+
+    return _in_flight
+
+
+def _submit(call: Callable[[float], Any], timeout: float):
+    """Run `call(timeout)` on the shared pool, counting it as in flight"""
+
+    global _in_flight
+
+    def run():
+        global _in_flight
+        try:
+            return call(timeout)
+        finally:
+            with _in_flight_lock:
+                _in_flight -= 1
+
+    with _in_flight_lock:
+        _in_flight += 1
+    return _get_executor().submit(run)
+
+
+def _abandon(future) -> bool:
+    """
+    Drop a request the caller no longer waits for; True if it was still
+    queued, False if it is running and will finish in the background
+    """
+
+    global _in_flight
+
+    if future.cancel():
+        with _in_flight_lock:
+            _in_flight -= 1
+        return True
+    return future.done()
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """Latency at percentile `p` (0-100), or None without samples"""
+
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+# Shared by every policy in the process so hedging learns from all calls
+latency_tracker = LatencyTracker()
+
+# Time to first chunk of streamed calls; streams are hedged on this instead
+# of their (output-length dependent) total duration
+first_chunk_tracker = LatencyTracker()
+
+
+class RequestPolicy:
+    """
+    Wraps a model call with:
+      - jittered exponential backoff on retryable errors
+      - a hedged duplicate request once the call is slower than the
+        learned latency percentile; the first response wins
+      - per-call deadlines derived from an optional overall budget
+
+    The call receives the seconds left before its deadline and must pass
+    them on to the client as a request timeout. Requests that are already
+    running cannot be cancelled: a hedge loser or a call past its deadline
+    runs until the client times it out, holding a pool thread. Hedges are
+    therefore skipped while in-flight requests use more than
+    `hedge_max_pool_use` of the pool.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 20.0,
+                 hedge_percentile: float = 95, hedge_min_samples: int = 20,
+                 call_timeout: float = 120.0, budget_seconds: float = None,
+                 tracker: LatencyTracker = None, hedge_max_pool_use: float = 0.5):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.call_timeout = call_timeout
+        self.budget_deadline = time.monotonic() + budget_seconds if budget_seconds else None
+        self.tracker = tracker or latency_tracker
+        self.hedge_max_pool_use = hedge_max_pool_use
+
+        self._lock = threading.Lock()
+        self.metrics = {
+            'calls': 0,
+            'retries': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+            'hedges_skipped': 0,
+            'orphaned': 0,
+            'deadline_exceeded': 0,
+            'failures': 0,
+        }
+
+    @classmethod
+    def from_settings(cls, budget_seconds: float = None) -> 'RequestPolicy':
+        """Build a policy from the LLM_* settings"""
+
+        return cls(
+            max_retries=getattr(settings, 'LLM_MAX_RETRIES', 3),
+            base_delay=getattr(settings, 'LLM_RETRY_BASE_DELAY', 1.0),
+            max_delay=getattr(settings, 'LLM_RETRY_MAX_DELAY', 20.0),
+            hedge_percentile=getattr(settings, 'LLM_HEDGE_PERCENTILE', 95),
+            hedge_min_samples=getattr(settings, 'LLM_HEDGE_MIN_SAMPLES', 20),
+            call_timeout=getattr(settings, 'LLM_CALL_TIMEOUT', 120.0),
+            budget_seconds=budget_seconds,
+            hedge_max_pool_use=getattr(settings, 'LLM_HEDGE_MAX_POOL_USE', 0.5)
+        )
+
+    def remaining_budget(self) -> float:
+        """Seconds left in the overall budget, or None if unbounded"""
+
+        if self.budget_deadline is None:
+            return None
+        return self.budget_deadline - time.monotonic()
+
+    def execute(self, call: Callable[[float], Any], hedge: bool = True,
+                retryable: Callable[[Exception], bool] = None,
+                hedge_tracker: LatencyTracker = None,
+                hedge_while: Callable[[], bool] = None) -> Any:
+        """
+        Run `call` under the policy
+
+        Args:
+            call: Function performing one model request, given the
+                seconds left before the call's deadline as its timeout
+            hedge: Allow a duplicate request when the first one is slow
+            retryable: Override for deciding whether an error is retried
+            hedge_tracker: Latencies to derive the hedge delay from instead
+                of total call durations; the caller records into it (e.g.
+                time to first chunk for streams)
+            hedge_while: Checked when the hedge delay expires; the hedge is
+                only sent if it returns True (e.g. nothing streamed yet)
+        """
+
+        retryable = retryable or is_retryable
+        self._count('calls')
+
+        for attempt in range(self.max_retries + 1):
+            timeout = self._call_deadline()
+            try:
+                return self._attempt(call, timeout, hedge, hedge_tracker, hedge_while)
+            except Exception as e:
+                if isinstance(e, DeadlineExceeded):
+                    self._count('deadline_exceeded')
+                if attempt >= self.max_retries or not retryable(e):
+                    self._count('failures')
+                    raise
+
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                delay = random.uniform(0, delay)
+                remaining = self.remaining_budget()
+                if remaining is not None and delay >= remaining:
+                    self._count('failures')
+                    raise
+
+                self._count('retries')
+                logger.warning(f"Retrying model call in {delay:.1f}s after: {str(e)}")
+                time.sleep(delay)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Retry/hedge counters plus the learned latency percentiles"""
+
+        with self._lock:
+            stats = dict(self.metrics)
+        stats['latency_p50'] = self.tracker.percentile(50)
+        stats['latency_p95'] = self.tracker.percentile(95)
+        stats['hedge_after'] = self._hedge_delay()
+        stats['first_chunk_p95'] = first_chunk_tracker.percentile(95)
+        stats['stream_hedge_after'] = self._hedge_delay(first_chunk_tracker)
+        stats['in_flight'] = in_flight_requests()
+        return stats
+
+    def _call_deadline(self) -> float:
+        timeout = self.call_timeout
+        remaining = self.remaining_budget()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceeded('Project time budget exhausted')
+            timeout = min(timeout, remaining)
+        return timeout
+
+    def _hedge_delay(self, tracker: LatencyTracker = None) -> float:
+        tracker = tracker or self.tracker
+        if len(tracker) < self.hedge_min_samples:
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    def _attempt(self, call: Callable[[float], Any], timeout: float, hedge: bool,
+                 hedge_tracker: LatencyTracker = None, hedge_while: Callable[[], bool] = None) -> Any:
+        """
+        One attempt: primary request plus at most one hedge
+
+        Whatever is still running when the attempt returns or times out is
+        left to finish (or hit its client timeout) in the background.
+        """
+
+        started = time.monotonic()
+        deadline = started + timeout
+        run = call if hedge_tracker is not None else lambda seconds: self._timed(call, seconds)
+
+        primary = _submit(run, timeout)
+        pending = {primary}
+        hedged = None
+
+        try:
+            hedge_after = self._hedge_delay(hedge_tracker) if hedge else None
+            if hedge_after is not None and hedge_after < timeout:
+                done, _ = wait(pending, timeout=hedge_after)
+                if not done and (hedge_while is None or hedge_while()):
+                    if in_flight_requests() >= self.hedge_max_pool_use * _pool_size():
+                        self._count('hedges_skipped')
+                    else:
+                        hedged = _submit(run, deadline - time.monotonic())
+                        pending.add(hedged)
+                        self._count('hedges')
+
+            error = None
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is hedged:
+                            self._count('hedge_wins')
+                        return future.result()
+                    error = future.exception()
+
+            if error is not None and not pending:
+                raise error
+            raise DeadlineExceeded(f"Model call exceeded {timeout:.1f}s deadline")
+        finally:
+            for future in pending:
+                if not _abandon(future):
+                    self._count('orphaned')
+
+    def _timed(self, call: Callable[[float], Any], timeout: float) -> Any:
+        started = time.monotonic()
+        result = call(timeout)
+        self.tracker.record(time.monotonic() - started)
+        return result
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self.metrics[metric] += 1
+
+
+_default_policy = None
+
+
+def get_default_policy() -> RequestPolicy:
+    """Process-wide policy (no overall budget) for calls outside a project run"""
+
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = RequestPolicy.from_settings()
+    return _default_policy
@@ -0,0 +1,419 @@
+"""
+Retrieval Backends
+Search backends behind PatternRetriever: chromadb queries or exact in-process NumPy search
+"""
+
+from typing import Dict, List, Any, Sequence, Tuple
+import threading
+import numpy as np
+
+# Rows per collection.get call when scanning the whole collection
+PAGE_SIZE = 1000
+
+STORAGE_MODES = ('float32', 'float16', 'int8')
+
+
+class ChromaBackend:
+    """
+    Searches the chromadb collection directly (HNSW, squared L2 distance)
+    """
+
+    name = 'chroma'
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def add(self, ids: List[str], embeddings: np.ndarray, documents: List[str],
+            metadatas: List[Dict[str, Any]]) -> None:
+        # The collection is the store of record and is written by the retriever
+        pass
+
+    def delete(self, ids: List[str]) -> None:
+        pass
+
+    def query(self, embeddings: Sequence[Sequence[float]], framework: str,
+              pattern_type: str = None, top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Top-k patterns per query embedding, filtered by framework/type"""
+
+        where_filter = {"framework": framework}
+        if pattern_type:
+            where_filter["type"] = pattern_type
+
+        results = self.collection.query(
+            query_embeddings=[list(map(float, embedding)) for embedding in embeddings],
+            where=where_filter,
+            n_results=top_k
+        )
+
+        return [self._format_query_results(results, row) for row in range(len(embeddings))]
+
+    def get(self, framework: str, limit: int = 100) -> List[Dict[str, Any]]:
+        results = self.collection.get(
+            where={"framework": framework},
+            limit=limit
+        )
+
+        patterns = []
+        if results['documents']:
+            for i, doc in enumerate(results['documents']):
+                patterns.append({
+                    'code': doc,
+                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
+                    'id': results['ids'][i] if results['ids'] else None
+                })
+
+        return patterns
+
+    def fetch(self, ids: List[str], embedding: Sequence[float]) -> List[Dict[str, Any]]:
+        """Patterns by id, with their distance to `embedding`, in `ids` order"""
+
+        if not ids:
+            return []
+
+        results = self.collection.get(ids=list(ids), include=['embeddings', 'documents', 'metadatas'])
+        query = np.asarray(embedding, dtype=np.float32)
+        by_id = {
+            pattern_id: {
+                'id': pattern_id,
+                'code': results['documents'][i],
+                'metadata': results['metadatas'][i] or {},
+                'distance': float(np.sum((np.asarray(results['embeddings'][i], dtype=np.float32) - query) ** 2))
+            }
+            for i, pattern_id in enumerate(results['ids'])
+        }
+        return [by_id[pattern_id] for pattern_id in ids if pattern_id in by_id]
+
+    def documents(self):
+        """(id, code, metadata) for every pattern"""
+
+        total = self.collection.count()
+        for offset in range(0, total, PAGE_SIZE):
+            page = self.collection.get(include=['documents', 'metadatas'], limit=PAGE_SIZE, offset=offset)
+            for i, pattern_id in enumerate(page['ids']):
+                yield pattern_id, page['documents'][i], page['metadatas'][i] or {}
+
+    def _format_query_results(self, results: Dict[str, Any], row: int) -> List[Dict[str, Any]]:
+        """Convert one row of a collection query result into pattern dicts"""
+
+        patterns = []
+        if results['documents'] and len(results['documents']) > row:
+            for i, doc in enumerate(results['documents'][row]):
+                patterns.append({
+                    'id': results['ids'][row][i],
+                    'code': doc,
+                    'metadata': results['metadatas'][row][i] if results['metadatas'] else {},
+                    'distance': results['distances'][row][i] if results['distances'] else 0
+                })
+
+        return patterns
+
+
+def partition_key(metadata: Dict[str, Any]) -> Tuple[str, str]:
+    """Sort key grouping patterns by framework, then type"""
+
+    return (str(metadata.get('framework') or ''), str(metadata.get('type') or ''))
+
+
+class NumpyState:
+    """
+    One version of the NumpyBackend rows; never modified once published
+
+    `partitions` is None until the state has been sorted, partitioned,
+    normed and (for compact storage) quantized by `NumpyBackend._prepare`.
+    """
+
+    def __init__(self, ids: List[str], metadatas: List[Dict[str, Any]], matrix: np.ndarray,
+                 documents: List[str] = None, index=None, partitions: Dict[Tuple[str, str], Tuple[int, int]] = None,
+                 sq_norms: np.ndarray = None, codes: np.ndarray = None, scale: np.ndarray = None):
+        self.ids = ids
+        self.metadatas = metadatas
+        self.matrix = matrix
+        self.documents = documents
+        self.index = index
+        self.rows = {pattern_id: row for row, pattern_id in enumerate(ids)}
+        self.partitions = partitions
+        self.sq_norms = sq_norms
+        self.codes = codes
+        self.scale = scale
+
+    def document(self, row: int) -> str:
+        if self.documents is not None:
+            return self.documents[row]
+        return self.index.document(row)
+
+    def all_documents(self) -> List[str]:
+        if self.documents is not None:
+            return self.documents
+        return self.index.documents() if self.index is not None else []
+
+
+class NumpyBackend:
+    """
+    Exact search over an in-process float32 embedding matrix
+
+    Rows are kept sorted by (framework, type), so every (framework, type)
+    partition and every framework's "all types" partition is a contiguous
+    slice of the matrix. A query is one matrix product over its partition's
+    slice, followed by `argpartition` for the top k; filtered search cost
+    scales with the partition, not the corpus. Distances are squared L2,
+    the same metric chromadb uses, so thresholds on `distance` keep working.
+
+    The rows live in an immutable `NumpyState`. Writes build a new state
+    with the rows appended or removed and swap it in; the sort order and
+    the partition table are rebuilt lazily, under the lock, on the next
+    read. Every read works on the one state it picked up, so a concurrent
+    write can never mix old partition offsets with new rows. The matrix may be
+    a read-only memory map of a PatternIndex snapshot, which is written
+    pre-sorted so attaching to it needs no copy.
+
+    With `storage` set to 'float16' or 'int8' (per-dimension scalar
+    quantization) queries scan a compact in-memory copy and re-rank the
+    best `rerank` x top_k candidates with exact float32 distances. The
+    float32 rows are only read for those candidates, so when they come
+    from a memory-mapped snapshot they stay on disk / in the shared page
+    cache instead of in each worker's RAM.
+    """
+
+    name = 'numpy'
+
+    def __init__(self, ids: List[str], embeddings, metadatas: List[Dict[str, Any]],
+                 documents: Sequence[str] = None, index=None, storage: str = 'float32',
+                 rerank: int = 4):
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage}")
+        self.storage = storage
+        self.rerank = rerank
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(ids), -1) if matrix.size else np.zeros((0, 0), dtype=np.float32)
+        self._state = NumpyState(
+            list(ids), list(metadatas), matrix,
+            documents=list(documents) if documents is not None else None, index=index
+        )
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_index(cls, index, **options) -> 'NumpyBackend':
+        """Attach to a PatternIndex snapshot without copying its embeddings"""
+
+        return cls(index.ids, index.embeddings, index.metadatas, index=index, **options)
+
+    def count(self) -> int:
+        return len(self._state.ids)
+
+    def add(self, ids: List[str], embeddings: np.ndarray, documents: List[str],
+            metadatas: List[Dict[str, Any]]) -> None:
+        """Append patterns; ids already present are ignored, as in chromadb"""
+
+        with self._lock:
+            state = self._state
+            new_rows, seen = [], set()
+            for i, pattern_id in enumerate(ids):
+                if pattern_id not in state.rows and pattern_id not in seen:
+                    new_rows.append(i)
+                    seen.add(pattern_id)
+            if not new_rows:
+                return
+
+            vectors = np.asarray(embeddings, dtype=np.float32)[new_rows]
+            matrix = np.vstack([state.matrix, vectors]) if len(state.ids) else np.ascontiguousarray(vectors)
+            self._state = NumpyState(
+                state.ids + [ids[i] for i in new_rows],
+                state.metadatas + [metadatas[i] for i in new_rows],
+                matrix,
+                documents=list(state.all_documents()) + [documents[i] for i in new_rows]
+            )
+
+    def delete(self, ids: List[str]) -> None:
+        with self._lock:
+            state = self._state
+            drop = {state.rows[pattern_id] for pattern_id in ids if pattern_id in state.rows}
+            if not drop:
+                return
+
+            self._state = self._reordered(state, [row for row in range(len(state.ids)) if row not in drop])
+
+    def query(self, embeddings: Sequence[Sequence[float]], framework: str,
+              pattern_type: str = None, top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Top-k patterns per query embedding, filtered by framework/type"""
+
+        queries = np.asarray(embeddings, dtype=np.float32)
+        state = self._current()
+        start, end = state.partitions.get((framework, pattern_type or None), (0, 0))
+        size = end - start
+        if not size or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2
+        query_norms = np.einsum('ij,ij->i', queries, queries)
+        distances = state.sq_norms[start:end][:, None] - 2 * self._scan(state, start, end, queries) + query_norms[None, :]
+
+        k = min(top_k, size)
+        scan_k = k if self.storage == 'float32' else min(size, k * self.rerank)
+        all_patterns = []
+        for column in range(len(queries)):
+            column_distances = distances[:, column]
+            candidates = np.argpartition(column_distances, scan_k - 1)[:scan_k] if scan_k < size else np.arange(size)
+
+            if self.storage != 'float32':
+                # Exact float32 distances for the shortlist only
+                rows = start + candidates
+                column_distances = np.empty(size, dtype=np.float32)
+                column_distances[candidates] = state.sq_norms[rows] - 2 * (state.matrix[rows] @ queries[column]) + query_norms[column]
+
+            ordered = candidates[np.argsort(column_distances[candidates], kind='stable')][:k]
+            all_patterns.append([
+                {
+                    'id': state.ids[start + int(i)],
+                    'code': state.document(start + int(i)),
+                    'metadata': state.metadatas[start + int(i)],
+                    'distance': float(max(column_distances[i], 0.0))
+                }
+                for i in ordered
+            ])
+
+        return all_patterns
+
+    def _scan(self, state: NumpyState, start: int, end: int, queries: np.ndarray) -> np.ndarray:
+        """Approximate (or exact, for float32) dot products for a row range"""
+
+        if self.storage == 'float32':
+            return state.matrix[start:end] @ queries.T
+        if self.storage == 'float16':
+            return state.codes[start:end].astype(np.float32) @ queries.T
+        # x ~= codes * scale, so x.q ~= codes.(scale * q)
+        return state.codes[start:end].astype(np.float32) @ (queries * state.scale).T
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Bytes held for scanning and for re-ranking
+
+        `resident_bytes` is what this process keeps in its own heap: the
+        scan data, plus the float32 rows unless they are memory-mapped
+        from a snapshot (or are themselves the scan data).
+        """
+
+        state = self._current()
+        scan = state.matrix if state.codes is None else state.codes
+        scan_bytes = int(scan.nbytes + state.sq_norms.nbytes + (state.scale.nbytes if state.scale is not None else 0))
+        memory_mapped = isinstance(state.matrix, np.memmap) or isinstance(state.matrix.base, np.memmap)
+        heap_float32 = state.codes is not None and not memory_mapped
+        return {
+            'storage': self.storage,
+            'patterns': len(state.ids),
+            'scan_bytes': scan_bytes,
+            'float32_bytes': int(state.matrix.nbytes),
+            'float32_memory_mapped': memory_mapped,
+            'resident_bytes': scan_bytes + (int(state.matrix.nbytes) if heap_float32 else 0),
+        }
+
+    def get(self, framework: str, limit: int = 100) -> List[Dict[str, Any]]:
+        state = self._current()
+        start, end = state.partitions.get((framework, None), (0, 0))
+        return [
+            {
+                'code': state.document(row),
+                'metadata': state.metadatas[row],
+                'id': state.ids[row]
+            }
+            for row in range(start, min(end, start + limit))
+        ]
+
+    def fetch(self, ids: List[str], embedding: Sequence[float]) -> List[Dict[str, Any]]:
+        """Patterns by id, with their distance to `embedding`, in `ids` order"""
+
+        state = self._current()
+        query = np.asarray(embedding, dtype=np.float32)
+        patterns = []
+        for pattern_id in ids:
+            row = state.rows.get(pattern_id)
+            if row is None:
+                continue
+            patterns.append({
+                'id': pattern_id,
+                'code': state.document(row),
+                'metadata': state.metadatas[row],
+                'distance': float(np.sum((state.matrix[row] - query) ** 2))
+            })
+        return patterns
+
+    def documents(self):
+        """(id, code, metadata) for every pattern"""
+
+        state = self._state
+        for row, pattern_id in enumerate(state.ids):
+            yield pattern_id, state.document(row), state.metadatas[row]
+
+    def partition_sizes(self) -> Dict[str, int]:
+        """Row count per partition, keyed 'framework/type' ('framework/*' for all types)"""
+
+        return {
+            f"{framework}/{pattern_type or '*'}": end - start
+            for (framework, pattern_type), (start, end) in self._current().partitions.items()
+        }
+
+    def _current(self) -> NumpyState:
+        """The latest state, prepared for search (see `_prepare`)"""
+
+        state = self._state
+        if state.partitions is not None:
+            return state
+
+        with self._lock:
+            if self._state.partitions is None:
+                self._state = self._prepare(self._state)
+            return self._state
+
+    def _prepare(self, state: NumpyState) -> NumpyState:
+        """
+        Sort rows by (framework, type) if writes broke the order, map each
+        partition key to its (start, end) row range, and precompute norms
+        and the compact scan copy
+        """
+
+        keys = [partition_key(metadata) for metadata in state.metadatas]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        if order != list(range(len(keys))):
+            state = self._reordered(state, order)
+
+        partitions = {}
+        for row, metadata in enumerate(state.metadatas):
+            for key in [(metadata.get('framework'), None), (metadata.get('framework'), metadata.get('type'))]:
+                start, _ = partitions.get(key, (row, row))
+                partitions[key] = (start, row + 1)
+
+        matrix = state.matrix
+        sq_norms = np.einsum('ij,ij->i', matrix, matrix) if len(state.ids) else np.zeros(0, dtype=np.float32)
+        codes, scale = self._quantize(matrix, len(state.ids))
+
+        return NumpyState(
+            state.ids, state.metadatas, matrix, documents=state.documents, index=state.index,
+            partitions=partitions, sq_norms=sq_norms, codes=codes, scale=scale
+        )
+
+    def _quantize(self, matrix: np.ndarray, count: int):
+        """(codes, scale) for compact storage, (None, None) for float32"""
+
+        if self.storage == 'float16':
+            return matrix.astype(np.float16), None
+        if self.storage == 'int8':
+            scale = np.abs(matrix).max(axis=0) / 127 if count else np.ones(matrix.shape[1], dtype=np.float32)
+            scale[scale == 0] = 1.0
+            scale = scale.astype(np.float32)
+            return np.clip(np.rint(matrix / scale), -127, 127).astype(np.int8), scale
+        return None, None
+
+    def _reordered(self, state: NumpyState, rows: List[int]) -> NumpyState:
+        """A new unprepared state holding `rows` of `state`, in that order"""
+
+        documents = state.all_documents()
+        matrix = np.ascontiguousarray(state.matrix[rows]) if rows else np.zeros((0, state.matrix.shape[1]), dtype=np.float32)
+        return NumpyState(
+            [state.ids[row] for row in rows],
+            [state.metadatas[row] for row in rows],
+            matrix,
+            documents=[documents[row] for row in rows]
+        )
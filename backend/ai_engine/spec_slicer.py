@@ -0,0 +1,195 @@
+"""
+Specification Slicer
+Builds a minimal per-file view of the project specification for prompts
+"""
+
+import json
+import re
+import threading
+from typing import Dict, Any, Set
+
+
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'that', 'this', 'into', 'file', 'files',
+    'src', 'app', 'apps', 'index', 'main', 'frontend', 'backend', 'component',
+    'components', 'page', 'pages', 'view', 'views', 'api', 'handles', 'handle',
+    'js', 'jsx', 'ts', 'tsx', 'vue', 'py', 'json', 'html', 'css',
+}
+
+# Files that carry environment, database and service settings
+CONFIG_FILENAMES = {
+    'settings.py', 'config.py', '.env', '.env.example', 'dockerfile',
+    'docker-compose.yml', 'docker-compose.yaml', 'requirements.txt',
+    'package.json', 'vite.config.js', 'vue.config.js', 'next.config.js',
+}
+
+# Directory and file stems of clients that call the whole backend API
+API_CLIENT_TERMS = {'api', 'services', 'service', 'client', 'http', 'axios'}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def _terms(*texts: str) -> Set[str]:
+    """Split paths, identifiers and prose into normalized lookup terms"""
+
+    terms = set()
+    for text in texts:
+        text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text or '')
+        for word in re.split(r'[^A-Za-z0-9]+', text.lower()):
+            if len(word) < 3 or word in STOPWORDS:
+                continue
+            terms.add(word)
+            if word.endswith('s') and len(word) > 3:
+                terms.add(word[:-1])
+    return terms
+
+
+def _is_config(file_spec: Dict[str, Any]) -> bool:
+    """Whether a file needs the deployment and database sections"""
+
+    name = file_spec['path'].replace('\\', '/').rsplit('/', 1)[-1].lower()
+    return (
+        file_spec.get('type') == 'config'
+        or name in CONFIG_FILENAMES
+        or name.startswith('.env')
+        or name.startswith('docker-compose')
+    )
+
+
+def _is_api_client(file_spec: Dict[str, Any]) -> bool:
+    """Whether a frontend file is a generic client for the backend API"""
+
+    path = file_spec['path'].replace('\\', '/').lower()
+    if 'frontend' not in path or file_spec.get('type') in ('component', 'test'):
+        return False
+
+    parts = path.split('/')
+    stem = parts[-1].split('.', 1)[0]
+    return stem in API_CLIENT_TERMS or bool(set(parts[:-1]) & API_CLIENT_TERMS)
+
+
+class SpecSlicer:
+    """
+    Selects the components, endpoints, models and features a single file
+    actually refers to, and tracks how many prompt tokens that saves
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset per-project token statistics"""
+
+        with self._lock:
+            self.files_sliced = 0
+            self.full_tokens = 0
+            self.sliced_tokens = 0
+            self._full_spec = None
+            self._full_spec_tokens = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get input-token savings for the current project"""
+
+        with self._lock:
+            return {
+                'files_sliced': self.files_sliced,
+                'full_spec_tokens': self.full_tokens,
+                'sliced_spec_tokens': self.sliced_tokens,
+                'tokens_saved': self.full_tokens - self.sliced_tokens
+            }
+
+    def build_context(self, file_spec: Dict[str, Any], specs: Dict[str, Any]) -> str:
+        """Return the compact JSON context for one file and record the savings"""
+
+        context = json.dumps(self.slice(file_spec, specs), separators=(',', ':'))
+
+        with self._lock:
+            if self._full_spec is not specs:
+                self._full_spec = specs
+                self._full_spec_tokens = estimate_tokens(json.dumps(specs, indent=2))
+            self.files_sliced += 1
+            self.full_tokens += self._full_spec_tokens
+            self.sliced_tokens += estimate_tokens(context)
+
+        return context
+
+    def slice(self, file_spec: Dict[str, Any], specs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the minimal specification relevant to `file_spec`"""
+
+        architecture = specs.get('architecture', {})
+        frontend = architecture.get('frontend', {})
+        backend = architecture.get('backend', {})
+        is_backend = 'frontend' not in file_spec['path']
+
+        terms = _terms(
+            file_spec['path'],
+            file_spec.get('purpose', ''),
+            ' '.join(str(dep) for dep in file_spec.get('dependencies', []) or [])
+        )
+
+        components = [
+            c for c in frontend.get('components', [])
+            if _terms(c.get('name', '')) & terms
+        ]
+        endpoints = [
+            ep for ep in backend.get('api_endpoints', [])
+            if _terms(ep.get('path', '')) & terms
+        ]
+        models = [
+            m for m in backend.get('models', [])
+            if _terms(m.get('name', '')) & terms
+        ]
+
+        # Files that aggregate a whole layer need all of it
+        if file_spec.get('type') == 'model' and not models:
+            models = backend.get('models', [])
+        if file_spec.get('type') == 'api' and not endpoints:
+            endpoints = backend.get('api_endpoints', [])
+        # A shared API client wraps every endpoint, whatever its name says
+        if _is_api_client(file_spec):
+            endpoints = backend.get('api_endpoints', [])
+
+        component_names = {c.get('name') for c in components}
+        endpoint_paths = {ep.get('path') for ep in endpoints}
+        features = [
+            f for f in specs.get('features_breakdown', [])
+            if component_names & set(f.get('components_required', []))
+            or endpoint_paths & set(f.get('api_endpoints_required', []))
+            or _terms(f.get('feature', '')) & terms
+        ]
+
+        sliced = {
+            'project_name': specs.get('project_name'),
+            'description': specs.get('description'),
+            'stack': {
+                'frontend': frontend.get('framework'),
+                'backend': backend.get('framework'),
+                'database': architecture.get('database', {}).get('type')
+            },
+            'libraries': backend.get('key_libraries', []) if is_backend else frontend.get('key_libraries', [])
+        }
+
+        if components:
+            sliced['components'] = components
+        if endpoints:
+            sliced['api_endpoints'] = endpoints
+        if models:
+            sliced['models'] = models
+        if features:
+            sliced['features'] = [
+                {'feature': f.get('feature'), 'complexity': f.get('complexity')}
+                for f in features
+            ]
+        if is_backend and specs.get('security_considerations'):
+            sliced['security_considerations'] = specs['security_considerations']
+        if _is_config(file_spec):
+            if architecture.get('database'):
+                sliced['database'] = architecture['database']
+            if specs.get('deployment_requirements'):
+                sliced['deployment_requirements'] = specs['deployment_requirements']
+
+        return sliced
@@ -0,0 +1,202 @@
+"""
+Template Renderer
+Renders high-similarity reference patterns directly, skipping the LLM
+"""
+
+import os
+import re
+from typing import Dict, List, Any
+
+
+DJANGO_FIELD_TYPES = {
+    'string': "models.CharField(max_length=255)",
+    'str': "models.CharField(max_length=255)",
+    'char': "models.CharField(max_length=255)",
+    'text': "models.TextField()",
+    'integer': "models.IntegerField()",
+    'int': "models.IntegerField()",
+    'float': "models.FloatField()",
+    'decimal': "models.DecimalField(max_digits=10, decimal_places=2)",
+    'boolean': "models.BooleanField(default=False)",
+    'bool': "models.BooleanField(default=False)",
+    'date': "models.DateField()",
+    'datetime': "models.DateTimeField()",
+    'email': "models.EmailField()",
+    'url': "models.URLField()",
+    'json': "models.JSONField(default=dict)",
+}
+
+
+# Curated templates the fast path may render, by (framework, name). Each has
+# every variable part derived from the spec: the Django model from the spec
+# model's fields, the DRF view from that model. Templates with example
+# bodies (forms, generic components, Express routes) always go to the LLM.
+TEMPLATABLE_PATTERNS = {
+    ('django', 'base_model'),
+    ('django', 'rest_api_view'),
+}
+
+# Identifiers only the curated templates use; any left after rendering means
+# the template could not be fully adapted and the LLM has to write the file
+TEMPLATE_PLACEHOLDERS = ['ModelName', 'ModelSerializer', 'ModelViewSet']
+
+# Fields the Django model template's base class already defines
+BASE_MODEL_FIELDS = ('id', 'created_at', 'updated_at')
+
+
+def _pascal_case(name: str) -> str:
+    parts = re.split(r'[^A-Za-z0-9]+', re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', name))
+    return ''.join(part[:1].upper() + part[1:] for part in parts if part)
+
+
+class TemplateRenderer:
+    """
+    Renders the curated Django model and DRF view templates (see
+    TEMPLATABLE_PATTERNS) for the spec model a file is about
+    """
+
+    def __init__(self, templatable_types: List[str] = None, max_distance: float = 0.35):
+        self.templatable_types = set(templatable_types or ['model', 'api'])
+        self.max_distance = max_distance
+
+    def select_pattern(self, file_spec: Dict[str, Any],
+                       patterns: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the pattern to render directly, or None if the LLM is needed"""
+
+        if file_spec.get('type') not in self.templatable_types or not patterns:
+            return None
+
+        best = min(patterns, key=lambda p: p.get('distance', float('inf')))
+        if best.get('distance', float('inf')) > self.max_distance:
+            return None
+
+        metadata = best.get('metadata', {})
+        if metadata.get('source') not in (None, 'official_docs'):
+            return None
+        if (metadata.get('framework'), metadata.get('name')) not in TEMPLATABLE_PATTERNS:
+            return None
+
+        return best
+
+    def render(self, pattern: Dict[str, Any], file_spec: Dict[str, Any],
+               specs: Dict[str, Any]) -> str:
+        """
+        Render a pattern for the one spec model the file is about
+
+        Returns None when the file cannot be derived from the spec alone: it
+        names no model or several, the model has no fields (or no owner for
+        the per-user view), a template identifier is left over, or a
+        relative import points at a file the project does not plan. The
+        caller then generates the file with the LLM.
+        """
+
+        model = self._match_model(file_spec, specs)
+        if model is None:
+            return None
+
+        code = pattern['code']
+        model_name = _pascal_case(model['name'])
+        fields = [field for field in model.get('fields') or [] if isinstance(field, dict) and field.get('name')]
+
+        if 'models.Model' in code:
+            code = self._render_django_fields(code, model_name, fields)
+            if code is None:
+                return None
+        elif not any(field['name'] == 'user' for field in fields):
+            # The view scopes querysets and saves to request.user
+            return None
+
+        substitutions = {
+            'ModelSerializer': f"{model_name}Serializer",
+            'ModelViewSet': f"{model_name}View",
+            'ModelName': model_name,
+        }
+        for placeholder, value in substitutions.items():
+            code = re.sub(rf'\b{placeholder}\b', value, code)
+
+        if self.leftover_placeholders(code) or self._unresolved_imports(code, file_spec, specs):
+            return None
+
+        return code
+
+    def leftover_placeholders(self, code: str) -> List[str]:
+        """Template identifiers still present in rendered code"""
+
+        return [name for name in TEMPLATE_PLACEHOLDERS if re.search(rf'\b{name}\b', code)]
+
+    def _planned_paths(self, specs: Dict[str, Any]) -> set:
+        return {
+            os.path.normpath(entry['path'])
+            for entry in specs.get('file_structure', [])
+            if isinstance(entry, dict) and entry.get('path')
+        }
+
+    def _unresolved_imports(self, code: str, file_spec: Dict[str, Any],
+                            specs: Dict[str, Any]) -> List[str]:
+        """Relative imports in `code` whose target the project does not plan"""
+
+        planned = self._planned_paths(specs)
+        directory = os.path.dirname(file_spec['path'])
+        missing = []
+
+        for module in re.findall(r'^from \.(\w+) import', code, re.MULTILINE):
+            base = os.path.normpath(os.path.join(directory, module))
+            if f'{base}.py' not in planned and os.path.join(base, '__init__.py') not in planned:
+                missing.append(f'.{module}')
+
+        return missing
+
+    def _match_model(self, file_spec: Dict[str, Any], specs: Dict[str, Any]) -> Dict[str, Any]:
+        """The spec model this file names in its path or purpose, if exactly one"""
+
+        models = specs.get('architecture', {}).get('backend', {}).get('models', [])
+        text = f"{file_spec['path']} {file_spec.get('purpose', '')}"
+        snake = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', text).lower()
+        words = set(re.findall(r'[a-z0-9]+', snake))
+
+        matches = []
+        for model in models:
+            name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', str(model.get('name', ''))).lower()
+            if not name:
+                continue
+            if name in words or f'{name}s' in words or ('_' in name and name in snake):
+                matches.append(model)
+
+        return matches[0] if len(matches) == 1 else None
+
+    def _render_django_fields(self, code: str, model_name: str,
+                              fields: List[Dict[str, Any]]) -> str:
+        """
+        Replace the example fields of the Django model template with the
+        spec fields, or None if the spec gives none
+        """
+
+        lines = []
+        for field in fields:
+            if field['name'] in BASE_MODEL_FIELDS:
+                continue
+            if field['name'] == 'user':
+                lines.append("    user = models.ForeignKey(User, on_delete=models.CASCADE)")
+                continue
+            field_type = DJANGO_FIELD_TYPES.get(str(field.get('type', '')).lower(), DJANGO_FIELD_TYPES['string'])
+            lines.append(f"    {field['name']} = {field_type}")
+        if not lines:
+            return None
+
+        pattern = re.compile(
+            r"(class ModelName\(BaseModel\):\n)((?:    \w+ = models\.[^\n]*\n)+)"
+        )
+        code, replaced = pattern.subn(lambda m: m.group(1) + '\n'.join(lines) + '\n', code, count=1)
+        if not replaced:
+            return None
+
+        field_names = [line.split('=')[0].strip() for line in lines]
+        if 'user' not in field_names:
+            # The template's index is on the owner relation
+            code = re.sub(r"\n        indexes = \[\n(?:            [^\n]*\n)+        \]", '', code)
+            code = code.replace("from django.contrib.auth.models import User\n", '')
+        if 'title' not in field_names:
+            display = next((name for name in field_names if name != 'user'), field_names[0])
+            code = code.replace('return self.title', f"return str(self.{display})")
+
+        return code
@@ -67,6 +67,27 @@ class ProjectConsumer(AsyncJsonWebsocketConsumer):
             'duration': event.get('duration')
         })
     
+    async def file_chunk(self, event):
+        """
+        Send a piece of a file that is still being generated
+        """
+        await self.send_json({
+            'type': 'file_chunk',
+            'path': event['path'],
+            'chunk': event['chunk']
+        })
+    
+    async def file_generated(self, event):
+        """
+        Send the finalized content of a generated file
+        """
+        await self.send_json({
+            'type': 'file_generated',
+            'path': event['path'],
+            'content': event['content'],
+            'success': event.get('success', True)
+        })
+    
     async def generation_error(self, event):
         """
         Send generation error to WebSocket
@@ -64,6 +64,26 @@ class Project(models.Model):
         return None
 
 
+class FileCheckpoint(models.Model):
+    """
+    A generated file persisted as soon as it is produced, so an interrupted
+    generation can resume without regenerating it
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='file_checkpoints')
+    
+    path = models.CharField(max_length=500)
+    content = models.TextField()
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        unique_together = ['project', 'path']
+    
+    def __str__(self):
+        return f"{self.project.name} - {self.path}"
+
+
 class ProjectRefinement(models.Model):
     """
     Tracks iterative refinements to a project
@@ -1,23 +1,70 @@
 from celery import shared_task
+from celery.signals import worker_process_init
+from django.conf import settings
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Project, DebugSession, CodeIssue, GenerationLog, UserUsage
-from ai_engine.gemini_planner import GeminiPlanner
-from ai_engine.code_generator import CodeGenerator
-from ai_engine.quality_validator import QualityValidator
-from ai_engine.packager import Packager
-from ai_engine.code_debugger import CodeDebugger
+from django.db import connection
+from .models import Project, FileCheckpoint, DebugSession, CodeIssue, GenerationLog, UserUsage
+from ai_engine.registry import registry
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# The ai_engine pipeline modules are imported inside the tasks below: web
+# workers import this module only to call .delay() and should not pay for
+# loading them.
+
+# Progress band covered by file generation
+GENERATION_PROGRESS_START = 45
+GENERATION_PROGRESS_END = 70
+
+
+def _generation_progress(done, total):
+    """Map completed files onto the generation progress band"""
+    if not total:
+        return GENERATION_PROGRESS_START
+    span = GENERATION_PROGRESS_END - GENERATION_PROGRESS_START
+    return GENERATION_PROGRESS_START + int(span * min(done, total) / total)
+
+
+@worker_process_init.connect
+def warm_up_ai_engine(**kwargs):
+    """
+    Preload the shared Gemini client, encoder and pattern store in each
+    worker process so the first task does not pay the cold start
+    """
+    if not getattr(settings, 'AI_ENGINE_WARM_UP', True):
+        return
+    
+    readiness = registry.warm_up()
+    logger.info(f"AI engine warm-up: {readiness}")
+
 
 @shared_task
+def worker_readiness_task():
+    """
+    Report which shared AI resources are loaded in the worker that runs it
+    """
+    return registry.readiness()
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
 def generate_project_task(project_id):
     """
     Celery task to generate project asynchronously
+    
+    Every generated file is checkpointed as soon as it is produced. Running
+    the task again for the same project resumes from the saved
+    specifications and skips files that already have a checkpoint or were
+    saved on the project. Checkpoints are kept until the project completes.
     """
+    from ai_engine.gemini_planner import GeminiPlanner
+    from ai_engine.code_generator import CodeGenerator
+    from ai_engine.quality_validator import QualityValidator
+    from ai_engine.packager import Packager
+    
     try:
         project = Project.objects.get(id=project_id)
         channel_layer = get_channel_layer()
@@ -45,21 +92,26 @@ def generate_project_task(project_id):
                 }
             )
         
-        # Step 1: Analyzing Requirements (0-20%)
-        send_update('analyzing', 10, 'Starting requirement analysis...', 'info')
-        
-        planner = GeminiPlanner()
-        specs = planner.analyze_requirements(
-            description=project.description,
-            features=project.features,
-            tech_stack=project.tech_stack,
-            style_preferences=project.style_preferences
-        )
-        
-        project.specifications = specs
-        project.save()
-        
-        send_update('analyzing', 20, 'Requirements analyzed successfully', 'success')
+        if project.specifications:
+            # Resume: requirements were already analyzed by an earlier run
+            specs = project.specifications
+            send_update('analyzing', 20, 'Resuming from saved specifications', 'info')
+        else:
+            # Step 1: Analyzing Requirements (0-20%)
+            send_update('analyzing', 10, 'Starting requirement analysis...', 'info')
+            
+            planner = GeminiPlanner()
+            specs = planner.analyze_requirements(
+                description=project.description,
+                features=project.features,
+                tech_stack=project.tech_stack,
+                style_preferences=project.style_preferences
+            )
+            
+            project.specifications = specs
+            project.save()
+            
+            send_update('analyzing', 20, 'Requirements analyzed successfully', 'success')
         
         # Step 2: Planning Architecture (20-40%)
         send_update('planning', 25, 'Planning project architecture...', 'info')
@@ -67,16 +119,124 @@ def generate_project_task(project_id):
         send_update('planning', 40, 'Architecture planning complete', 'success')
         
         # Step 3: Generating Code (40-70%)
-        send_update('generating', 45, 'Starting code generation...', 'info')
+        planned_paths = {file_spec['path'] for file_spec in specs.get('file_structure', [])}
+        checkpoints = {
+            checkpoint.path: checkpoint.content
+            for checkpoint in FileCheckpoint.objects.filter(project=project, path__in=planned_paths)
+        }
+        # A run that failed after generation saved the full file set on the project
+        for path, content in (project.generated_files or {}).items():
+            if path in planned_paths:
+                checkpoints.setdefault(path, content)
+        checkpoint_lock = threading.Lock()
+        total_files = len(planned_paths)
+        
+        if checkpoints:
+            send_update(
+                'generating', _generation_progress(len(checkpoints), total_files),
+                f"Resuming: {len(checkpoints)} of {total_files} files already generated", 'info'
+            )
+        else:
+            send_update('generating', GENERATION_PROGRESS_START, 'Starting code generation...', 'info')
+        
+        def send_file_chunk(path, chunk):
+            """Stream partial file content to the client"""
+            try:
+                async_to_sync(channel_layer.group_send)(
+                    f'project_{project_id}',
+                    {
+                        'type': 'file_chunk',
+                        'path': path,
+                        'chunk': chunk
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Failed to stream chunk of {path}: {str(e)}")
+        
+        def checkpoint_file(path, content, success):
+            """Persist a finished file and notify the client"""
+            try:
+                if success and path in planned_paths:
+                    FileCheckpoint.objects.update_or_create(
+                        project_id=project_id,
+                        path=path,
+                        defaults={'content': content}
+                    )
+                    with checkpoint_lock:
+                        checkpoints[path] = content
+                        progress = _generation_progress(len(checkpoints), total_files)
+                    Project.objects.filter(id=project_id).update(progress=progress)
+                
+                async_to_sync(channel_layer.group_send)(
+                    f'project_{project_id}',
+                    {
+                        'type': 'file_generated',
+                        'path': path,
+                        'content': content,
+                        'success': success
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Failed to checkpoint {path}: {str(e)}")
+            finally:
+                # Generator worker threads each hold their own DB connection
+                if threading.current_thread() is not threading.main_thread():
+                    connection.close()
         
         generator = CodeGenerator()
-        files = generator.generate_project_files(specs)
+        files = generator.generate_project_files(
+            specs,
+            on_file_chunk=send_file_chunk if settings.GENERATION_STREAMING else None,
+            on_file_complete=checkpoint_file,
+            existing_files=dict(checkpoints)
+        )
         
         project.generated_files = files
         project.save()
         
-        send_update('generating', 60, f"Generated {len(files)} files", 'info')
-        send_update('generating', 70, 'Code generation complete', 'success')
+        schedule = generator.generation_stats.get('schedule', {})
+        send_update('generating', GENERATION_PROGRESS_END, f"Generated {len(files)} files", 'info')
+        send_update(
+            'generating', GENERATION_PROGRESS_END,
+            f"Scheduled {schedule.get('total_files', 0)} files in "
+            f"{schedule.get('critical_path_length', 0)} dependency waves "
+            f"(max parallelism {schedule.get('max_parallelism', 0)})",
+            'info'
+        )
+        
+        fast_path = generator.generation_stats.get('fast_path', {})
+        if fast_path.get('template_files'):
+            send_update(
+                'generating', GENERATION_PROGRESS_END,
+                f"Rendered {fast_path['template_files']} files from templates "
+                f"(~{fast_path['estimated_seconds_saved']:.0f}s saved)",
+                'info'
+            )
+        
+        slicing = generator.generation_stats.get('spec_slicing', {})
+        logger.info(
+            f"Project {project_id} spec slicing saved ~{slicing.get('tokens_saved', 0)} input tokens "
+            f"({slicing.get('sliced_spec_tokens', 0)} of {slicing.get('full_spec_tokens', 0)} sent)"
+        )
+        
+        policy_stats = generator.generation_stats.get('request_policy', {})
+        logger.info(
+            f"Project {project_id} model calls: {policy_stats.get('calls', 0)} "
+            f"({policy_stats.get('retries', 0)} retries, {policy_stats.get('hedges', 0)} hedges, "
+            f"{policy_stats.get('hedge_wins', 0)} hedge wins, "
+            f"{policy_stats.get('deadline_exceeded', 0)} deadlines exceeded)"
+        )
+        
+        GenerationLog.objects.create(
+            project=project,
+            log_type='info',
+            message='Code generation statistics',
+            details={
+                'stats': generator.generation_stats,
+                'file_sources': generator.file_sources
+            }
+        )
+        send_update('generating', GENERATION_PROGRESS_END, 'Code generation complete', 'success')
         
         # Step 4: Validating Code (70-85%)
         send_update('validating', 72, 'Running code quality checks...', 'info')
@@ -120,6 +280,9 @@ def generate_project_task(project_id):
         project.completed_at = timezone.now()
         project.save()
         
+        # Nothing left to resume
+        FileCheckpoint.objects.filter(project=project).delete()
+        
         # Update user usage stats
         usage = UserUsage.objects.get(user=project.user)
         usage.successful_projects += 1
@@ -175,6 +338,8 @@ def debug_repository_task(session_id):
     """
     Celery task to debug repository asynchronously
     """
+    from ai_engine.code_debugger import CodeDebugger
+    
     try:
         debug_session = DebugSession.objects.get(id=session_id)
         channel_layer = get_channel_layer()
@@ -1,6 +1,7 @@
 from django.urls import path
 from .views import (
     GenerateProjectView,
+    ResumeProjectView,
     ProjectDetailView,
     ProjectListView,
     ProjectLogsView,
@@ -9,7 +10,8 @@ from .views import (
     DebugRepositoryView,
     DebugSessionDetailView,
     DebugSessionListView,
-    ApplyFixesView
+    ApplyFixesView,
+    WorkerReadinessView
 )
 
 urlpatterns = [
@@ -19,6 +21,7 @@ urlpatterns = [
     path('projects/<uuid:project_id>/', ProjectDetailView.as_view(), name='project-detail'),
     path('projects/<uuid:project_id>/logs/', ProjectLogsView.as_view(), name='project-logs'),
     path('projects/<uuid:project_id>/download/', DownloadProjectView.as_view(), name='project-download'),
+    path('projects/<uuid:project_id>/resume/', ResumeProjectView.as_view(), name='project-resume'),
     
     # Debugging
     path('debug/', DebugRepositoryView.as_view(), name='debug-repository'),
@@ -28,4 +31,7 @@ urlpatterns = [
     
     # Usage stats
     path('usage/', UsageStatsView.as_view(), name='usage-stats'),
+    
+    # Health
+    path('health/workers/', WorkerReadinessView.as_view(), name='worker-readiness'),
 ]
@@ -1,12 +1,13 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, BasePermission
+from django.conf import settings
 from django.utils import timezone
 from .models import Project, DebugSession, CodeIssue, GenerationLog, UserUsage
 from .serializers import ProjectSerializer, ProjectCreateSerializer, DebugSessionSerializer
-from .tasks import generate_project_task, debug_repository_task
-from ai_engine.code_debugger import CodeDebugger
+from .tasks import generate_project_task, debug_repository_task, worker_readiness_task
+import ipaddress
 import logging
 
 logger = logging.getLogger(__name__)
@@ -78,6 +79,67 @@ class GenerateProjectView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class ResumeProjectView(APIView):
+    """Re-run generation for a failed project, resuming from its checkpoints"""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, project_id):
+        try:
+            project = Project.objects.get(id=project_id, user=request.user)
+        except Project.DoesNotExist:
+            return Response({
+                'error': 'Project not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if project.status != 'failed':
+            return Response({
+                'error': 'Only failed projects can be resumed'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # A resume re-runs the paid pipeline, so it counts like a new generation
+        usage, _ = UserUsage.objects.get_or_create(user=request.user)
+        subscription = getattr(request.user, 'subscription', 'free')
+        
+        if not usage.can_generate(subscription):
+            return Response({
+                'error': 'Generation limit reached',
+                'message': 'You have reached your monthly generation limit. Please upgrade your plan.',
+                'limit_reached': True
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if not usage.can_make_request(subscription):
+            return Response({
+                'error': 'Rate limit exceeded',
+                'message': 'You have made too many requests today. Please try again tomorrow.',
+                'rate_limited': True
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        # Only one of several concurrent resumes may move the project out of 'failed'
+        resumed = Project.objects.filter(
+            id=project_id, user=request.user, status='failed'
+        ).update(status='pending', error_message=None)
+        if resumed != 1:
+            return Response({
+                'error': 'Only failed projects can be resumed'
+            }, status=status.HTTP_409_CONFLICT)
+        
+        GenerationLog.objects.create(
+            project=project,
+            log_type='info',
+            message='Project generation resumed'
+        )
+        
+        usage.monthly_generations += 1
+        usage.today_requests += 1
+        usage.last_generation = timezone.now()
+        usage.save()
+        
+        generate_project_task.delay(str(project.id))
+        
+        project.refresh_from_db()
+        return Response(ProjectSerializer(project).data)
+
+
 class DebugRepositoryView(APIView):
     """
     Debug an existing GitHub repository
@@ -188,6 +250,7 @@ class ApplyFixesView(APIView):
                 }, status=status.HTTP_401_UNAUTHORIZED)
             
             # Create pull request with fixes
+            from ai_engine.code_debugger import CodeDebugger
             debugger = CodeDebugger()
             
             pr_url = debugger.create_pull_request(
@@ -355,3 +418,48 @@ class UsageStatsView(APIView):
                 'requests': max(0, limit['dailyRequests'] - usage.today_requests)
             }
         })
+
+
+class IsStaffOrInternalNetwork(BasePermission):
+    """Staff users, or unauthenticated clients in WORKER_READINESS_NETWORKS"""
+    
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        
+        try:
+            client = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+        except ValueError:
+            return False
+        
+        return any(
+            client in ipaddress.ip_network(network, strict=False)
+            for network in getattr(settings, 'WORKER_READINESS_NETWORKS', [])
+        )
+
+
+class WorkerReadinessView(APIView):
+    """
+    Readiness probe: checks that a Celery worker has its AI models loaded
+    
+    Only reports ready/not ready per component; details (load times, errors)
+    are logged by the worker, not returned.
+    """
+    permission_classes = [IsStaffOrInternalNetwork]
+    
+    def get(self, request):
+        timeout = getattr(settings, 'WORKER_READINESS_TIMEOUT', 2.0)
+        try:
+            readiness = worker_readiness_task.apply_async(expires=timeout).get(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Worker readiness check failed: {str(e)}")
+            return Response({'ready': False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        ready = bool(readiness.get('ready'))
+        return Response(
+            {
+                'ready': ready,
+                'components': {name: bool(loaded) for name, loaded in readiness.get('components', {}).items()}
+            },
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
@@ -0,0 +1,191 @@
+"""
+Encoder Backend Benchmark
+Compares the pattern encoder backends (torch, torch-int8, onnx, onnx-int8)
+on CPU: load time, single-query latency, batch throughput, resident memory,
+and agreement with the torch embeddings.
+
+Each backend runs in a fresh interpreter so memory figures are not shared.
+Missing ONNX exports are created (and verified) before any backend runs.
+
+Usage (from backend/):
+    python benchmarks/encoder_backends.py
+    python benchmarks/encoder_backends.py --backends torch onnx-int8 --threads 4 --output encoders.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Any
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from ai_engine.encoders import (  # noqa: E402
+    ENCODER_BACKENDS, DEFAULT_TOLERANCE, ONNX_FILE, ONNX_INT8_FILE,
+    embedding_agreement, export_onnx, onnx_model_directory
+)
+
+# Shaped like the "{purpose} {type}" queries CodeGenerator searches with
+QUERIES = [
+    'User login form with validation component',
+    'Navigation bar with responsive menu component',
+    'Product list with pagination component',
+    'REST endpoint for creating orders api',
+    'JWT authentication middleware api',
+    'User profile model with avatar model',
+    'Webpack and Babel build settings config',
+    'Pinia store for shopping cart snippet',
+    'Express router with error handling api',
+    'Dashboard layout with sidebar component',
+]
+
+DOCUMENTS = [
+    "import React, { useState } from 'react';\n\nexport default function LoginForm({ onSubmit }) {\n"
+    "  const [email, setEmail] = useState('');\n  const [password, setPassword] = useState('');\n"
+    "  return (<form onSubmit={() => onSubmit(email, password)}>...</form>);\n}",
+    "from django.db import models\n\nclass Order(models.Model):\n    customer = models.ForeignKey('auth.User', "
+    "on_delete=models.CASCADE)\n    total = models.DecimalField(max_digits=10, decimal_places=2)\n"
+    "    created_at = models.DateTimeField(auto_now_add=True)",
+    "const express = require('express');\nconst router = express.Router();\n\nrouter.get('/', async (req, res, next) => {\n"
+    "  try {\n    res.json(await Item.find());\n  } catch (err) {\n    next(err);\n  }\n});\n\nmodule.exports = router;",
+    "<template>\n  <ul>\n    <li v-for=\"item in items\" :key=\"item.id\">{{ item.name }}</li>\n  </ul>\n</template>\n\n"
+    "<script setup>\ndefineProps({ items: Array })\n</script>",
+]
+
+
+def resident_mb() -> float:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def measure(backend: str, model_name: str, onnx_directory: str, runs: int, batch_size: int,
+            documents: int, threads: int = None) -> Dict[str, Any]:
+    """Benchmark one backend in the current process"""
+
+    from ai_engine.encoders import load_encoder
+
+    baseline_mb = resident_mb()
+    started = time.perf_counter()
+    encoder = load_encoder(model_name, backend, onnx_directory=onnx_directory, threads=threads)
+    load_seconds = time.perf_counter() - started
+    loaded_mb = resident_mb()
+
+    encoder.encode(QUERIES[:2])  # warm-up
+
+    latencies = []
+    for i in range(runs):
+        started = time.perf_counter()
+        encoder.encode([QUERIES[i % len(QUERIES)]])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    corpus = [DOCUMENTS[i % len(DOCUMENTS)] + f'\n// variant {i}' for i in range(documents)]
+    started = time.perf_counter()
+    encoder.encode(corpus, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - started
+
+    reference_texts = QUERIES + DOCUMENTS
+    return {
+        'load_seconds': round(load_seconds, 3),
+        'query_p50_ms': round(latencies[len(latencies) // 2], 3),
+        'query_p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        'query_mean_ms': round(statistics.mean(latencies), 3),
+        'documents_per_second': round(documents / batch_seconds, 1),
+        'model_rss_mb': round(loaded_mb - baseline_mb, 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'embeddings': np.asarray(encoder.encode(reference_texts), dtype=np.float32).tolist(),
+    }
+
+
+def run_backend(backend: str, args) -> Dict[str, Any]:
+    """Run `measure` for one backend in a child interpreter"""
+
+    command = [sys.executable, os.path.abspath(__file__), '--child', backend,
+               '--model', args.model, '--onnx-directory', args.onnx_directory,
+               '--runs', str(args.runs), '--batch-size', str(args.batch_size), '--documents', str(args.documents)]
+    if args.threads:
+        command += ['--threads', str(args.threads)]
+
+    result = subprocess.run(
+        command,
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--onnx-directory', default='./onnx_models')
+    parser.add_argument('--runs', type=int, default=200, help='Single-query encodes per backend')
+    parser.add_argument('--documents', type=int, default=512, help='Documents in the throughput run')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--threads', type=int, help='Cap intra-op CPU threads for every backend')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--child', choices=ENCODER_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.model, args.onnx_directory,
+                                 args.runs, args.batch_size, args.documents, args.threads)))
+        return 0
+
+    backends = ['torch'] + [backend for backend in args.backends if backend != 'torch']
+
+    model_directory = onnx_model_directory(args.onnx_directory, args.model)
+    quantize = 'onnx-int8' in backends
+    needed = [ONNX_FILE] * any(backend.startswith('onnx') for backend in backends) + [ONNX_INT8_FILE] * quantize
+    if any(not os.path.exists(os.path.join(model_directory, name)) for name in needed):
+        export_onnx(args.model, model_directory, quantize=quantize, tolerance=args.tolerance)
+    results = {backend: run_backend(backend, args) for backend in backends}
+
+    reference = results['torch'].get('embeddings')
+    failed = False
+    for backend, result in results.items():
+        embeddings = result.pop('embeddings', None)
+        if reference is None or embeddings is None:
+            continue
+        agreement = embedding_agreement(np.asarray(reference), np.asarray(embeddings))
+        result['min_cosine_vs_torch'] = round(agreement, 5)
+        result['within_tolerance'] = agreement >= args.tolerance
+        failed = failed or not result['within_tolerance']
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'model': args.model,
+        'threads': args.threads,
+        'runs': args.runs,
+        'documents': args.documents,
+        'batch_size': args.batch_size,
+        'tolerance': args.tolerance,
+        'backends': results,
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if failed:
+        print('FAIL: a backend disagrees with torch beyond the tolerance', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Web Worker Import-Time Benchmark
+Measures what a gunicorn/daphne web worker imports at startup using
+`python -X importtime`, and flags heavy ML dependencies on the web path.
+
+Usage (from backend/):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --output import_time.json --max-ms 1500
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Any
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be loaded by Celery workers
+HEAVY_MODULES = [
+    'google.generativeai',
+    'github',
+    'chromadb',
+    'sentence_transformers',
+    'torch',
+    'datasets',
+    'onnxruntime',
+]
+
+WEB_ENTRYPOINT = """
+import django
+django.setup()
+import webforge.urls
+import apps.generator.views
+import apps.generator.urls
+"""
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S+)')
+
+
+def run_once(settings_module: str) -> Dict[str, Any]:
+    """Import the web entrypoint in a fresh interpreter and parse -X importtime"""
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', WEB_ENTRYPOINT],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = {
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'top_level': len(indent) == 0
+            }
+
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError('Web entrypoint failed to import:\n' + '\n'.join(errors[-20:]))
+
+    return {'wall_ms': wall_ms, 'modules': modules}
+
+
+def summarize(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Aggregate several runs into a machine-readable report"""
+
+    last = runs[-1]['modules']
+    import_ms = [
+        sum(m['cumulative_us'] for m in run['modules'].values() if m['top_level']) / 1000
+        for run in runs
+    ]
+    heavy = sorted({
+        name for name in last
+        for heavy_name in HEAVY_MODULES
+        if name == heavy_name or name.startswith(heavy_name + '.')
+    })
+    slowest = sorted(
+        ((name, m['cumulative_us'] / 1000) for name, m in last.items() if m['top_level']),
+        key=lambda item: item[1],
+        reverse=True
+    )[:top]
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': sys.version.split()[0],
+        'runs': len(runs),
+        'wall_ms_median': round(statistics.median(r['wall_ms'] for r in runs), 1),
+        'import_ms_median': round(statistics.median(import_ms), 1),
+        'modules_imported': len(last),
+        'heavy_modules_imported': heavy,
+        'slowest_top_level': [{'module': name, 'cumulative_ms': round(ms, 1)} for name, ms in slowest],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='webforge.settings.development')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--max-ms', type=float, help='Fail if the median import time exceeds this')
+    args = parser.parse_args()
+
+    runs = [run_once(args.settings) for _ in range(args.runs)]
+    report = summarize(runs, args.top)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if report['heavy_modules_imported']:
+        print(f"FAIL: heavy modules on the web path: {', '.join(report['heavy_modules_imported'])}",
+              file=sys.stderr)
+        failed = True
+    if args.max_ms is not None and report['import_ms_median'] > args.max_ms:
+        print(f"FAIL: median import time {report['import_ms_median']}ms > {args.max_ms}ms", file=sys.stderr)
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Quantized Pattern Index Benchmark
+Compares float32, float16 and int8 storage for the NumPy retrieval backend:
+scan and resident memory per 100k patterns, query latency, and recall@k
+against the float32 results.
+
+Resident memory counts the float32 rows kept for re-ranking. With
+--snapshot the backends attach to a memory-mapped PatternIndex snapshot,
+as in deployment, so those rows stay out of the process heap.
+
+Usage (from backend/):
+    python benchmarks/quantized_index.py
+    python benchmarks/quantized_index.py --patterns 100000 --rerank 4 --output quantized.json
+    python benchmarks/quantized_index.py --snapshot
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+from retrieval_backends import build_corpus, build_queries, run_queries, recall_at_k, summarize
+from ai_engine.pattern_index import PatternIndex
+from ai_engine.retrieval_backends import NumpyBackend, STORAGE_MODES
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patterns', type=int, default=50000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--rerank', type=int, default=4)
+    parser.add_argument('--snapshot', action='store_true', help='Attach to a memory-mapped snapshot')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.patterns, args.dimension)
+    queries = build_queries(corpus, args.queries)
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'patterns': args.patterns,
+        'dimension': args.dimension,
+        'queries': args.queries,
+        'top_k': args.top_k,
+        'rerank': args.rerank,
+        'snapshot': args.snapshot,
+        'storage': {},
+    }
+
+    index = None
+    if args.snapshot:
+        directory = tempfile.mkdtemp(prefix='pattern_index_')
+        PatternIndex.write(directory, corpus['ids'], corpus['documents'], corpus['metadatas'],
+                           corpus['embeddings'], encoder_name='synthetic')
+        index = PatternIndex.open(directory)
+
+    baseline = None
+    for storage in STORAGE_MODES:
+        started = time.perf_counter()
+        if index is not None:
+            backend = NumpyBackend.from_index(index, storage=storage, rerank=args.rerank)
+        else:
+            backend = NumpyBackend(corpus['ids'], corpus['embeddings'], corpus['metadatas'],
+                                   documents=corpus['documents'], storage=storage, rerank=args.rerank)
+        memory = backend.memory_usage()
+        build_seconds = time.perf_counter() - started
+
+        latencies, results = run_queries(backend, queries, args.top_k)
+        if baseline is None:
+            baseline = results
+
+        report['storage'][storage] = dict(
+            summarize(latencies),
+            build_seconds=round(build_seconds, 3),
+            scan_mb_per_100k=round(memory['scan_bytes'] / args.patterns * 100000 / 2 ** 20, 2),
+            resident_mb_per_100k=round(memory['resident_bytes'] / args.patterns * 100000 / 2 ** 20, 2),
+            float32_memory_mapped=memory['float32_memory_mapped'],
+            recall=round(recall_at_k(results, baseline), 4)
+        )
+
+    if index is not None:
+        shutil.rmtree(index.path, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
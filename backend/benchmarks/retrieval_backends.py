@@ -0,0 +1,164 @@
+"""
+Retrieval Backend Benchmark
+Compares the chromadb and NumPy PatternRetriever backends on query latency
+and recall@k, using a synthetic corpus of unit-norm embeddings so the
+encoder is not part of the measurement.
+
+Usage (from backend/):
+    python benchmarks/retrieval_backends.py
+    python benchmarks/retrieval_backends.py --patterns 50000 --queries 500 --output backends.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Any
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from ai_engine.retrieval_backends import ChromaBackend, NumpyBackend  # noqa: E402
+
+FRAMEWORKS = ['react', 'vue', 'django', 'nodejs']
+PATTERN_TYPES = ['component', 'api', 'model', 'config', 'snippet', 'example']
+
+
+def build_corpus(size: int, dimension: int, seed: int = 0) -> Dict[str, Any]:
+    """Clustered unit vectors with framework/type metadata"""
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(64, dimension)).astype(np.float32)
+    labels = rng.integers(0, len(centers), size=size)
+    embeddings = centers[labels] + 0.35 * rng.normal(size=(size, dimension)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    metadatas = [
+        {
+            'framework': FRAMEWORKS[int(rng.integers(len(FRAMEWORKS)))],
+            'type': PATTERN_TYPES[int(rng.integers(len(PATTERN_TYPES)))],
+            'name': f'pattern_{i}',
+        }
+        for i in range(size)
+    ]
+
+    return {
+        'ids': [f'pattern_{i}' for i in range(size)],
+        'documents': [f'// synthetic pattern {i}' for i in range(size)],
+        'metadatas': metadatas,
+        'embeddings': embeddings,
+        'centers': centers,
+    }
+
+
+def build_queries(corpus: Dict[str, Any], count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    dimension = corpus['embeddings'].shape[1]
+    queries = []
+    for _ in range(count):
+        vector = corpus['centers'][int(rng.integers(len(corpus['centers'])))] \
+            + 0.5 * rng.normal(size=dimension).astype(np.float32)
+        queries.append({
+            'embedding': vector / np.linalg.norm(vector),
+            'framework': FRAMEWORKS[int(rng.integers(len(FRAMEWORKS)))],
+            'pattern_type': PATTERN_TYPES[int(rng.integers(len(PATTERN_TYPES)))] if rng.random() < 0.8 else None,
+        })
+    return queries
+
+
+def build_chroma(corpus: Dict[str, Any]) -> ChromaBackend:
+    import chromadb
+    from chromadb.config import Settings
+
+    client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+    collection = client.create_collection(name=f'benchmark_{time.time_ns()}')
+    for start in range(0, len(corpus['ids']), 1000):
+        end = start + 1000
+        collection.add(
+            ids=corpus['ids'][start:end],
+            embeddings=corpus['embeddings'][start:end].tolist(),
+            documents=corpus['documents'][start:end],
+            metadatas=corpus['metadatas'][start:end]
+        )
+    return ChromaBackend(collection)
+
+
+def run_queries(backend, queries: List[Dict[str, Any]], top_k: int):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        patterns = backend.query([query['embedding']], query['framework'], query['pattern_type'], top_k)[0]
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append([p['metadata']['name'] for p in patterns])
+    return latencies, results
+
+
+def recall_at_k(results: List[List[str]], oracle: List[List[str]]) -> float:
+    scores = [len(set(r) & set(o)) / len(o) for r, o in zip(results, oracle) if o]
+    return statistics.mean(scores) if scores else 1.0
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'mean_ms': round(statistics.mean(ordered), 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patterns', type=int, default=20000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--skip-chroma', action='store_true')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.patterns, args.dimension)
+    queries = build_queries(corpus, args.queries)
+
+    started = time.perf_counter()
+    numpy_backend = NumpyBackend(corpus['ids'], corpus['embeddings'], corpus['metadatas'],
+                                 documents=corpus['documents'])
+    numpy_build = time.perf_counter() - started
+    numpy_latencies, oracle = run_queries(numpy_backend, queries, args.top_k)
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'patterns': args.patterns,
+        'dimension': args.dimension,
+        'queries': args.queries,
+        'top_k': args.top_k,
+        'backends': {
+            'numpy': dict(summarize(numpy_latencies), build_seconds=round(numpy_build, 3), recall=1.0),
+        },
+    }
+
+    if not args.skip_chroma:
+        started = time.perf_counter()
+        chroma_backend = build_chroma(corpus)
+        chroma_build = time.perf_counter() - started
+        chroma_latencies, chroma_results = run_queries(chroma_backend, queries, args.top_k)
+        report['backends']['chroma'] = dict(
+            summarize(chroma_latencies),
+            build_seconds=round(chroma_build, 3),
+            recall=round(recall_at_k(chroma_results, oracle), 4)
+        )
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,532 @@
+"""
+Pattern Retrieval Benchmark Suite
+End-to-end PatternRetriever benchmark: builds a pattern corpus in a scratch
+store, replays the "{purpose} {type}" queries CodeGenerator issues while
+generating files, and reports latency, throughput under concurrency,
+memory, and recall@k against an exact-search oracle.
+
+Corpora:
+  synthetic  generated code patterns for every (framework, type) pair the
+             replayed queries search, plus the pipeline's example/snippet types
+  fixture    PatternPipeline's official templates and framework examples,
+             expanded into renamed variants up to the requested size; only
+             queries for pairs the fixtures contain are replayed
+
+A run exits non-zero when any replayed query matches no stored pattern,
+since empty searches would flatter both latency and recall.
+
+Retriever options are passed through the same environment variables the
+settings read (RETRIEVAL_BACKEND, PATTERN_INDEX_STORAGE, RETRIEVAL_HYBRID,
+ENCODER_BACKEND), so a run measures exactly what a worker would use.
+
+Usage (from backend/):
+    python benchmarks/retrieval_suite.py
+    python benchmarks/retrieval_suite.py --corpus fixture --patterns 20000 --backend numpy --storage int8
+    python benchmarks/retrieval_suite.py --concurrency 1 8 32 --output after.json --baseline before.json
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
+
+import numpy as np
+
+from retrieval_backends import BACKEND_DIR, FRAMEWORKS, summarize
+
+ENTITIES = ['User', 'Order', 'Product', 'Invoice', 'Comment', 'Project', 'Task', 'Message',
+            'Payment', 'Category', 'Review', 'Session', 'Team', 'Ticket', 'Report', 'Article']
+FIELDS = ['title', 'email', 'status', 'price', 'quantity', 'created_at', 'owner', 'description',
+          'slug', 'rating', 'due_date', 'total', 'is_active', 'tags']
+
+# (framework, stored pattern type) -> code template
+SYNTHETIC_TEMPLATES = {
+    ('react', 'component'): (
+        "import React, {{ useState }} from 'react';\n\n"
+        "export default function {entity}{view}({{ {field} }}) {{\n"
+        "  const [{other}, set{Other}] = useState(null);\n"
+        "  return (\n    <div className=\"{slug}-{view_slug}\">\n"
+        "      <h2>{entity} {view}</h2>\n      <span>{{{field}}}</span>\n    </div>\n  );\n}}\n"
+    ),
+    ('react', 'example'): (
+        "import {{ useEffect, useState }} from 'react';\n\n"
+        "export function use{entity}s() {{\n  const [{slug}s, set{entity}s] = useState([]);\n"
+        "  useEffect(() => {{\n    fetch('/api/{slug}s?order={field}').then(r => r.json()).then(set{entity}s);\n"
+        "  }}, []);\n  return {slug}s;\n}}\n"
+    ),
+    ('react', 'config'): (
+        "import {{ defineConfig }} from 'vite';\nimport react from '@vitejs/plugin-react';\n\n"
+        "export default defineConfig({{\n  plugins: [react()],\n  server: {{\n"
+        "    proxy: {{ '/api/{slug}s': 'http://localhost:8000' }},\n  }},\n"
+        "  define: {{ __{Other}__: JSON.stringify('{field}') }},\n}});\n"
+    ),
+    ('react', 'test'): (
+        "import {{ render, screen }} from '@testing-library/react';\n"
+        "import {entity}{view} from './{entity}{view}';\n\n"
+        "test('renders the {slug} {field}', () => {{\n"
+        "  render(<{entity}{view} {field}=\"sample\" />);\n"
+        "  expect(screen.getByText('sample')).toBeInTheDocument();\n}});\n"
+    ),
+    ('vue', 'component'): (
+        "<template>\n  <div class=\"{slug}-{view_slug}\">\n    <h2>{entity} {view}</h2>\n"
+        "    <p>{{{{ {field} }}}}</p>\n  </div>\n</template>\n\n"
+        "<script setup>\nimport {{ ref }} from 'vue'\n\ndefineProps({{ {field}: String }})\n"
+        "const {other} = ref(null)\n</script>\n"
+    ),
+    ('vue', 'example'): (
+        "import {{ defineStore }} from 'pinia'\n\n"
+        "export const use{entity}Store = defineStore('{slug}', {{\n  state: () => ({{ {slug}s: [], {field}: null }}),\n"
+        "  actions: {{\n    async load() {{\n      this.{slug}s = await (await fetch('/api/{slug}s')).json()\n"
+        "    }}\n  }}\n}})\n"
+    ),
+    ('vue', 'config'): (
+        "import {{ defineConfig }} from 'vite'\nimport vue from '@vitejs/plugin-vue'\n\n"
+        "export default defineConfig({{\n  plugins: [vue()],\n  server: {{\n"
+        "    proxy: {{ '/api/{slug}s': 'http://localhost:8000' }}\n  }},\n"
+        "  define: {{ __{Other}__: JSON.stringify('{field}') }}\n}})\n"
+    ),
+    ('vue', 'test'): (
+        "import {{ mount }} from '@vue/test-utils'\nimport {entity}{view} from './{entity}{view}.vue'\n\n"
+        "test('renders the {slug} {field}', () => {{\n"
+        "  const wrapper = mount({entity}{view}, {{ props: {{ {field}: 'sample' }} }})\n"
+        "  expect(wrapper.text()).toContain('sample')\n}})\n"
+    ),
+    ('django', 'model'): (
+        "from django.db import models\n\n\nclass {entity}(models.Model):\n"
+        "    {field} = models.CharField(max_length=200)\n    {other} = models.TextField(blank=True)\n"
+        "    created_at = models.DateTimeField(auto_now_add=True)\n\n"
+        "    class Meta:\n        ordering = ['-created_at']\n\n"
+        "    def __str__(self):\n        return self.{field}\n"
+    ),
+    ('django', 'api'): (
+        "from rest_framework import viewsets, permissions\nfrom .models import {entity}\n"
+        "from .serializers import {entity}Serializer\n\n\nclass {entity}ViewSet(viewsets.ModelViewSet):\n"
+        "    queryset = {entity}.objects.order_by('{field}')\n    serializer_class = {entity}Serializer\n"
+        "    permission_classes = [permissions.IsAuthenticated]\n"
+    ),
+    ('django', 'config'): (
+        "import environ\n\nenv = environ.Env(DEBUG=(bool, False))\n\n"
+        "SECRET_KEY = env('SECRET_KEY')\nDEBUG = env('DEBUG')\n"
+        "DATABASES = {{'default': env.db('DATABASE_URL')}}\n\n"
+        "INSTALLED_APPS = [\n    'django.contrib.auth',\n    'rest_framework',\n    '{slug}s',\n]\n\n"
+        "{entity_upper}_{field_upper}_DEFAULT = env('{entity_upper}_{field_upper}_DEFAULT', default='')\n"
+    ),
+    ('django', 'test'): (
+        "from django.test import TestCase\nfrom rest_framework.test import APIClient\n"
+        "from .models import {entity}\n\n\nclass {entity}APITests(TestCase):\n"
+        "    def setUp(self):\n        self.client = APIClient()\n"
+        "        {entity}.objects.create({field}='sample')\n\n"
+        "    def test_list_{slug}s(self):\n        response = self.client.get('/api/{slug}s/')\n"
+        "        self.assertEqual(response.status_code, 200)\n"
+    ),
+    ('nodejs', 'model'): (
+        "const mongoose = require('mongoose');\n\n"
+        "const {slug}Schema = new mongoose.Schema({{\n  {field}: {{ type: String, required: true }},\n"
+        "  {other}: {{ type: String }},\n}}, {{ timestamps: true }});\n\n"
+        "module.exports = mongoose.model('{entity}', {slug}Schema);\n"
+    ),
+    ('nodejs', 'config'): (
+        "require('dotenv').config();\n\nmodule.exports = {{\n  port: process.env.PORT || 3000,\n"
+        "  databaseUrl: process.env.DATABASE_URL,\n  jwtSecret: process.env.JWT_SECRET,\n"
+        "  {slug}{Other}: process.env.{entity_upper}_{field_upper} || '',\n}};\n"
+    ),
+    ('nodejs', 'test'): (
+        "const request = require('supertest');\nconst app = require('../app');\n\n"
+        "describe('GET /api/{slug}s', () => {{\n  it('returns {slug}s sorted by {field}', async () => {{\n"
+        "    const res = await request(app).get('/api/{slug}s');\n    expect(res.statusCode).toBe(200);\n"
+        "  }});\n}});\n"
+    ),
+    ('nodejs', 'api'): (
+        "const express = require('express');\nconst router = express.Router();\n"
+        "const {entity} = require('../models/{slug}');\n\n"
+        "router.get('/', async (req, res, next) => {{\n  try {{\n"
+        "    res.json(await {entity}.find().sort({{ {field}: -1 }}));\n  }} catch (err) {{\n    next(err);\n  }}\n}});\n\n"
+        "module.exports = router;\n"
+    ),
+    ('nodejs', 'snippet'): (
+        "const express = require('express');\n\n"
+        "function require{Other}(req, res, next) {{\n  if (!req.{slug} || !req.{slug}.{field}) {{\n"
+        "    return res.status(403).json({{ error: '{entity} {field} required' }});\n  }}\n  next();\n}}\n\n"
+        "module.exports = require{Other};\n"
+    ),
+}
+
+VIEWS = ['List', 'Detail', 'Form', 'Card', 'Table', 'Editor', 'Summary', 'Modal']
+
+# Purposes like the ones the planner writes into file_structure, by planned type
+PURPOSES = {
+    'component': ['{entity} list page with filtering', '{entity} detail view', 'Form to create or edit a {slug}',
+                  '{entity} card shown in the dashboard', 'Navigation bar with {slug} links'],
+    'api': ['REST endpoints for {slug} CRUD', 'Authentication endpoints for login and signup',
+            '{entity} search endpoint with pagination', 'Webhook handler for {slug} events'],
+    'model': ['{entity} database model', '{entity} model with {field} and timestamps'],
+    'config': ['Application settings and environment config', 'Database connection configuration'],
+    'test': ['Unit tests for the {slug} API', '{entity} model tests'],
+}
+
+# Config and test files that live in the frontend and query its framework
+FRONTEND_PURPOSES = {
+    'config': ['Build and bundler configuration', 'Frontend environment and API base URL config'],
+    'test': ['Component tests for the {entity} form', 'Unit tests for the {slug} store'],
+}
+
+# Which framework serves each planned type (frontend for UI, backend otherwise)
+STACKS = [('react', 'django'), ('vue', 'django'), ('react', 'nodejs'), ('vue', 'nodejs')]
+
+
+def query_pairs() -> set:
+    """Every (framework, type) pair build_queries can search"""
+
+    pairs = set()
+    for frontend, backend in STACKS:
+        pairs.add((frontend, 'component'))
+        pairs.update((backend, file_type) for file_type in PURPOSES if file_type != 'component')
+        pairs.update((frontend, file_type) for file_type in FRONTEND_PURPOSES)
+    return pairs
+
+
+def resident_mb() -> float:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _words(rng: np.random.Generator) -> Dict[str, str]:
+    entity = ENTITIES[int(rng.integers(len(ENTITIES)))]
+    field, other = rng.choice(FIELDS, size=2, replace=False)
+    view = VIEWS[int(rng.integers(len(VIEWS)))]
+    return {
+        'entity': entity,
+        'slug': entity.lower(),
+        'field': str(field),
+        'other': str(other),
+        'Other': ''.join(part.title() for part in str(other).split('_')),
+        'view': view,
+        'view_slug': view.lower(),
+        'entity_upper': entity.upper(),
+        'field_upper': str(field).upper(),
+    }
+
+
+def build_synthetic_corpus(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generated patterns spread across every (framework, type) template"""
+
+    missing = query_pairs() - set(SYNTHETIC_TEMPLATES)
+    if missing:
+        raise ValueError(f'No synthetic template for queried pairs: {sorted(missing)}')
+
+    rng = np.random.default_rng(seed)
+    keys = list(SYNTHETIC_TEMPLATES)
+    patterns = []
+    for i in range(size):
+        framework, pattern_type = keys[i % len(keys)]
+        words = _words(rng)
+        patterns.append({
+            'code': SYNTHETIC_TEMPLATES[(framework, pattern_type)].format(**words),
+            'metadata': {
+                'framework': framework,
+                'type': pattern_type,
+                'name': f"{words['slug']}_{words['view_slug']}_{i}",
+                'source': 'benchmark',
+            }
+        })
+    return patterns
+
+
+def load_fixture_patterns() -> List[Dict[str, Any]]:
+    """PatternPipeline's bundled templates and examples (no network access)"""
+
+    from pipeline.pipeline import PatternPipeline
+
+    # Skip __init__, which opens the production pattern store
+    pipeline = PatternPipeline.__new__(PatternPipeline)
+    pipeline.patterns = []
+    pipeline.load_official_templates()
+    pipeline.load_framework_examples()
+    return pipeline.patterns
+
+
+def build_fixture_corpus(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Fixture patterns, cycled with renamed top-level identifiers"""
+
+    rng = np.random.default_rng(seed)
+    fixtures = load_fixture_patterns()
+    declaration = re.compile(r'\b(class|function|const)\s+([A-Z]\w*)')
+    patterns = []
+    for i in range(size):
+        fixture = fixtures[i % len(fixtures)]
+        code = fixture['code']
+        if i >= len(fixtures):
+            entity = ENTITIES[int(rng.integers(len(ENTITIES)))]
+            code = declaration.sub(lambda m: f'{m.group(1)} {entity}{m.group(2)}', code)
+            code = f"// {entity} variant {i}\n{code}"
+        patterns.append({
+            'code': code,
+            'metadata': dict(fixture['metadata'], name=f"{fixture['metadata'].get('name', 'fixture')}_{i}")
+        })
+    return patterns
+
+
+def build_queries(count: int, top_k: int, seed: int = 1, pairs: set = None) -> List[Dict[str, Any]]:
+    """
+    search_patterns arguments shaped like CodeGenerator._find_patterns
+
+    When `pairs` is given, only (framework, type) pairs in it are drawn, so
+    a corpus that lacks a pattern type is not measured on empty searches.
+    """
+
+    if pairs is not None and not pairs & query_pairs():
+        raise ValueError('Corpus covers none of the (framework, type) pairs queries use')
+
+    rng = np.random.default_rng(seed)
+    planned_types = list(PURPOSES)
+    queries = []
+    while len(queries) < count:
+        frontend, backend = STACKS[int(rng.integers(len(STACKS)))]
+        file_type = planned_types[int(rng.integers(len(planned_types)))]
+        purposes = [(frontend if file_type == 'component' else backend, p) for p in PURPOSES[file_type]]
+        purposes += [(frontend, p) for p in FRONTEND_PURPOSES.get(file_type, [])]
+        framework, purpose = purposes[int(rng.integers(len(purposes)))]
+        if pairs is not None and (framework, file_type) not in pairs:
+            continue
+        queries.append({
+            'query': f'{purpose.format(**_words(rng))} {file_type}',
+            'framework': framework,
+            'pattern_type': file_type,
+            'top_k': top_k,
+        })
+    return queries
+
+
+def exact_oracle(retriever, queries: List[Dict[str, Any]], tie_tolerance: float = 1e-5) -> List[Dict[str, Any]]:
+    """
+    Brute-force squared-L2 search over every stored embedding
+
+    For each query returns the ids whose distance is within the k-th
+    nearest distance (ties included), so equally close patterns returned
+    in a different order still count as hits.
+    """
+
+    ids, _, metadatas, embeddings = retriever._export_collection()
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    vectors = np.asarray(retriever.encode_queries([q['query'] for q in queries]), dtype=np.float32)
+
+    partitions = {}
+    for row, metadata in enumerate(metadatas):
+        partitions.setdefault((metadata.get('framework'), metadata.get('type')), []).append(row)
+
+    oracle = []
+    for query, vector in zip(queries, vectors):
+        rows = np.asarray(partitions.get((query['framework'], query['pattern_type']), []), dtype=np.int64)
+        if not len(rows):
+            oracle.append({'expected': 0, 'ids': set()})
+            continue
+
+        distances = np.sum((matrix[rows] - vector) ** 2, axis=1)
+        k = min(query['top_k'], len(rows))
+        kth = np.partition(distances, k - 1)[k - 1]
+        oracle.append({
+            'expected': k,
+            'ids': {ids[row] for row in rows[distances <= kth + tie_tolerance]},
+        })
+    return oracle
+
+
+def recall(results: List[List[Dict[str, Any]]], oracle: List[Dict[str, Any]]) -> float:
+    scores = [
+        len({pattern['id'] for pattern in patterns} & truth['ids']) / truth['expected']
+        for patterns, truth in zip(results, oracle) if truth['expected']
+    ]
+    return float(np.mean(scores)) if scores else 1.0
+
+
+def reset_caches(retriever) -> None:
+    """Drop cached query embeddings and results so the next pass runs cold"""
+
+    retriever.query_cache.local.clear()
+    retriever.result_cache.local.clear()
+
+
+def run_sequential(retriever, queries: List[Dict[str, Any]]):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(retriever.search_patterns(**query))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, results
+
+
+def run_concurrent(retriever, queries: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    def timed(query):
+        started = time.perf_counter()
+        retriever.search_patterns(**query)
+        return (time.perf_counter() - started) * 1000
+
+    reset_caches(retriever)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        latencies = list(executor.map(timed, queries))
+        wall = time.perf_counter() - started
+
+    return dict(summarize(latencies), qps=round(len(queries) / wall, 1))
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change of the headline numbers against an earlier report"""
+
+    def change(new, old):
+        return round((new - old) / old, 4) if old else None
+
+    delta = {
+        'baseline_revision': baseline.get('revision'),
+        'cold_p50_ms': change(report['cold']['p50_ms'], baseline['cold']['p50_ms']),
+        'cold_p95_ms': change(report['cold']['p95_ms'], baseline['cold']['p95_ms']),
+        'recall': round(report['recall'] - baseline['recall'], 4),
+        'qps': {},
+    }
+    for workers, result in report['concurrency'].items():
+        if workers in baseline.get('concurrency', {}):
+            delta['qps'][workers] = change(result['qps'], baseline['concurrency'][workers]['qps'])
+    return delta
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', choices=['synthetic', 'fixture'], default='synthetic')
+    parser.add_argument('--patterns', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--top-k', type=int, default=3, help='CodeGenerator asks for 3 patterns per file')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--backend', choices=['chroma', 'numpy'])
+    parser.add_argument('--storage', choices=['float32', 'float16', 'int8'])
+    parser.add_argument('--hybrid', choices=['on', 'off'])
+    parser.add_argument('--encoder-backend', choices=['torch', 'torch-int8', 'onnx', 'onnx-int8'])
+    parser.add_argument('--settings', default='webforge.settings.development')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch pattern store')
+    parser.add_argument('--baseline', help='Earlier report to compare against')
+    parser.add_argument('--output', default='retrieval_suite.json', help='Where to write the JSON report')
+    args = parser.parse_args()
+
+    overrides = {
+        'RETRIEVAL_BACKEND': args.backend,
+        'PATTERN_INDEX_STORAGE': args.storage,
+        'RETRIEVAL_HYBRID': {'on': 'True', 'off': 'False'}.get(args.hybrid),
+        'ENCODER_BACKEND': args.encoder_backend,
+        # Keep every cache tier in-process so each pass can be reset
+        'QUERY_EMBEDDING_CACHE_SHARED': 'False',
+        'PATTERN_RESULT_CACHE_SHARED': 'False',
+    }
+    os.environ.update({name: value for name, value in overrides.items() if value is not None})
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', args.settings)
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from ai_engine.pattern_retriever import PatternRetriever
+
+    builders = {'synthetic': build_synthetic_corpus, 'fixture': build_fixture_corpus}
+    patterns = builders[args.corpus](args.patterns, seed=args.seed)
+    stored_pairs = {(p['metadata'].get('framework'), p['metadata'].get('type')) for p in patterns}
+    uncovered = sorted(query_pairs() - stored_pairs)
+    if uncovered:
+        print(f"Corpus has no patterns for {uncovered}; replaying only covered pairs", file=sys.stderr)
+    queries = build_queries(args.queries, args.top_k, seed=args.seed + 1, pairs=stored_pairs)
+
+    store = tempfile.mkdtemp(prefix='retrieval_suite_')
+    try:
+        baseline_mb = resident_mb()
+        started = time.perf_counter()
+        retriever = PatternRetriever(persist_directory=store)
+        retriever.batch_add_patterns(patterns)
+        build_seconds = time.perf_counter() - started
+        loaded_mb = resident_mb()
+
+        reset_caches(retriever)
+        cold_latencies, results = run_sequential(retriever, queries)
+        warm_latencies, _ = run_sequential(retriever, queries)
+
+        reset_caches(retriever)
+        started = time.perf_counter()
+        retriever.search_patterns_bulk(queries)
+        bulk_seconds = time.perf_counter() - started
+
+        concurrency = {str(workers): run_concurrent(retriever, queries, workers) for workers in args.concurrency}
+        oracle = exact_oracle(retriever, queries)
+
+        memory = {
+            'process_rss_mb': round(resident_mb(), 1),
+            'retriever_rss_mb': round(loaded_mb - baseline_mb, 1),
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+        if hasattr(retriever.backend, 'memory_usage'):
+            memory['backend'] = retriever.backend.memory_usage()
+
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'revision': git_revision(),
+            'corpus': args.corpus,
+            'patterns': len(patterns),
+            'frameworks': FRAMEWORKS,
+            'queries': len(queries),
+            'empty_queries': sum(1 for truth in oracle if not truth['expected']),
+            'uncovered_pairs': uncovered,
+            'top_k': args.top_k,
+            'retriever': {
+                'backend': retriever.backend.name,
+                'storage': getattr(settings, 'PATTERN_INDEX_STORAGE', 'float32'),
+                'hybrid': retriever.hybrid,
+                'encoder': retriever.encoder_name,
+                'encoder_backend': getattr(settings, 'ENCODER_BACKEND', 'torch'),
+            },
+            'build_seconds': round(build_seconds, 3),
+            'ingest': retriever.last_ingest_stats,
+            'cold': summarize(cold_latencies),
+            'warm': summarize(warm_latencies),
+            'bulk': {'seconds': round(bulk_seconds, 3), 'qps': round(len(queries) / bulk_seconds, 1)},
+            'concurrency': concurrency,
+            'recall': round(recall(results, oracle), 4),
+            'oracle': 'exact squared-L2 search over the stored embeddings',
+            'memory': memory,
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(store, ignore_errors=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['delta'] = compare(report, json.load(f))
+
+    print(json.dumps(report, indent=2, default=str))
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+    # Empty searches are trivially fast and perfectly recalled; never report them as a result
+    if report['empty_queries']:
+        print(f"{report['empty_queries']} queries matched no stored pattern", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Near-Duplicate Detection
+MinHash signatures with LSH banding to drop near-identical patterns before embedding
+"""
+
+import re
+import zlib
+from typing import Dict, List, Any, Iterable, Iterator, Callable
+import numpy as np
+
+TOKEN = re.compile(r'\w+|[^\w\s]')
+
+# Mersenne prime for the universal hash family; keeps a * h + b inside uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that a pair with Jaccard `similarity` shares at least one LSH bucket"""
+
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def choose_bands(num_perm: int, threshold: float, min_recall: float = 0.99) -> int:
+    """
+    Fewest LSH bands that make a pair at `threshold` a candidate with
+    probability `min_recall`
+
+    The S-curve midpoint then sits well below the threshold. The extra
+    candidates are cheap, since each is checked against its estimated
+    Jaccard similarity before a pattern is dropped.
+    """
+
+    candidates = [bands for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    for bands in candidates:
+        if candidate_probability(threshold, bands, num_perm // bands) >= min_recall:
+            return bands
+    return candidates[-1]
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate filter over code token shingles
+
+    Each pattern gets a MinHash signature over its `shingle_size`-token
+    shingles (whitespace is ignored, so reformatted copies still match).
+    Signatures are bucketed by LSH bands; a new pattern is compared only
+    with earlier patterns sharing a bucket, and is dropped when its
+    estimated Jaccard similarity to one of them reaches `threshold`. The
+    first occurrence always wins.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands = choose_bands(num_perm, threshold)
+        self.rows = num_perm // self.bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = []
+
+        self.seen = 0
+        self.dropped = 0
+
+    def signature(self, text: str) -> np.ndarray:
+        tokens = TOKEN.findall(text)
+        if len(tokens) > self.shingle_size:
+            shingles = {' '.join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+        else:
+            shingles = {' '.join(tokens)}
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % MERSENNE_PRIME for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+    def is_duplicate(self, text: str) -> bool:
+        """Check `text` against everything seen so far, remembering it if new"""
+
+        self.seen += 1
+        signature = self.signature(text)
+        keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+        candidates = set()
+        for band, key in enumerate(keys):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        for candidate in candidates:
+            if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                self.dropped += 1
+                return True
+
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(position)
+        return False
+
+    def filter(self, patterns: Iterable[Dict[str, Any]],
+               key: Callable[[Dict[str, Any]], str] = lambda pattern: pattern['code']) -> Iterator[Dict[str, Any]]:
+        """Yield only patterns that are not near-duplicates of earlier ones"""
+
+        for pattern in patterns:
+            if not self.is_duplicate(key(pattern)):
+                yield pattern
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'seen': self.seen,
+            'kept': self.seen - self.dropped,
+            'dropped': self.dropped,
+            'threshold': self.threshold,
+            'bands': self.bands,
+            'rows': self.rows,
+        }
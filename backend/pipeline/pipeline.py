@@ -5,24 +5,58 @@ Scrapes, validates, and indexes code patterns for retrieval
 
 import os
 import json
-from typing import List, Dict, Any
+from itertools import chain
+from typing import List, Dict, Any, Iterator
 from datasets import load_dataset
+from django.conf import settings
 from ai_engine.pattern_retriever import PatternRetriever
+from pipeline.dedup import NearDuplicateFilter
+from pipeline.progress import IngestProgress
 import requests
 from bs4 import BeautifulSoup
 import re
 
+# Instruction-style code datasets: which row fields hold the code and its description
+HUGGINGFACE_DATASETS = {
+    'HuggingFaceH4/CodeAlpaca_20K': {
+        'split': 'train', 'code': 'output', 'description': 'instruction',
+        'name': 'alpaca_pattern', 'source': 'CodeAlpaca'
+    },
+    'iamtarun/python_code_instructions_18k_alpaca': {
+        'split': 'train', 'code': 'output', 'description': 'instruction',
+        'name': 'python_instruction_pattern', 'source': 'python_code_instructions_18k'
+    },
+    'TokenBender/code_instructions_122k_alpaca_style': {
+        'split': 'train', 'code': 'output', 'description': 'instruction',
+        'name': 'code_instruction_pattern', 'source': 'code_instructions_122k'
+    },
+}
+
 class PatternPipeline:
     """
     Pipeline for collecting and processing code patterns
     """
     
-    def __init__(self):
+    def __init__(self, dedup_threshold: float = None):
         self.retriever = PatternRetriever()
         self.patterns = []
+        self.dedup_threshold = dedup_threshold if dedup_threshold is not None \
+            else getattr(settings, 'PATTERN_DEDUP_THRESHOLD', 0.85)
+        self.dedup_stats = {}
+        self.ingest_stats = {}
     
-    def initialize_database(self):
-        """Initialize pattern database with curated patterns"""
+    def initialize_database(self, streaming: bool = None):
+        """
+        Initialize pattern database with curated patterns
+        
+        With `streaming` (default: PATTERN_STREAMING_INGEST) the full
+        HuggingFace datasets are ingested through `stream_database` instead
+        of the in-memory CodeAlpaca sample.
+        """
+        
+        streaming = streaming if streaming is not None else getattr(settings, 'PATTERN_STREAMING_INGEST', False)
+        if streaming:
+            return self.stream_database()
         
         print("Initializing pattern database...")
         
@@ -32,11 +66,93 @@ class PatternPipeline:
         
         print(f"Total patterns collected: {len(self.patterns)}")
         
+        self.patterns = self.deduplicate(self.patterns)
+        
         print("Adding patterns to ChromaDB...")
         self.retriever.batch_add_patterns(self.patterns)
         
+        self._finish_ingest()
+    
+    def stream_database(self, datasets: List[str] = None, limit: int = None):
+        """
+        Initialize the pattern database in bounded memory
+        
+        Dataset rows are streamed and pass one at a time through the
+        filter, framework detection and near-duplicate check; the retriever
+        pulls them in chunks of PATTERN_INSERT_CHUNK_SIZE, embeds each chunk
+        in batches and inserts it before reading more. Nothing but the
+        current chunk (plus the dedup signatures) is held in memory.
+        """
+        
+        print("Initializing pattern database (streaming)...")
+        
+        progress = IngestProgress()
+        
+        # Curated patterns go first so they win over dataset copies in dedup
+        self.patterns = []
+        self.load_official_templates()
+        self.load_framework_examples()
+        curated, self.patterns = self.patterns, []
+        
+        patterns = chain(curated, self.stream_huggingface_patterns(datasets, limit, progress))
+        
+        dedup = None
+        if self.dedup_threshold:
+            dedup = NearDuplicateFilter(threshold=self.dedup_threshold)
+            progress.deduplicator = dedup
+            patterns = dedup.filter(patterns)
+        
+        self.retriever.batch_add_patterns(patterns, progress=progress.indexed_chunk)
+        progress.finish_line()
+        
+        if dedup is not None:
+            self.dedup_stats = dedup.get_statistics()
+            print(f"Dropped {dedup.dropped} near-duplicate patterns "
+                  f"(similarity >= {self.dedup_threshold})")
+        
+        self.ingest_stats = progress.get_statistics()
+        print(f"Scanned {self.ingest_stats['rows_scanned']} dataset rows, "
+              f"{self.ingest_stats['matched']} matched a framework")
+        
+        self._finish_ingest()
+    
+    def _finish_ingest(self):
+        """Report ingest throughput and snapshot the index"""
+        
+        ingest = self.retriever.last_ingest_stats
+        print(
+            f"Embedded {ingest['patterns']} patterns in {ingest['seconds']:.1f}s "
+            f"({ingest['patterns_per_second']:.1f} patterns/sec; "
+            f"encode {ingest['encode_seconds']:.1f}s, insert {ingest['insert_seconds']:.1f}s)"
+        )
+        if ingest.get('skipped'):
+            print(f"Skipped {ingest['skipped']} patterns already in the store")
+        
+        print("Writing pattern index snapshot...")
+        self.retriever.save_index()
+        
         print("Pattern database initialized successfully!")
     
+    def deduplicate(self, patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop near-duplicate patterns before they are embedded
+        
+        Earlier patterns win, so official templates (loaded first) are kept
+        over dataset copies of the same code.
+        """
+        
+        if not self.dedup_threshold:
+            return patterns
+        
+        dedup = NearDuplicateFilter(threshold=self.dedup_threshold)
+        kept = list(dedup.filter(patterns))
+        self.dedup_stats = dedup.get_statistics()
+        
+        print(f"Dropped {dedup.dropped} near-duplicate patterns "
+              f"(similarity >= {self.dedup_threshold}), {len(kept)} remaining")
+        
+        return kept
+    
     def load_official_templates(self):
         """Load official framework templates"""
         
@@ -115,27 +231,93 @@ class PatternPipeline:
             # Load CodeAlpaca for instruction understanding
             print("Loading CodeAlpaca dataset...")
             alpaca = load_dataset("HuggingFaceH4/CodeAlpaca_20K", split="train[:100]")
+            spec = HUGGINGFACE_DATASETS['HuggingFaceH4/CodeAlpaca_20K']
             
             for item in alpaca:
-                if 'output' in item and len(item['output']) > 50:
-                    framework = self._detect_framework(item['output'])
-                    if framework:
-                        self.patterns.append({
-                            'code': item['output'],
-                            'metadata': {
-                                'framework': framework,
-                                'type': 'snippet',
-                                'name': 'alpaca_pattern',
-                                'description': item.get('instruction', '')[:200],
-                                'source': 'CodeAlpaca'
-                            }
-                        })
+                pattern = self._pattern_from_row(item, spec)
+                if pattern:
+                    self.patterns.append(pattern)
             
             print(f"Loaded patterns from CodeAlpaca")
             
         except Exception as e:
             print(f"Error loading HuggingFace datasets: {str(e)}")
     
+    def stream_huggingface_patterns(self, datasets: List[str] = None, limit: int = None,
+                                    progress: IngestProgress = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield patterns from HuggingFace datasets without downloading them whole
+        
+        Args:
+            datasets: Dataset paths (default: PATTERN_HF_DATASETS); paths not in
+                HUGGINGFACE_DATASETS are read as Alpaca-style instruction/output rows
+            limit: Rows to read per dataset, 0 for all (default: PATTERN_HF_ROW_LIMIT)
+            progress: Readout to count scanned and matched rows on
+        """
+        
+        datasets = datasets or getattr(settings, 'PATTERN_HF_DATASETS', ['HuggingFaceH4/CodeAlpaca_20K'])
+        limit = limit if limit is not None else getattr(settings, 'PATTERN_HF_ROW_LIMIT', 0)
+        
+        for path in datasets:
+            spec = HUGGINGFACE_DATASETS.get(path, {
+                'split': 'train', 'code': 'output', 'description': 'instruction',
+                'name': 'dataset_pattern', 'source': path
+            })
+            
+            try:
+                rows = load_dataset(path, split=spec['split'], streaming=True)
+                if limit:
+                    rows = rows.take(limit)
+                
+                if progress is not None:
+                    progress.start_dataset(path, self._dataset_size(rows, spec['split'], limit))
+                
+                for item in rows:
+                    pattern = self._pattern_from_row(item, spec)
+                    if progress is not None:
+                        progress.row(pattern is not None)
+                    if pattern is not None:
+                        yield pattern
+                
+            except Exception as e:
+                if progress is not None:
+                    progress.finish_line()
+                print(f"Error streaming {path}: {str(e)}")
+    
+    def _pattern_from_row(self, item: Dict[str, Any], spec: Dict[str, str]) -> Dict[str, Any]:
+        """Turn a dataset row into a snippet pattern, or None if it is not usable"""
+        
+        code = item.get(spec['code']) or ''
+        if len(code) <= 50:
+            return None
+        
+        framework = self._detect_framework(code)
+        if not framework:
+            return None
+        
+        return {
+            'code': code,
+            'metadata': {
+                'framework': framework,
+                'type': 'snippet',
+                'name': spec['name'],
+                'description': (item.get(spec['description']) or '')[:200],
+                'source': spec['source']
+            }
+        }
+    
+    def _dataset_size(self, rows, split: str, limit: int = 0) -> int:
+        """Row count from the dataset card, when it publishes one"""
+        
+        try:
+            total = rows.info.splits[split].num_examples
+        except (AttributeError, KeyError, TypeError):
+            total = None
+        
+        if limit:
+            return min(total, limit) if total else limit
+        return total
+    
     def load_framework_examples(self):
         """Load examples from framework documentation"""
         
@@ -0,0 +1,109 @@
+"""
+Ingestion Progress
+Live throughput and progress readout for streaming pattern ingestion
+"""
+
+import sys
+import time
+from typing import Dict, Any
+
+
+class IngestProgress:
+    """
+    Counters for one ingestion run, redrawn at most every `interval` seconds
+
+    On a terminal the readout is rewritten in place; otherwise (Celery logs,
+    redirected output) one line is printed per interval.
+    """
+
+    def __init__(self, interval: float = 0.5, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.started = time.monotonic()
+        self._last_render = 0.0
+        self._width = 0
+
+        self.dataset = None
+        self.dataset_started = self.started
+        self.total = None
+        self.scanned = 0
+        self.rows_scanned = 0
+        self.matched = 0
+        self.deduplicator = None
+        self.indexed = 0
+
+    def start_dataset(self, name: str, total: int = None) -> None:
+        self.finish_line()
+        print(f"Streaming {name}" + (f" ({total} rows)" if total else ""), file=self.stream)
+        self.dataset = name
+        self.dataset_started = time.monotonic()
+        self.total = total
+        self.scanned = 0
+
+    def row(self, matched: bool) -> None:
+        """Count one dataset row read from the stream"""
+
+        self.scanned += 1
+        self.rows_scanned += 1
+        self.matched += int(matched)
+        self.refresh()
+
+    def indexed_chunk(self, stats: Dict[str, Any]) -> None:
+        """`batch_add_patterns` progress callback"""
+
+        self.indexed = stats['patterns']
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_render < self.interval:
+            return
+        self._last_render = now
+        self._render(self.format_line(now))
+
+    def format_line(self, now: float) -> str:
+        elapsed = max(now - self.started, 1e-9)
+        parts = []
+
+        if self.total:
+            parts.append(f"{self.scanned}/{self.total} rows ({self.scanned / self.total:.0%})")
+        else:
+            parts.append(f"{self.scanned} rows")
+
+        parts.append(f"{self.matched} matched")
+        if self.deduplicator is not None:
+            parts.append(f"{self.deduplicator.dropped} duplicates")
+        parts.append(f"{self.indexed} indexed")
+        parts.append(f"{self.indexed / elapsed:.1f} patterns/sec")
+
+        if self.total and self.scanned:
+            rate = self.scanned / max(now - self.dataset_started, 1e-9)
+            parts.append(f"eta {max(self.total - self.scanned, 0) / rate:.0f}s")
+
+        return f"{self.dataset or 'patterns'}: " + ' | '.join(parts)
+
+    def _render(self, line: str) -> None:
+        if self.stream.isatty():
+            self.stream.write('\r' + line.ljust(self._width))
+            self._width = len(line)
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def finish_line(self) -> None:
+        """End an in-place readout so the next print starts on a new line"""
+
+        if self._width:
+            self.stream.write('\n')
+            self.stream.flush()
+            self._width = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        seconds = time.monotonic() - self.started
+        return {
+            'rows_scanned': self.rows_scanned,
+            'matched': self.matched,
+            'indexed': self.indexed,
+            'seconds': seconds,
+            'patterns_per_second': self.indexed / seconds if seconds else 0.0,
+        }
@@ -0,0 +1,69 @@
+"""
+Near-duplicate filter: pairs just above the threshold must become LSH
+candidates, and most of them must be dropped
+"""
+
+import random
+
+from pipeline.dedup import NearDuplicateFilter, TOKEN, candidate_probability
+
+
+def shingles(text, size=3):
+    tokens = TOKEN.findall(text)
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def near_duplicate_pairs(count, low, high, seed=0):
+    """Random code-like texts and edited copies with Jaccard in [low, high]"""
+
+    rng = random.Random(seed)
+    vocabulary = [f'name_{i}' for i in range(5000)]
+    pairs = []
+    while len(pairs) < count:
+        tokens = [rng.choice(vocabulary) for _ in range(300)]
+        edited = list(tokens)
+        for _ in range(rng.randint(1, 6)):
+            edited[rng.randrange(len(edited))] = rng.choice(vocabulary)
+        original, copy = ' '.join(tokens), ' '.join(edited)
+        if low <= jaccard(original, copy) <= high:
+            pairs.append((original, copy))
+    return pairs
+
+
+def test_default_banding_keeps_pairs_at_the_threshold():
+    dedup = NearDuplicateFilter(threshold=0.85, num_perm=64)
+
+    assert candidate_probability(0.85, dedup.bands, dedup.rows) >= 0.99
+
+
+def test_pairs_just_above_the_threshold_are_candidates_and_dropped():
+    pairs = near_duplicate_pairs(200, 0.86, 0.95)
+    candidates = dropped = 0
+
+    for seed, (original, copy) in enumerate(pairs):
+        dedup = NearDuplicateFilter(threshold=0.85, num_perm=64, seed=seed)
+        dedup.is_duplicate(original)
+
+        signature = dedup.signature(copy)
+        candidates += any(
+            signature[band * dedup.rows:(band + 1) * dedup.rows].tobytes() in dedup._buckets[band]
+            for band in range(dedup.bands)
+        )
+        dropped += dedup.is_duplicate(copy)
+
+    assert candidates / len(pairs) >= 0.99
+    # The rest is MinHash estimation noise in the final Jaccard check
+    assert dropped / len(pairs) >= 0.85
+
+
+def test_unrelated_patterns_are_kept():
+    rng = random.Random(1)
+    dedup = NearDuplicateFilter()
+    texts = [' '.join(f'name_{rng.randrange(5000)}' for _ in range(200)) for _ in range(50)]
+
+    assert not any(dedup.is_duplicate(text) for text in texts)
@@ -0,0 +1,45 @@
+"""
+FileScheduler: dependency waves, with cycles released as early as possible
+"""
+
+from ai_engine.file_scheduler import FileScheduler
+
+
+def spec(path, *dependencies):
+    return {'path': path, 'dependencies': list(dependencies)}
+
+
+def test_independent_files_share_the_first_wave():
+    scheduler = FileScheduler([spec('a.py'), spec('b.py'), spec('c.py', 'a.py')])
+
+    assert scheduler.waves == [['a.py', 'b.py'], ['c.py']]
+    assert scheduler.broken_cycles == []
+
+
+def test_two_file_cycle_without_other_dependencies_lands_in_wave_zero():
+    scheduler = FileScheduler([
+        spec('config.py'),
+        spec('models.py', 'config.py'),
+        spec('views.py', 'models.py'),
+        spec('urls.py', 'views.py'),
+        spec('a.py', 'b.py'),
+        spec('b.py', 'a.py'),
+    ])
+
+    wave = next(i for i, files in enumerate(scheduler.waves) if 'a.py' in files)
+    assert wave <= 1
+    assert 'b.py' in scheduler.waves[wave]
+    assert scheduler.critical_path_length == 4
+    assert sorted(path for path, _ in scheduler.broken_cycles) == ['a.py', 'b.py']
+
+
+def test_cycle_waits_only_for_its_outside_dependencies():
+    scheduler = FileScheduler([
+        spec('base.py'),
+        spec('a.py', 'b.py', 'base.py'),
+        spec('b.py', 'c.py'),
+        spec('c.py', 'a.py'),
+        spec('app.py', 'a.py'),
+    ])
+
+    assert scheduler.waves == [['base.py'], ['a.py', 'b.py', 'c.py'], ['app.py']]
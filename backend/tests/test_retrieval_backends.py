@@ -0,0 +1,64 @@
+"""
+NumpyBackend: reads running alongside writes only ever see one consistent
+version of the rows
+"""
+
+import threading
+
+import numpy as np
+
+from ai_engine.retrieval_backends import NumpyBackend
+
+FRAMEWORKS = ['react', 'vue', 'django']
+TYPES = ['component', 'api', 'model']
+
+
+def patterns(start, count, dimension=16, seed=0):
+    rng = np.random.default_rng(seed + start)
+    ids = [f'pattern_{i}' for i in range(start, start + count)]
+    metadatas = [{'framework': FRAMEWORKS[i % 3], 'type': TYPES[(i // 3) % 3]} for i in range(start, start + count)]
+    documents = [f"{metadata['framework']}/{metadata['type']}" for metadata in metadatas]
+    return ids, rng.normal(size=(count, dimension)).astype(np.float32), documents, metadatas
+
+
+def test_queries_during_writes_stay_within_their_partition():
+    ids, embeddings, documents, metadatas = patterns(0, 600)
+    backend = NumpyBackend(ids, embeddings, metadatas, documents=documents, storage='int8')
+    queries = np.random.default_rng(1).normal(size=(4, 16)).astype(np.float32)
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            for framework in FRAMEWORKS:
+                for pattern_type in TYPES:
+                    for hits in backend.query(queries, framework, pattern_type, top_k=5):
+                        for hit in hits:
+                            expected = f'{framework}/{pattern_type}'
+                            if hit['metadata'] != {'framework': framework, 'type': pattern_type} or hit['code'] != expected:
+                                errors.append((expected, hit['id'], hit['code']))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for step in range(40):
+            backend.add(*patterns(600 + step * 50, 50))
+            backend.delete([f'pattern_{i}' for i in range(step * 10, step * 10 + 10)])
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert not errors
+    assert backend.count() == 600 + 40 * 50 - 400
+
+
+def test_add_ignores_known_ids():
+    ids, embeddings, documents, metadatas = patterns(0, 10)
+    backend = NumpyBackend(ids, embeddings, metadatas, documents=documents)
+
+    backend.add(ids[:5], embeddings[:5], documents[:5], metadatas[:5])
+
+    assert backend.count() == 10
+    assert [hit['id'] for hit in backend.fetch(['pattern_3'], embeddings[3])] == ['pattern_3']
@@ -0,0 +1,75 @@
+"""
+SpecSlicer: config files keep deployment details, API clients keep every endpoint
+"""
+
+from ai_engine.spec_slicer import SpecSlicer
+
+
+SPECS = {
+    'project_name': 'Shop',
+    'description': 'A small online shop',
+    'architecture': {
+        'frontend': {'framework': 'vue', 'key_libraries': ['axios'], 'components': [
+            {'name': 'ProductList'},
+        ]},
+        'backend': {'framework': 'django', 'key_libraries': ['djangorestframework'], 'api_endpoints': [
+            {'method': 'GET', 'path': '/api/products', 'purpose': 'List products'},
+            {'method': 'POST', 'path': '/api/orders', 'purpose': 'Place an order'},
+            {'method': 'POST', 'path': '/api/auth/login', 'purpose': 'Log in'},
+        ], 'models': [
+            {'name': 'Product', 'fields': [{'name': 'title', 'type': 'string'}]},
+        ]},
+        'database': {'type': 'postgresql', 'tables': [
+            {'name': 'products', 'columns': [{'name': 'title', 'type': 'varchar'}]},
+        ]},
+    },
+    'deployment_requirements': {
+        'environment_variables': ['DATABASE_URL', 'SECRET_KEY', 'STRIPE_API_KEY'],
+        'services': ['postgresql', 'redis'],
+        'build_steps': ['pip install -r requirements.txt'],
+    },
+}
+
+
+def test_config_files_keep_deployment_and_database_sections():
+    slicer = SpecSlicer()
+
+    for path, file_type in [
+        ('backend/shop/settings.py', 'other'),
+        ('.env.example', 'other'),
+        ('docker-compose.yml', 'config'),
+    ]:
+        sliced = slicer.slice({'path': path, 'type': file_type, 'purpose': 'Project setup'}, SPECS)
+
+        assert sliced['deployment_requirements'] == SPECS['deployment_requirements']
+        assert sliced['database'] == SPECS['architecture']['database']
+
+
+def test_ordinary_files_do_not_get_deployment_sections():
+    sliced = SpecSlicer().slice(
+        {'path': 'backend/shop/models.py', 'type': 'model', 'purpose': 'Product model'}, SPECS
+    )
+
+    assert 'deployment_requirements' not in sliced
+    assert 'database' not in sliced
+
+
+def test_api_client_gets_every_endpoint():
+    all_endpoints = SPECS['architecture']['backend']['api_endpoints']
+
+    for path in ['frontend/src/services/api.js', 'frontend/src/api/client.js']:
+        sliced = SpecSlicer().slice(
+            {'path': path, 'type': 'other', 'purpose': 'Axios client for the backend'}, SPECS
+        )
+
+        assert sliced['api_endpoints'] == all_endpoints
+
+
+def test_components_still_get_only_matching_endpoints():
+    sliced = SpecSlicer().slice(
+        {'path': 'frontend/src/components/ProductList.vue', 'type': 'component',
+         'purpose': 'Shows products'},
+        SPECS
+    )
+
+    assert [ep['path'] for ep in sliced['api_endpoints']] == ['/api/products']
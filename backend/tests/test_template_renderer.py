@@ -0,0 +1,151 @@
+"""
+Template fast path: only spec-derived templates are rendered, and the
+rendered file reflects the spec model it is for
+"""
+
+from ai_engine.template_renderer import TemplateRenderer
+
+# Copies of the curated templates loaded by PatternPipeline.load_official_templates
+DJANGO_MODEL = """from django.db import models
+from django.contrib.auth.models import User
+import uuid
+
+class BaseModel(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+
+class ModelName(BaseModel):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    is_active = models.BooleanField(default=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return self.title"""
+
+DRF_VIEW = """from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from .models import ModelName
+from .serializers import ModelSerializer
+
+class ModelViewSet(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        queryset = ModelName.objects.filter(user=request.user)
+        serializer = ModelSerializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    def post(self, request):
+        serializer = ModelSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(user=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)"""
+
+SPECS = {
+    'architecture': {
+        'backend': {
+            'models': [
+                {'name': 'Task', 'fields': [
+                    {'name': 'user', 'type': 'foreignkey'},
+                    {'name': 'name', 'type': 'string'},
+                    {'name': 'due_date', 'type': 'date'},
+                    {'name': 'done', 'type': 'boolean'},
+                ]},
+                {'name': 'Tag', 'fields': [{'name': 'label', 'type': 'string'}]},
+            ]
+        }
+    },
+    'file_structure': [
+        {'path': 'backend/tasks/models.py', 'purpose': 'Task model', 'type': 'model'},
+        {'path': 'backend/tasks/serializers.py', 'purpose': 'Task serializers', 'type': 'api'},
+        {'path': 'backend/tasks/views.py', 'purpose': 'Task list and create API', 'type': 'api'},
+        {'path': 'backend/tags/models.py', 'purpose': 'Tag model', 'type': 'model'},
+        {'path': 'backend/tags/views.py', 'purpose': 'Tag API', 'type': 'api'},
+    ],
+}
+
+
+def pattern(framework, name, code, pattern_type='component', distance=0.1):
+    return {'code': code, 'distance': distance,
+            'metadata': {'framework': framework, 'type': pattern_type, 'name': name}}
+
+
+def file_spec(path):
+    return next(spec for spec in SPECS['file_structure'] if spec['path'] == path)
+
+
+def test_example_body_templates_are_never_selected():
+    renderer = TemplateRenderer(templatable_types=['component', 'model', 'api'])
+    component = {'path': 'frontend/src/components/TaskCard.jsx', 'purpose': 'Card showing one task', 'type': 'component'}
+    route = {'path': 'backend/routes/tasks.js', 'purpose': 'Task routes', 'type': 'api'}
+
+    for framework, name in [('react', 'form_component'), ('react', 'functional_component'), ('vue', 'composition_api')]:
+        assert renderer.select_pattern(component, [pattern(framework, name, '')]) is None
+    assert renderer.select_pattern(route, [pattern('nodejs', 'express_route', '', 'api')]) is None
+
+
+def test_django_model_is_built_from_the_spec_fields():
+    renderer = TemplateRenderer()
+    spec = file_spec('backend/tasks/models.py')
+    template = renderer.select_pattern(spec, [pattern('django', 'base_model', DJANGO_MODEL, 'model')])
+
+    code = renderer.render(template, spec, SPECS)
+
+    assert 'class Task(BaseModel):' in code
+    assert 'name = models.CharField(max_length=255)' in code
+    assert 'due_date = models.DateField()' in code
+    assert 'done = models.BooleanField(default=False)' in code
+    assert 'title' not in code and 'description' not in code and 'is_active' not in code
+    assert 'return str(self.name)' in code
+
+
+def test_django_model_without_owner_drops_the_user_index():
+    renderer = TemplateRenderer()
+    spec = file_spec('backend/tags/models.py')
+
+    code = renderer.render(pattern('django', 'base_model', DJANGO_MODEL, 'model'), spec, SPECS)
+
+    assert 'class Tag(BaseModel):' in code
+    assert 'label = models.CharField(max_length=255)' in code
+    assert 'user' not in code and 'User' not in code
+
+
+def test_drf_view_is_built_for_the_named_model():
+    renderer = TemplateRenderer()
+    spec = file_spec('backend/tasks/views.py')
+
+    code = renderer.render(pattern('django', 'rest_api_view', DRF_VIEW, 'api'), spec, SPECS)
+
+    assert 'from .models import Task' in code
+    assert 'from .serializers import TaskSerializer' in code
+    assert 'class TaskView(APIView):' in code
+    assert 'Task.objects.filter(user=request.user)' in code
+
+
+def test_files_the_spec_does_not_determine_go_to_the_llm():
+    renderer = TemplateRenderer()
+    view = pattern('django', 'rest_api_view', DRF_VIEW, 'api')
+    model = pattern('django', 'base_model', DJANGO_MODEL, 'model')
+
+    # No spec model named, or several
+    assert renderer.render(model, {'path': 'backend/core/models.py', 'purpose': 'Database models', 'type': 'model'}, SPECS) is None
+    assert renderer.render(model, {'path': 'backend/core/models.py', 'purpose': 'Task and Tag models', 'type': 'model'}, SPECS) is None
+    # Per-user view for a model without an owner
+    assert renderer.render(view, file_spec('backend/tags/views.py'), SPECS) is None
+    # Imports a serializers module the project does not plan
+    specs = dict(SPECS, file_structure=[s for s in SPECS['file_structure'] if 'serializers' not in s['path']])
+    assert renderer.render(view, file_spec('backend/tasks/views.py'), specs) is None
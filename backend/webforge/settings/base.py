@@ -141,6 +141,79 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
 GEMINI_API_KEY = env('GEMINI_API_KEY', default='')
+
+# Preload shared AI models in every Celery worker process
+AI_ENGINE_WARM_UP = env.bool('AI_ENGINE_WARM_UP', default=True)
+# Worker readiness probe (/health/workers/): staff users, or clients in these
+# networks (e.g. the cluster's pod CIDR for kubelet probes)
+WORKER_READINESS_NETWORKS = env.list('WORKER_READINESS_NETWORKS', default=[])
+WORKER_READINESS_TIMEOUT = env.float('WORKER_READINESS_TIMEOUT', default=2.0)
+
+# Code generation
+GENERATION_MAX_WORKERS = env.int('GENERATION_MAX_WORKERS', default=8)
+GENERATION_STREAMING = env.bool('GENERATION_STREAMING', default=True)
+
+# Pack small files into shared prompts; maps batchable file types to
+# their estimated output tokens
+GENERATION_BATCHING = env.bool('GENERATION_BATCHING', default=True)
+GENERATION_BATCH_TYPES = {
+    'component': 700,
+    'config': 300,
+}
+GENERATION_BATCH_MAX_FILES = env.int('GENERATION_BATCH_MAX_FILES', default=6)
+GENERATION_BATCH_MAX_OUTPUT_TOKENS = env.int('GENERATION_BATCH_MAX_OUTPUT_TOKENS', default=8192)
+
+# Render near-identical patterns directly instead of calling the LLM
+TEMPLATE_FAST_PATH_TYPES = env.list('TEMPLATE_FAST_PATH_TYPES', default=['model', 'api'])
+TEMPLATE_FAST_PATH_MAX_DISTANCE = env.float('TEMPLATE_FAST_PATH_MAX_DISTANCE', default=0.35)
+
+# LLM response cache (local LRU + CACHES['default'])
+LLM_CACHE_ENABLED = env.bool('LLM_CACHE_ENABLED', default=True)
+LLM_CACHE_TTL = env.int('LLM_CACHE_TTL', default=60 * 60 * 24)
+LLM_CACHE_MAX_ENTRIES = env.int('LLM_CACHE_MAX_ENTRIES', default=512)
+
+# LLM request policy: retries, hedged requests and deadlines. Streamed
+# generation is hedged on time to first chunk, never after text was forwarded.
+LLM_MAX_RETRIES = env.int('LLM_MAX_RETRIES', default=3)
+LLM_RETRY_BASE_DELAY = env.float('LLM_RETRY_BASE_DELAY', default=1.0)
+LLM_RETRY_MAX_DELAY = env.float('LLM_RETRY_MAX_DELAY', default=20.0)
+LLM_HEDGE_PERCENTILE = env.float('LLM_HEDGE_PERCENTILE', default=95)
+LLM_HEDGE_MIN_SAMPLES = env.int('LLM_HEDGE_MIN_SAMPLES', default=20)
+# Skip hedges while in-flight requests (abandoned ones included) use this
+# share of LLM_REQUEST_POOL_SIZE
+LLM_HEDGE_MAX_POOL_USE = env.float('LLM_HEDGE_MAX_POOL_USE', default=0.5)
+LLM_CALL_TIMEOUT = env.float('LLM_CALL_TIMEOUT', default=120.0)
+LLM_REQUEST_POOL_SIZE = env.int('LLM_REQUEST_POOL_SIZE', default=32)
+GENERATION_TIME_BUDGET = env.float('GENERATION_TIME_BUDGET', default=900.0)
+
+# Pattern retrieval
+# Set to a unix socket path or host:port to share one encoder per host
+# (python -m ai_engine.embedding_server)
+EMBEDDING_SERVER_ADDRESS = env('EMBEDDING_SERVER_ADDRESS', default='')
+EMBEDDING_SERVER_TIMEOUT = env.float('EMBEDDING_SERVER_TIMEOUT', default=30.0)
+EMBEDDING_SERVER_MAX_BATCH_SIZE = env.int('EMBEDDING_SERVER_MAX_BATCH_SIZE', default=64)
+EMBEDDING_SERVER_MAX_WAIT_MS = env.float('EMBEDDING_SERVER_MAX_WAIT_MS', default=5.0)
+ENCODER_BACKEND = env('ENCODER_BACKEND', default='torch')  # torch | torch-int8 | onnx | onnx-int8
+ENCODER_ONNX_DIRECTORY = env('ENCODER_ONNX_DIRECTORY', default='./onnx_models')
+RETRIEVAL_BACKEND = env('RETRIEVAL_BACKEND', default='chroma')  # chroma | numpy
+PATTERN_INDEX_STORAGE = env('PATTERN_INDEX_STORAGE', default='float32')  # float32 | float16 | int8 (numpy backend)
+PATTERN_INDEX_RERANK = env.int('PATTERN_INDEX_RERANK', default=4)
+RETRIEVAL_HYBRID = env.bool('RETRIEVAL_HYBRID', default=True)
+RETRIEVAL_HYBRID_CANDIDATES = env.int('RETRIEVAL_HYBRID_CANDIDATES', default=4)
+QUERY_EMBEDDING_CACHE_MAX_ENTRIES = env.int('QUERY_EMBEDDING_CACHE_MAX_ENTRIES', default=4096)
+QUERY_EMBEDDING_CACHE_TTL = env.int('QUERY_EMBEDDING_CACHE_TTL', default=604800)
+QUERY_EMBEDDING_CACHE_SHARED = env.bool('QUERY_EMBEDDING_CACHE_SHARED', default=False)
+PATTERN_RESULT_CACHE_MAX_ENTRIES = env.int('PATTERN_RESULT_CACHE_MAX_ENTRIES', default=1024)
+PATTERN_RESULT_CACHE_TTL = env.int('PATTERN_RESULT_CACHE_TTL', default=3600)
+PATTERN_RESULT_CACHE_SHARED = env.bool('PATTERN_RESULT_CACHE_SHARED', default=True)
+PATTERN_VERSION_CHECK_INTERVAL = env.float('PATTERN_VERSION_CHECK_INTERVAL', default=1.0)
+PATTERN_DEDUP_THRESHOLD = env.float('PATTERN_DEDUP_THRESHOLD', default=0.85)  # 0 disables
+PATTERN_ENCODE_BATCH_SIZE = env.int('PATTERN_ENCODE_BATCH_SIZE', default=64)
+PATTERN_ENCODE_PROCESSES = env.int('PATTERN_ENCODE_PROCESSES', default=0)
+PATTERN_INSERT_CHUNK_SIZE = env.int('PATTERN_INSERT_CHUNK_SIZE', default=1000)
+PATTERN_STREAMING_INGEST = env.bool('PATTERN_STREAMING_INGEST', default=False)
+PATTERN_HF_DATASETS = env.list('PATTERN_HF_DATASETS', default=['HuggingFaceH4/CodeAlpaca_20K'])
+PATTERN_HF_ROW_LIMIT = env.int('PATTERN_HF_ROW_LIMIT', default=0)  # per dataset, 0 = all rows
 GITHUB_CLIENT_ID = env('GITHUB_CLIENT_ID', default='')
 GITHUB_CLIENT_SECRET = env('GITHUB_CLIENT_SECRET', default='')
 GITHUB_CALLBACK_URL = env('GITHUB_CALLBACK_URL', default='http://localhost:8000/auth/github/callback/')
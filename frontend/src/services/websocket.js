@@ -20,6 +20,18 @@ export function connectWebSocket(projectId, handlers) {
     }
   })
 
+  socket.on('file_chunk', (data) => {
+    if (handlers.onFileChunk) {
+      handlers.onFileChunk(data)
+    }
+  })
+
+  socket.on('file_generated', (data) => {
+    if (handlers.onFileGenerated) {
+      handlers.onFileGenerated(data)
+    }
+  })
+
   socket.on('generation_complete', (data) => {
     if (handlers.onComplete) {
       handlers.onComplete(data)
@@ -22,6 +22,7 @@ export const useGeneratorStore = defineStore('generator', () => {
   const progress = ref(0)
   const currentProject = ref(null)
   const statusMessages = ref([])
+  const streamingFiles = ref({})
   const socket = ref(null)
 
   function nextStep() {
@@ -53,6 +54,7 @@ export const useGeneratorStore = defineStore('generator', () => {
     generationStatus.value = 'idle'
     progress.value = 0
     statusMessages.value = []
+    streamingFiles.value = {}
   }
 
   async function startGeneration() {
@@ -60,6 +62,7 @@ export const useGeneratorStore = defineStore('generator', () => {
       generationStatus.value = 'starting'
       progress.value = 0
       statusMessages.value = []
+      streamingFiles.value = {}
 
       const payload = {
         description: description.value,
@@ -93,6 +96,17 @@ export const useGeneratorStore = defineStore('generator', () => {
           })
         }
       },
+      onFileChunk: (data) => {
+        const file = streamingFiles.value[data.path] || { content: '', done: false }
+        streamingFiles.value[data.path] = { ...file, content: file.content + data.chunk }
+      },
+      onFileGenerated: (data) => {
+        streamingFiles.value[data.path] = {
+          content: data.content,
+          done: true,
+          success: data.success
+        }
+      },
       onComplete: (data) => {
         generationStatus.value = 'completed'
         progress.value = 100
@@ -127,6 +141,7 @@ export const useGeneratorStore = defineStore('generator', () => {
     progress,
     currentProject,
     statusMessages,
+    streamingFiles,
     nextStep,
     prevStep,
     resetWizard,